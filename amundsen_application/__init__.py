@@ -7,6 +7,7 @@ import logging
 import logging.config
 import os
 
+import flask.json
 from flask import Flask, Blueprint
 from flask_restful import Api
 
@@ -20,6 +21,10 @@ from amundsen_application.api.preview.v0 import preview_blueprint
 from amundsen_application.api.search.v0 import search_blueprint
 from amundsen_application.api.preview.dashboard.v0 import dashboard_preview_blueprint
 from amundsen_application.api.issue.issue import IssueAPI, IssuesAPI
+from amundsen_application.api.utils.compression_utils import init_compression
+from amundsen_application.api.utils.deadline_utils import init_request_deadlines
+from amundsen_application.api.utils.editable_rule_utils import get_editable_rule_matcher
+from amundsen_application.api.utils.json_utils import JSONEncoder
 
 
 app_wrapper_class = Flask
@@ -42,6 +47,9 @@ def create_app(config_module_class: str = None, template_folder: str = None) ->
 
     tmpl_dir = template_folder if template_folder else os.path.join(PROJECT_ROOT, static_dir, 'dist/templates')
     app = app_wrapper_class(__name__, static_folder=static_dir, template_folder=tmpl_dir, **args)
+    if app.json_encoder is flask.json.JSONEncoder:
+        # Keep the encoder of an APP_WRAPPER_CLASS defining its own
+        app.json_encoder = JSONEncoder
 
     # Support for importing a custom config class
     if not config_module_class:
@@ -59,6 +67,9 @@ def create_app(config_module_class: str = None, template_folder: str = None) ->
     logging.info('Using metadata service at {}'.format(app.config.get('METADATASERVICE_BASE')))
     logging.info('Using search service at {}'.format(app.config.get('SEARCHSERVICE_BASE')))
 
+    # Compile the table editability rules now, so that invalid rules fail the start rather than a table page
+    get_editable_rule_matcher(app.config)
+
     api_bp = Blueprint('api', __name__)
     api = Api(api_bp)
 
@@ -77,6 +88,8 @@ def create_app(config_module_class: str = None, template_folder: str = None) ->
     app.register_blueprint(api_bp)
     app.register_blueprint(dashboard_preview_blueprint)
     init_routes(app)
+    init_compression(app)
+    init_request_deadlines(app)
 
     init_custom_routes = app.config.get('INIT_CUSTOM_ROUTES')
     if init_custom_routes:
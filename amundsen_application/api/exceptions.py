@@ -1,9 +1,27 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
+from http import HTTPStatus
+
 
 class MailClientNotImplemented(Exception):
     """
     An exception when Mail Client is not implemented
     """
     pass
+
+
+class CircuitOpenError(ValueError):
+    """
+    An exception when a call to an upstream service is not sent because its circuit breaker is open.
+    Like the envoy client BadResponse, it is a ValueError with the HTTP status code to answer with as code.
+    """
+    code = HTTPStatus.SERVICE_UNAVAILABLE
+
+
+class DeadlineExceededError(ValueError):
+    """
+    An exception when a call to an upstream service is not sent, or is cut short, because the deadline of the
+    current request has passed
+    """
+    code = HTTPStatus.GATEWAY_TIMEOUT
@@ -1,14 +1,17 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
+import json
 import logging
 
 from http import HTTPStatus
+from typing import Any, Dict, List, Optional  # noqa: F401
 
 from flask import Response, jsonify, make_response, request
+from flask import current_app as app
 from flask.blueprints import Blueprint
 
-from amundsen_application.log.action_log import action_logging
+from amundsen_application.log.action_log import action_logging, log_actions
 from amundsen_application.api.utils.request_utils import get_query_param
 
 
@@ -16,6 +19,9 @@ LOGGER = logging.getLogger(__name__)
 
 log_blueprint = Blueprint('log', __name__, url_prefix='/api/log/v0')
 
+REQUIRED_EVENT_FIELDS = ('command', 'target_id')
+OPTIONAL_EVENT_FIELDS = ('target_type', 'label', 'location', 'value')
+
 
 @log_blueprint.route('/log_event', methods=['POST'])
 def log_generic_action() -> Response:
@@ -60,3 +66,69 @@ def log_generic_action() -> Response:
         logging.exception(message)
         payload = jsonify({'msg': message})
         return make_response(payload, HTTPStatus.INTERNAL_SERVER_ERROR)
+
+
+@log_blueprint.route('/log_events', methods=['POST'])
+def log_generic_actions() -> Response:
+    """
+    Log a batch of generic actions on the frontend, each with the parameters of /log_event. The body is a JSON array
+    of events, or an object with the array as 'events'. It is parsed whatever its content type, so that it can be
+    sent with navigator.sendBeacon, whose string payloads are text/plain.
+    Valid events are logged even if others are not, at most LOG_EVENTS_MAX_BATCH_SIZE events per request.
+    :return: the number of events logged as 'logged', and the index and error of each invalid event as 'errors'
+    """
+    try:
+        events = _parse_events(request.get_data(cache=False))
+        if events is None:
+            message = 'The body must be a JSON array of events, or an object with the array as "events"'
+            return make_response(jsonify({'msg': message}), HTTPStatus.BAD_REQUEST)
+
+        max_batch_size = app.config['LOG_EVENTS_MAX_BATCH_SIZE']
+        if len(events) > max_batch_size:
+            message = 'At most {} events can be logged at once'.format(max_batch_size)
+            return make_response(jsonify({'msg': message}), HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+
+        actions = []  # type: List[Dict[str, Any]]
+        errors = []  # type: List[Dict[str, Any]]
+        for index, event in enumerate(events):
+            error = _validate_event(event)
+            if error is None:
+                actions.append({field: event.get(field) for field in REQUIRED_EVENT_FIELDS + OPTIONAL_EVENT_FIELDS})
+            else:
+                errors.append({'index': index, 'msg': error})
+
+        if actions:
+            log_actions(actions)
+
+        message = 'Logged {} of {} actions'.format(len(actions), len(events))
+        status_code = HTTPStatus.BAD_REQUEST if errors and not actions else HTTPStatus.OK
+        return make_response(jsonify({'msg': message, 'logged': len(actions), 'errors': errors}), status_code)
+    except Exception as e:
+        message = 'Log actions failed. Encountered exception: ' + str(e)
+        logging.exception(message)
+        return make_response(jsonify({'msg': message}), HTTPStatus.INTERNAL_SERVER_ERROR)
+
+
+def _parse_events(body: bytes) -> Optional[List[Any]]:
+    try:
+        payload = json.loads(body.decode('utf-8'))
+    except ValueError:
+        return None
+    if isinstance(payload, dict):
+        payload = payload.get('events')
+    return payload if isinstance(payload, list) else None
+
+
+def _validate_event(event: Any) -> Optional[str]:
+    """
+    :return: What is wrong with the event, or None if it can be logged
+    """
+    if not isinstance(event, dict):
+        return 'An event must be an object'
+    for field in REQUIRED_EVENT_FIELDS:
+        if not isinstance(event.get(field), str) or not event[field]:
+            return '"{}" is a required field.'.format(field)
+    for field in OPTIONAL_EVENT_FIELDS:
+        if isinstance(event.get(field), (dict, list)):
+            return '"{}" must be a string, a number or a boolean'.format(field)
+    return None
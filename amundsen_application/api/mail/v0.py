@@ -6,10 +6,10 @@ import logging
 from http import HTTPStatus
 
 from flask import Response, jsonify, make_response, request
-from flask import current_app as app
 from flask.blueprints import Blueprint
 
 from amundsen_application.api.exceptions import MailClientNotImplemented
+from amundsen_application.api.utils.auth_utils import get_current_user
 from amundsen_application.api.utils.notification_utils import get_mail_client, send_notification
 from amundsen_application.log.action_log import action_logging
 
@@ -104,7 +104,7 @@ def notification() -> Response:
 
         sender = data.get('sender')
         if sender is None:
-            sender = app.config['AUTH_USER_METHOD'](app).email
+            sender = get_current_user().email
 
         options = data.get('options', {})
         recipients = data.get('recipients', [])
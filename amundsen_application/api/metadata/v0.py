@@ -5,7 +5,7 @@ import logging
 import json
 
 from http import HTTPStatus
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from flask import Response, jsonify, make_response, request
 from flask import current_app as app
@@ -15,9 +15,19 @@ from amundsen_application.log.action_log import action_logging
 
 from amundsen_application.models.user import load_user, dump_user
 
+from amundsen_application.api.utils.auth_utils import get_current_user
+from amundsen_application.api.utils.cache_utils import get_dashboard_metadata_read_key, get_popular_tables_cache, \
+    get_table_metadata_cache, get_table_metadata_read_key, invalidate_dashboard_metadata, invalidate_table_metadata
+from amundsen_application.api.utils.json_utils import dumpb
 from amundsen_application.api.utils.metadata_utils import is_table_editable, marshall_table_partial, \
     marshall_table_full, marshall_dashboard_partial, marshall_dashboard_full, marshall_lineage_table, TableUri
-from amundsen_application.api.utils.request_utils import get_query_param, request_metadata, request_search
+from amundsen_application.api.utils.popular_tables_utils import PopularTablesRefresher
+from amundsen_application.api.utils.request_utils import get_query_param, request_metadata, request_search, \
+    submit_in_context
+from amundsen_application.api.utils.response_utils import compute_etag, create_etag_response, \
+    create_not_modified_response, create_streamed_json_response, get_error_status_code, is_not_modified, set_etag
+from amundsen_application.api.utils.swr_utils import get_metadata
+from amundsen_application.proxy.issue_tracker_clients import get_issue_tracker_client
 
 
 LOGGER = logging.getLogger(__name__)
@@ -58,10 +68,27 @@ def popular_tables() -> Response:
     """
     try:
         if app.config['AUTH_USER_METHOD'] and app.config['POPULAR_TABLE_PERSONALIZATION']:
-            user_id = app.config['AUTH_USER_METHOD'](app).user_id
+            # A user without an id gets the popular tables of everyone
+            user_id = get_current_user().user_id or ''
         else:
             user_id = ''
 
+        if app.config['POPULAR_TABLES_REFRESH_ENABLED']:
+            popular_tables = popular_tables_refresher.get_popular_tables(user_id)
+            if popular_tables is not None:
+                return create_etag_response(payload={'results': popular_tables, 'msg': 'Success'},
+                                            status_code=HTTPStatus.OK)
+            # The global list could not be loaded yet, the popular tables are fetched for this request
+
+        popular_tables_cache = get_popular_tables_cache()
+        if popular_tables_cache is not None:
+            cached = popular_tables_cache.get(user_id)
+            # Entries hold the results and the ETag of the response
+            if isinstance(cached, dict):
+                return create_etag_response(payload={'results': cached['results'], 'msg': 'Success'},
+                                            status_code=HTTPStatus.OK,
+                                            etag=cached['etag'])
+
         service_base = app.config['METADATASERVICE_BASE']
         count = app.config['POPULAR_TABLE_COUNT']
         url = f'{service_base}{POPULAR_TABLES_ENDPOINT}/{user_id}?limit={count}'
@@ -78,13 +105,32 @@ def popular_tables() -> Response:
             logging.error(message)
             popular_tables = [{}]
 
-        payload = jsonify({'results': popular_tables, 'msg': message})
-        return make_response(payload, status_code)
+        payload = {'results': popular_tables, 'msg': message}
+        etag = compute_etag(payload) if status_code == HTTPStatus.OK and app.config['METADATA_ETAG_ENABLED'] else None
+        if status_code == HTTPStatus.OK and popular_tables_cache is not None:
+            popular_tables_cache.set(user_id, {'results': popular_tables, 'etag': etag})
+        return create_etag_response(payload=payload, status_code=status_code, etag=etag)
     except Exception as e:
         message = 'Encountered exception: ' + str(e)
         logging.exception(message)
         payload = jsonify({'results': [{}], 'msg': message})
-        return make_response(payload, HTTPStatus.INTERNAL_SERVER_ERROR)
+        return make_response(payload, get_error_status_code(e))
+
+
+def _get_popular_tables(user_id: str) -> List[Dict]:
+    service_base = app.config['METADATASERVICE_BASE']
+    count = app.config['POPULAR_TABLE_COUNT']
+    url = f'{service_base}{POPULAR_TABLES_ENDPOINT}/{user_id}?limit={count}'
+
+    response = request_metadata(url=url)
+    status_code = response.status_code
+    if status_code != HTTPStatus.OK:
+        raise Exception('Request to metadata service failed with status code ' + str(status_code))
+
+    return [marshall_table_partial(result) for result in response.json().get('popular_tables')]
+
+
+popular_tables_refresher = PopularTablesRefresher(fetch=_get_popular_tables)
 
 
 @metadata_blueprint.route('/table', methods=['GET'])
@@ -103,21 +149,83 @@ def get_table_metadata() -> Response:
         list_item_index = request.args.get('index', None)
         list_item_source = request.args.get('source', None)
 
+        column_limit = request.args.get('column_limit', None, type=int)
+
         results_dict = _get_table_metadata(table_key=table_key, index=list_item_index, source=list_item_source)
-        return make_response(jsonify(results_dict), results_dict.get('status_code', HTTPStatus.INTERNAL_SERVER_ERROR))
+        status_code = results_dict.get('status_code', HTTPStatus.INTERNAL_SERVER_ERROR)
+        etag = results_dict.pop('etag', None)
+        if column_limit is not None and results_dict['tableData'] and _is_column_paging_enabled():
+            # Only the first columns are returned, the others are then fetched from /table/columns
+            columns = results_dict['tableData']['columns']
+            results_dict = dict(results_dict,
+                                tableData=dict(results_dict['tableData'], columns=columns[:max(column_limit, 0)]),
+                                total_columns=len(columns))
+            etag = etag and f'{etag}-{column_limit}'
+
+        streaming_min_columns = app.config['TABLE_METADATA_STREAMING_MIN_COLUMNS']
+        if streaming_min_columns is not None and \
+                len(results_dict['tableData'].get('columns', [])) >= streaming_min_columns:
+            if etag is not None and status_code == HTTPStatus.OK and is_not_modified(etag):
+                return create_not_modified_response(etag)
+            response = create_streamed_json_response(payload=results_dict,
+                                                     stream_path=('tableData', 'columns'),
+                                                     status_code=status_code)
+            if etag is not None and status_code == HTTPStatus.OK:
+                set_etag(response, etag)
+            return response
+        return create_etag_response(payload=results_dict, status_code=status_code, etag=etag)
     except Exception as e:
         message = 'Encountered exception: ' + str(e)
         logging.exception(message)
-        return make_response(jsonify({'tableData': {}, 'msg': message}), HTTPStatus.INTERNAL_SERVER_ERROR)
+        return make_response(jsonify({'tableData': {}, 'msg': message}), get_error_status_code(e))
+
+
+def _is_column_paging_enabled() -> bool:
+    """
+    Columns are only paged when the table is cached, by the table cache or stale-while-revalidate, so that the pages
+    are served from one fetch of the table instead of fetching the whole table for each of them
+    """
+    return app.config['METADATA_SWR_ENABLED'] or get_table_metadata_cache() is not None
 
 
 @action_logging
 def _get_table_metadata(*, table_key: str, index: int, source: str) -> Dict[str, Any]:
+    return _fetch_table_metadata(table_key=table_key)
+
 
+def _fetch_table_metadata(*, table_key: str) -> Dict[str, Any]:
+    """
+    Fetches the marshalled table from the table cache, or from the metadata service. The returned 'tableData'
+    may be shared with the cache and must not be modified. When METADATA_ETAG_ENABLED is on, the ETag of the table
+    is returned as 'etag', and stored with the cached table. When METADATA_SWR_ENABLED is on, the table is served
+    stale-while-revalidate (see swr_utils) instead of from the table cache.
+    """
+    if app.config['METADATA_SWR_ENABLED']:
+        return get_metadata(get_table_metadata_read_key(table_key),
+                            lambda: _request_table_metadata(table_key=table_key))
+
+    table_cache = get_table_metadata_cache()
+    if table_cache is not None:
+        cached = table_cache.get(table_key)
+        if isinstance(cached, dict) and 'tableData' in cached:
+            return {
+                'tableData': cached['tableData'],
+                'etag': cached['etag'],
+                'msg': 'Success',
+                'status_code': HTTPStatus.OK,
+            }
+
+    results_dict = _request_table_metadata(table_key=table_key)
+    if table_cache is not None and results_dict['status_code'] == HTTPStatus.OK:
+        table_cache.set(table_key, {'tableData': results_dict['tableData'], 'etag': results_dict.get('etag')})
+    return results_dict
+
+
+def _request_table_metadata(*, table_key: str) -> Dict[str, Any]:
     results_dict = {
         'tableData': {},
         'msg': '',
-    }
+    }  # type: Dict[str, Any]
 
     try:
         table_endpoint = _get_table_endpoint()
@@ -148,6 +256,8 @@ def _get_table_metadata(*, table_key: str, index: int, source: str) -> Dict[str,
 
         results_dict['tableData'] = marshall_table_full(table_data_raw)
         results_dict['msg'] = 'Success'
+        if app.config['METADATA_ETAG_ENABLED']:
+            results_dict['etag'] = compute_etag(results_dict['tableData'])
         return results_dict
     except Exception as e:
         message = 'Encountered exception: ' + str(e)
@@ -158,6 +268,41 @@ def _get_table_metadata(*, table_key: str, index: int, source: str) -> Dict[str,
         return results_dict
 
 
+@metadata_blueprint.route('/table/columns', methods=['GET'])
+def get_table_columns() -> Response:
+    """
+    Serves a page of the columns of a table, for tables whose details were fetched with a column_limit.
+    Backed by the same table payload (and table cache) as /table, and not action logged. Without a cache, each page
+    is served from a fetch of the whole table, which is why /table only pages columns when a cache is enabled.
+    Query parameters: 'key', optional 'offset' (0 by default) and 'limit' (TABLE_METADATA_COLUMN_PAGE_SIZE by
+    default, at most TABLE_METADATA_COLUMN_PAGE_MAX_SIZE).
+    :return: a json output containing the columns as 'columns', and the number of columns as 'total_columns'
+    """
+    try:
+        table_key = get_query_param(request.args, 'key')
+        offset = max(request.args.get('offset', 0, type=int), 0)
+        limit = min(max(request.args.get('limit', app.config['TABLE_METADATA_COLUMN_PAGE_SIZE'], type=int), 0),
+                    app.config['TABLE_METADATA_COLUMN_PAGE_MAX_SIZE'])
+
+        results_dict = _fetch_table_metadata(table_key=table_key)
+        etag = results_dict.get('etag')
+        columns = results_dict['tableData'].get('columns', [])
+        payload = {
+            'columns': columns[offset:offset + limit],
+            'offset': offset,
+            'limit': limit,
+            'total_columns': len(columns),
+            'msg': results_dict['msg'],
+        }
+        return create_etag_response(payload=payload,
+                                    status_code=results_dict.get('status_code', HTTPStatus.INTERNAL_SERVER_ERROR),
+                                    etag=etag and f'{etag}-{offset}-{limit}')
+    except Exception as e:
+        message = 'Encountered exception: ' + str(e)
+        logging.exception(message)
+        return make_response(jsonify({'columns': [], 'msg': message}), get_error_status_code(e))
+
+
 @metadata_blueprint.route('/update_table_owner', methods=['PUT', 'DELETE'])
 def update_table_owner() -> Response:
 
@@ -176,6 +321,7 @@ def update_table_owner() -> Response:
         _log_update_table_owner(table_key=table_key, method=method, owner=owner)
 
         response = request_metadata(url=url, method=method)
+        invalidate_table_metadata(table_key)
         status_code = response.status_code
 
         if status_code == HTTPStatus.OK:
@@ -187,7 +333,7 @@ def update_table_owner() -> Response:
         return make_response(payload, status_code)
     except Exception as e:
         payload = jsonify({'msg': 'Encountered exception: ' + str(e)})
-        return make_response(payload, HTTPStatus.INTERNAL_SERVER_ERROR)
+        return make_response(payload, get_error_status_code(e))
 
 
 @metadata_blueprint.route('/get_last_indexed')
@@ -199,23 +345,28 @@ def get_last_indexed() -> Response:
     Schema Defined Here: https://github.com/lyft/amundsenmetadatalibrary/blob/master/metadata_service/api/system.py
     """
     try:
-        url = app.config['METADATASERVICE_BASE'] + LAST_INDEXED_ENDPOINT
+        results_dict = get_metadata('last_indexed', _get_last_indexed)
+        status_code = results_dict.pop('status_code')
+        return make_response(jsonify(results_dict), status_code)
+    except Exception as e:
+        payload = jsonify({'timestamp': None, 'msg': 'Encountered exception: ' + str(e)})
+        return make_response(payload, get_error_status_code(e))
 
-        response = request_metadata(url=url)
-        status_code = response.status_code
 
-        if status_code == HTTPStatus.OK:
-            message = 'Success'
-            timestamp = response.json().get('neo4j_latest_timestamp')
-        else:
-            message = 'Timestamp Unavailable'
-            timestamp = None
+def _get_last_indexed() -> Dict[str, Any]:
+    url = app.config['METADATASERVICE_BASE'] + LAST_INDEXED_ENDPOINT
 
-        payload = jsonify({'timestamp': timestamp, 'msg': message})
-        return make_response(payload, status_code)
-    except Exception as e:
-        payload = jsonify({'timestamp': None, 'msg': 'Encountered exception: ' + str(e)})
-        return make_response(payload, HTTPStatus.INTERNAL_SERVER_ERROR)
+    response = request_metadata(url=url)
+    status_code = response.status_code
+
+    if status_code == HTTPStatus.OK:
+        message = 'Success'
+        timestamp = response.json().get('neo4j_latest_timestamp')
+    else:
+        message = 'Timestamp Unavailable'
+        timestamp = None
+
+    return {'timestamp': timestamp, 'msg': message, 'status_code': status_code}
 
 
 @metadata_blueprint.route('/get_table_description', methods=['GET'])
@@ -240,7 +391,7 @@ def get_table_description() -> Response:
         return make_response(payload, status_code)
     except Exception as e:
         payload = jsonify({'description': None, 'msg': 'Encountered exception: ' + str(e)})
-        return make_response(payload, HTTPStatus.INTERNAL_SERVER_ERROR)
+        return make_response(payload, get_error_status_code(e))
 
 
 @metadata_blueprint.route('/get_column_description', methods=['GET'])
@@ -267,7 +418,7 @@ def get_column_description() -> Response:
         return make_response(payload, status_code)
     except Exception as e:
         payload = jsonify({'description': None, 'msg': 'Encountered exception: ' + str(e)})
-        return make_response(payload, HTTPStatus.INTERNAL_SERVER_ERROR)
+        return make_response(payload, get_error_status_code(e))
 
 
 @metadata_blueprint.route('/put_table_description', methods=['PUT'])
@@ -293,7 +444,8 @@ def put_table_description() -> Response:
         url = '{0}/{1}/description'.format(table_endpoint, table_key)
         _log_put_table_description(table_key=table_key, description=description, source=src)
 
-        response = request_metadata(url=url, method='PUT', data=json.dumps({'description': description}))
+        response = request_metadata(url=url, method='PUT', data=dumpb({'description': description}))
+        invalidate_table_metadata(table_key)
         status_code = response.status_code
 
         if status_code == HTTPStatus.OK:
@@ -305,7 +457,7 @@ def put_table_description() -> Response:
         return make_response(payload, status_code)
     except Exception as e:
         payload = jsonify({'msg': 'Encountered exception: ' + str(e)})
-        return make_response(payload, HTTPStatus.INTERNAL_SERVER_ERROR)
+        return make_response(payload, get_error_status_code(e))
 
 
 @metadata_blueprint.route('/put_column_description', methods=['PUT'])
@@ -333,7 +485,8 @@ def put_column_description() -> Response:
         url = '{0}/{1}/column/{2}/description'.format(table_endpoint, table_key, column_name)
         _log_put_column_description(table_key=table_key, column_name=column_name, description=description, source=src)
 
-        response = request_metadata(url=url, method='PUT', data=json.dumps({'description': description}))
+        response = request_metadata(url=url, method='PUT', data=dumpb({'description': description}))
+        invalidate_table_metadata(table_key)
         status_code = response.status_code
 
         if status_code == HTTPStatus.OK:
@@ -345,7 +498,7 @@ def put_column_description() -> Response:
         return make_response(payload, status_code)
     except Exception as e:
         payload = jsonify({'msg': 'Encountered exception: ' + str(e)})
-        return make_response(payload, HTTPStatus.INTERNAL_SERVER_ERROR)
+        return make_response(payload, get_error_status_code(e))
 
 
 @metadata_blueprint.route('/tags')
@@ -357,25 +510,30 @@ def get_tags() -> Response:
     Schema Defined Here: https://github.com/lyft/amundsenmetadatalibrary/blob/master/metadata_service/api/tag.py
     """
     try:
-        url = app.config['METADATASERVICE_BASE'] + TAGS_ENDPOINT
-        response = request_metadata(url=url)
-        status_code = response.status_code
-
-        if status_code == HTTPStatus.OK:
-            message = 'Success'
-            tags = response.json().get('tag_usages')
-        else:
-            message = 'Encountered error: Tags Unavailable'
-            logging.error(message)
-            tags = []
-
-        payload = jsonify({'tags': tags, 'msg': message})
-        return make_response(payload, status_code)
+        results_dict = get_metadata('tags', _get_tags)
+        status_code = results_dict.pop('status_code')
+        return make_response(jsonify(results_dict), status_code)
     except Exception as e:
         message = 'Encountered exception: ' + str(e)
         payload = jsonify({'tags': [], 'msg': message})
         logging.exception(message)
-        return make_response(payload, HTTPStatus.INTERNAL_SERVER_ERROR)
+        return make_response(payload, get_error_status_code(e))
+
+
+def _get_tags() -> Dict[str, Any]:
+    url = app.config['METADATASERVICE_BASE'] + TAGS_ENDPOINT
+    response = request_metadata(url=url)
+    status_code = response.status_code
+
+    if status_code == HTTPStatus.OK:
+        message = 'Success'
+        tags = response.json().get('tag_usages')
+    else:
+        message = 'Encountered error: Tags Unavailable'
+        logging.error(message)
+        tags = []
+
+    return {'tags': tags, 'msg': message, 'status_code': status_code}
 
 
 def _update_metadata_tag(table_key: str, method: str, tag: str) -> int:
@@ -473,6 +631,7 @@ def update_table_tags() -> Response:
         _log_update_table_tags(table_key=table_key, method=method, tag=tag)
 
         metadata_status_code = _update_metadata_tag(table_key=table_key, method=method, tag=tag)
+        invalidate_table_metadata(table_key)
         search_status_code = _update_search_tag(table_key=table_key, method=method, tag=tag)
 
         http_status_code = HTTPStatus.OK
@@ -490,7 +649,7 @@ def update_table_tags() -> Response:
         message = 'Encountered exception: ' + str(e)
         logging.exception(message)
         payload = jsonify({'msg': message})
-        return make_response(payload, HTTPStatus.INTERNAL_SERVER_ERROR)
+        return make_response(payload, get_error_status_code(e))
 
 
 @metadata_blueprint.route('/update_dashboard_tags', methods=['PUT', 'DELETE'])
@@ -516,6 +675,7 @@ def update_dashboard_tags() -> Response:
 
         if status_code == HTTPStatus.OK:
             message = 'Success'
+            invalidate_dashboard_metadata(uri_key)
         else:
             message = f'Encountered error: {method} dashboard tag failed'
             logging.error(message)
@@ -526,7 +686,7 @@ def update_dashboard_tags() -> Response:
         message = 'Encountered exception: ' + str(e)
         logging.exception(message)
         payload = jsonify({'msg': message})
-        return make_response(payload, HTTPStatus.INTERNAL_SERVER_ERROR)
+        return make_response(payload, get_error_status_code(e))
 
 
 @metadata_blueprint.route('/user', methods=['GET'])
@@ -562,7 +722,7 @@ def get_user() -> Response:
         message = 'Encountered exception: ' + str(e)
         logging.exception(message)
         payload = jsonify({'msg': message})
-        return make_response(payload, HTTPStatus.INTERNAL_SERVER_ERROR)
+        return make_response(payload, get_error_status_code(e))
 
 
 @metadata_blueprint.route('/user/bookmark', methods=['GET'])
@@ -577,36 +737,44 @@ def get_bookmark() -> Response:
         user_id = request.args.get('user_id')
         if user_id is None:
             if app.config['AUTH_USER_METHOD']:
-                user_id = app.config['AUTH_USER_METHOD'](app).user_id
+                user_id = get_current_user().user_id
             else:
                 raise Exception('AUTH_USER_METHOD is not configured')
+            if user_id is None:
+                raise Exception('The current user has no user_id')
 
-        url = '{0}{1}/{2}/follow/'.format(app.config['METADATASERVICE_BASE'], USER_ENDPOINT, user_id)
-
-        response = request_metadata(url=url, method=request.method)
-        status_code = response.status_code
-
-        if status_code == HTTPStatus.OK:
-            message = 'Success'
-            tables = response.json().get('table')
-            table_bookmarks = [marshall_table_partial(table) for table in tables]
-            dashboards = response.json().get('dashboard', [])
-            dashboard_bookmarks = [marshall_dashboard_partial(dashboard) for dashboard in dashboards]
-        else:
-            message = f'Encountered error: failed to get bookmark for user_id: {user_id}'
-            logging.error(message)
-            table_bookmarks = []
-            dashboard_bookmarks = []
-
-        all_bookmarks = {
-            'table': table_bookmarks,
-            'dashboard': dashboard_bookmarks
-        }
-        return make_response(jsonify({'msg': message, 'bookmarks': all_bookmarks}), status_code)
+        results_dict = _get_bookmarks(user_id=user_id)
+        status_code = results_dict.pop('status_code')
+        return create_etag_response(payload=results_dict, status_code=status_code)
     except Exception as e:
         message = 'Encountered exception: ' + str(e)
         logging.exception(message)
-        return make_response(jsonify({'msg': message}), HTTPStatus.INTERNAL_SERVER_ERROR)
+        return make_response(jsonify({'msg': message}), get_error_status_code(e))
+
+
+def _get_bookmarks(*, user_id: str) -> Dict[str, Any]:
+    url = '{0}{1}/{2}/follow/'.format(app.config['METADATASERVICE_BASE'], USER_ENDPOINT, user_id)
+
+    response = request_metadata(url=url)
+    status_code = response.status_code
+
+    if status_code == HTTPStatus.OK:
+        message = 'Success'
+        tables = response.json().get('table')
+        table_bookmarks = [marshall_table_partial(table) for table in tables]
+        dashboards = response.json().get('dashboard', [])
+        dashboard_bookmarks = [marshall_dashboard_partial(dashboard) for dashboard in dashboards]
+    else:
+        message = f'Encountered error: failed to get bookmark for user_id: {user_id}'
+        logging.error(message)
+        table_bookmarks = []
+        dashboard_bookmarks = []
+
+    all_bookmarks = {
+        'table': table_bookmarks,
+        'dashboard': dashboard_bookmarks
+    }
+    return {'msg': message, 'bookmarks': all_bookmarks, 'status_code': status_code}
 
 
 @metadata_blueprint.route('/user/bookmark', methods=['PUT', 'DELETE'])
@@ -625,7 +793,7 @@ def update_bookmark() -> Response:
 
     try:
         if app.config['AUTH_USER_METHOD']:
-            user = app.config['AUTH_USER_METHOD'](app)
+            user = get_current_user()
         else:
             raise Exception('AUTH_USER_METHOD is not configured')
 
@@ -648,7 +816,7 @@ def update_bookmark() -> Response:
     except Exception as e:
         message = 'Encountered exception: ' + str(e)
         logging.exception(message)
-        return make_response(jsonify({'msg': message}), HTTPStatus.INTERNAL_SERVER_ERROR)
+        return make_response(jsonify({'msg': message}), get_error_status_code(e))
 
 
 @metadata_blueprint.route('/user/read', methods=['GET'])
@@ -672,7 +840,7 @@ def get_user_read() -> Response:
     except Exception as e:
         message = 'Encountered exception: ' + str(e)
         logging.exception(message)
-        return make_response(jsonify({'msg': message}), HTTPStatus.INTERNAL_SERVER_ERROR)
+        return make_response(jsonify({'msg': message}), get_error_status_code(e))
 
 
 @metadata_blueprint.route('/user/own', methods=['GET'])
@@ -701,7 +869,7 @@ def get_user_own() -> Response:
     except Exception as e:
         message = 'Encountered exception: ' + str(e)
         logging.exception(message)
-        return make_response(jsonify({'msg': message}), HTTPStatus.INTERNAL_SERVER_ERROR)
+        return make_response(jsonify({'msg': message}), get_error_status_code(e))
 
 
 @metadata_blueprint.route('/dashboard', methods=['GET'])
@@ -720,16 +888,21 @@ def get_dashboard_metadata() -> Response:
         source = request.args.get('source', None)
         _get_dashboard_metadata(uri=uri, index=index, source=source)
 
-        url = f'{app.config["METADATASERVICE_BASE"]}{DASHBOARD_ENDPOINT}/{uri}'
-
-        response = request_metadata(url=url, method=request.method)
-        dashboard = marshall_dashboard_full(response.json())
-        status_code = response.status_code
-        return make_response(jsonify({'msg': 'success', 'dashboard': dashboard}), status_code)
+        results_dict = get_metadata(get_dashboard_metadata_read_key(uri), lambda: _get_dashboard(uri=uri))
+        status_code = results_dict.pop('status_code')
+        return create_etag_response(payload=results_dict, status_code=status_code)
     except Exception as e:
         message = 'Encountered exception: ' + str(e)
         logging.exception(message)
-        return make_response(jsonify({'dashboard': {}, 'msg': message}), HTTPStatus.INTERNAL_SERVER_ERROR)
+        return make_response(jsonify({'dashboard': {}, 'msg': message}), get_error_status_code(e))
+
+
+def _get_dashboard(*, uri: str) -> Dict[str, Any]:
+    url = f'{app.config["METADATASERVICE_BASE"]}{DASHBOARD_ENDPOINT}/{uri}'
+
+    response = request_metadata(url=url)
+    dashboard = marshall_dashboard_full(response.json())
+    return {'msg': 'success', 'dashboard': dashboard, 'status_code': response.status_code}
 
 
 @metadata_blueprint.route('/table/<path:table_key>/dashboards', methods=['GET'])
@@ -745,12 +918,15 @@ def get_related_dashboard_metadata(table_key: str) -> Response:
     except Exception as e:
         message = 'Encountered exception: ' + str(e)
         logging.exception(message)
-        return make_response(jsonify({'dashboards': [], 'msg': message}), HTTPStatus.INTERNAL_SERVER_ERROR)
+        return make_response(jsonify({'dashboards': [], 'msg': message}), get_error_status_code(e))
 
 
 @action_logging
 def _get_related_dashboards_metadata(*, url: str) -> Dict[str, Any]:
+    return get_metadata('related_dashboards:' + url, lambda: _request_related_dashboards_metadata(url=url))
+
 
+def _request_related_dashboards_metadata(*, url: str) -> Dict[str, Any]:
     results_dict = {
         'dashboards': [],
         'msg': '',
@@ -801,19 +977,11 @@ def get_table_lineage() -> Response:
         table_endpoint = _get_table_endpoint()
         table_key = get_query_param(request.args, 'key')
         url = f'{table_endpoint}/{table_key}/lineage'
-        response = request_metadata(url=url, method=request.method)
-        json = response.json()
-        downstream = [marshall_lineage_table(table) for table in json.get('downstream_entities')]
-        upstream = [marshall_lineage_table(table) for table in json.get('upstream_entities')]
-
-        payload = {
-            'downstream_entities': downstream,
-            'upstream_entities': upstream,
-        }
+        payload = _get_lineage(url=url)
         return make_response(jsonify(payload), 200)
     except Exception as e:
         payload = jsonify({'msg': 'Encountered exception: ' + str(e)})
-        return make_response(payload, HTTPStatus.INTERNAL_SERVER_ERROR)
+        return make_response(payload, get_error_status_code(e))
 
 
 @metadata_blueprint.route('/get_column_lineage', methods=['GET'])
@@ -827,16 +995,84 @@ def get_column_lineage() -> Response:
         table_key = get_query_param(request.args, 'key')
         column_name = get_query_param(request.args, 'column_name')
         url = f'{table_endpoint}/{table_key}/column/{column_name}/lineage'
-        response = request_metadata(url=url, method=request.method)
-        json = response.json()
-        downstream = [marshall_lineage_table(table) for table in json.get('downstream_entities')]
-        upstream = [marshall_lineage_table(table) for table in json.get('upstream_entities')]
-
-        payload = {
-            'downstream_entities': downstream,
-            'upstream_entities': upstream,
-        }
+        payload = _get_lineage(url=url)
         return make_response(jsonify(payload), 200)
     except Exception as e:
         payload = jsonify({'msg': 'Encountered exception: ' + str(e)})
-        return make_response(payload, HTTPStatus.INTERNAL_SERVER_ERROR)
+        return make_response(payload, get_error_status_code(e))
+
+
+def _get_lineage(*, url: str) -> Dict[str, Any]:
+    payload = get_metadata('lineage:' + url, lambda: _request_lineage(url=url))
+    del payload['status_code']
+    return payload
+
+
+def _request_lineage(*, url: str) -> Dict[str, Any]:
+    response = request_metadata(url=url)
+    json = response.json()
+    downstream = [marshall_lineage_table(table) for table in json.get('downstream_entities')]
+    upstream = [marshall_lineage_table(table) for table in json.get('upstream_entities')]
+
+    return {
+        'downstream_entities': downstream,
+        'upstream_entities': upstream,
+        'status_code': response.status_code,
+    }
+
+
+@metadata_blueprint.route('/table_page', methods=['GET'])
+def get_table_page() -> Response:
+    """
+    Fetches everything the table detail page needs in one round trip. The table metadata, related dashboards,
+    lineage, issues and the current user's bookmarks are requested concurrently, so the latency is that of the
+    slowest call rather than the sum of all of them.
+    :return: a JSON object with the payload of '/table' as 'table', '/table/<key>/dashboards' as 'dashboards',
+    '/get_table_lineage' as 'lineage', '/api/issue/issues' as 'issues' and '/user/bookmark' as 'bookmarks'.
+    Sections that failed contain a 'msg' describing the error.
+    """
+    try:
+        table_key = get_query_param(request.args, 'key')
+        list_item_index = request.args.get('index', None)
+        list_item_source = request.args.get('source', None)
+
+        table_endpoint = _get_table_endpoint()
+        futures = {
+            'table': submit_in_context(_get_table_metadata,
+                                       table_key=table_key,
+                                       index=list_item_index,
+                                       source=list_item_source),
+            'dashboards': submit_in_context(_get_related_dashboards_metadata,
+                                            url=f'{table_endpoint}/{table_key}/dashboard/'),
+            'lineage': submit_in_context(_get_lineage, url=f'{table_endpoint}/{table_key}/lineage'),
+            'issues': submit_in_context(_get_issues, table_key=table_key),
+        }
+        user_id = get_current_user().user_id if app.config['AUTH_USER_METHOD'] else None
+        if user_id is not None:
+            futures['bookmarks'] = submit_in_context(_get_bookmarks, user_id=user_id)
+
+        payload = {}  # type: Dict[str, Any]
+        for section, future in futures.items():
+            try:
+                payload[section] = future.result()
+            except Exception as e:
+                message = f'Encountered exception fetching {section}: ' + str(e)
+                logging.exception(message)
+                payload[section] = {'msg': message, 'status_code': get_error_status_code(e)}
+
+        # The ETag of the table alone does not identify the page
+        payload['table'].pop('etag', None)
+        status_code = payload['table'].get('status_code', HTTPStatus.INTERNAL_SERVER_ERROR)
+        return make_response(jsonify(payload), status_code)
+    except Exception as e:
+        message = 'Encountered exception: ' + str(e)
+        logging.exception(message)
+        return make_response(jsonify({'table': {'tableData': {}}, 'msg': message}), get_error_status_code(e))
+
+
+def _get_issues(*, table_key: str) -> Dict[str, Any]:
+    if not app.config['ISSUE_TRACKER_CLIENT_ENABLED']:
+        return {'issues': {}, 'msg': 'Issue tracking is not enabled'}
+
+    issues = get_issue_tracker_client().get_issues(table_key)
+    return {'issues': issues.serialize(), 'msg': 'Success'}
@@ -10,6 +10,7 @@ from requests.auth import HTTPBasicAuth
 from retrying import retry
 
 from amundsen_application.api.metadata.v0 import USER_ENDPOINT
+from amundsen_application.api.utils.auth_utils import get_current_user
 from amundsen_application.api.utils.request_utils import request_metadata
 from amundsen_application.base.base_preview import BasePreview
 from amundsen_application.models.user import load_user
@@ -55,7 +56,6 @@ class ModePreview(BasePreview):
             if not app.config['AUTH_USER_METHOD']:
                 raise Exception('AUTH_USER_METHOD must be configured to enable ACL_ENABLED_DASHBOARD_PREVIEW')
             self._is_auth_enabled = self.__class__.__name__ in app.config['ACL_ENABLED_DASHBOARD_PREVIEW']
-            self._auth_user_method = app.config['AUTH_USER_METHOD']
 
     @retry(stop_max_attempt_number=3, wait_random_min=500, wait_random_max=1000,
            retry_on_exception=_retry_on_retriable_error)
@@ -67,7 +67,10 @@ class ModePreview(BasePreview):
         :raise: PermissionError when user is not allowed to access the dashboard
         """
         if self._is_auth_enabled:
-            self._authorize_access(user_id=self._auth_user_method(app).user_id)
+            user_id = get_current_user().user_id
+            if user_id is None:
+                raise PermissionError('The current user has no user_id')
+            self._authorize_access(user_id=user_id)
 
         url = self._get_preview_image_url(uri=uri)
         r = requests.get(url, allow_redirects=True)
@@ -10,6 +10,7 @@ from flask.blueprints import Blueprint
 
 from amundsen_application.api.preview.dashboard.dashboard_preview.preview_factory_method import \
     DefaultPreviewMethodFactory, BasePreviewMethodFactory
+from amundsen_application.api.utils.response_utils import get_error_status_code
 
 LOGGER = logging.getLogger(__name__)
 PREVIEW_FACTORY: BasePreviewMethodFactory = None  # type: ignore
@@ -55,4 +56,4 @@ def get_preview_image(uri: str) -> Response:
         return make_response(jsonify({'msg': pe.args[0]}), HTTPStatus.UNAUTHORIZED)
     except Exception as e:
         LOGGER.exception('Unexpected failure on get_preview_image')
-        return make_response(jsonify({'msg': 'Encountered exception: ' + str(e)}), HTTPStatus.INTERNAL_SERVER_ERROR)
+        return make_response(jsonify({'msg': 'Encountered exception: ' + str(e)}), get_error_status_code(e))
@@ -2,21 +2,29 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import logging
-import json
+import time
+
+from concurrent.futures import Future, TimeoutError
 
 from http import HTTPStatus
 
-from typing import Any, Dict  # noqa: F401
+from typing import Any, Callable, Dict, List, Optional, Tuple  # noqa: F401
 
 from flask import Response, jsonify, make_response, request
 from flask import current_app as app
 from flask.blueprints import Blueprint
 
 from amundsen_application.log.action_log import action_logging
+from amundsen_application.api.metadata.v0 import POPULAR_TABLES_ENDPOINT, TAGS_ENDPOINT
 from amundsen_application.api.utils.metadata_utils import marshall_dashboard_partial
-from amundsen_application.api.utils.request_utils import get_query_param, request_search
+from amundsen_application.api.utils.cache_utils import get_search_results_cache
+from amundsen_application.api.utils.json_utils import dumpb
+from amundsen_application.api.utils.request_utils import get_credentials_fingerprint, get_query_param, \
+    request_metadata, request_search, submit_in_background, submit_in_context
+from amundsen_application.api.utils.response_utils import get_error_status_code
 from amundsen_application.api.utils.search_utils import generate_query_json, has_filters, \
-    map_table_result, transform_filters
+    map_table_result, normalize_search_term, search_cache_key, transform_filters
+from amundsen_application.api.utils.typeahead_utils import TypeaheadIndex
 from amundsen_application.models.user import load_user, dump_user
 
 LOGGER = logging.getLogger(__name__)
@@ -31,6 +39,16 @@ SEARCH_TABLE_ENDPOINT = '/search'
 SEARCH_TABLE_FILTER_ENDPOINT = '/search_table'
 SEARCH_USER_ENDPOINT = '/search_user'
 
+TABLE_RESOURCE = 'table'
+USER_RESOURCE = 'user'
+DASHBOARD_RESOURCE = 'dashboard'
+
+_RESOURCE_SECTIONS = {
+    TABLE_RESOURCE: 'tables',
+    DASHBOARD_RESOURCE: 'dashboards',
+    USER_RESOURCE: 'users',
+}
+
 
 @search_blueprint.route('/table', methods=['POST'])
 def search_table() -> Response:
@@ -46,7 +64,7 @@ def search_table() -> Response:
 
         search_type = request_json.get('searchType')
 
-        transformed_filters = transform_filters(filters=request_json.get('filters', {}), resource='table')
+        transformed_filters = transform_filters(filters=request_json.get('filters', {}), resource=TABLE_RESOURCE)
 
         results_dict = _search_table(filters=transformed_filters,
                                      search_term=search_term,
@@ -56,11 +74,12 @@ def search_table() -> Response:
     except Exception as e:
         message = 'Encountered exception: ' + str(e)
         logging.exception(message)
-        return make_response(jsonify(results_dict), HTTPStatus.INTERNAL_SERVER_ERROR)
+        return make_response(jsonify(results_dict), get_error_status_code(e))
 
 
 @action_logging
-def _search_table(*, search_term: str, page_index: int, filters: Dict, search_type: str) -> Dict[str, Any]:
+def _search_table(*, search_term: str, page_index: int, filters: Dict, search_type: str,
+                  timeout_sec: float = 0) -> Dict[str, Any]:
     """
     Call the search service endpoint and return matching results
     Search service logic defined here:
@@ -79,27 +98,18 @@ def _search_table(*, search_term: str, page_index: int, filters: Dict, search_ty
         'search_term': search_term,
         'msg': '',
         'tables': tables,
-    }
+    }  # type: Dict[str, Any]
 
     try:
-        if has_filters(filters=filters, resource='table'):
-            query_json = generate_query_json(filters=filters, page_index=page_index, search_term=search_term)
-            url_base = app.config['SEARCHSERVICE_BASE'] + SEARCH_TABLE_FILTER_ENDPOINT
-            response = request_search(url=url_base,
-                                      headers={'Content-Type': 'application/json'},
-                                      method='POST',
-                                      data=json.dumps(query_json))
-        else:
-            url_base = app.config['SEARCHSERVICE_BASE'] + SEARCH_TABLE_ENDPOINT
-            url = f'{url_base}?query_term={search_term}&page_index={page_index}'
-            response = request_search(url=url)
-
-        status_code = response.status_code
+        status_code, search_results = _get_search_results(resource=TABLE_RESOURCE,
+                                                          search_term=search_term,
+                                                          page_index=int(page_index),
+                                                          filters=filters,
+                                                          timeout_sec=timeout_sec)
         if status_code == HTTPStatus.OK:
             results_dict['msg'] = 'Success'
-            results = response.json().get('results')
-            tables['results'] = [map_table_result(result) for result in results]
-            tables['total_results'] = response.json().get('total_results')
+            tables['results'] = search_results['results']
+            tables['total_results'] = search_results['total_results']
         else:
             message = 'Encountered error: Search request failed'
             results_dict['msg'] = message
@@ -110,10 +120,34 @@ def _search_table(*, search_term: str, page_index: int, filters: Dict, search_ty
     except Exception as e:
         message = 'Encountered exception: ' + str(e)
         results_dict['msg'] = message
+        results_dict['status_code'] = get_error_status_code(e)
         logging.exception(message)
         return results_dict
 
 
+def _fetch_table_results(*, search_term: str, page_index: int, filters: Dict,
+                         timeout_sec: float = 0) -> Tuple[int, Dict]:
+    if has_filters(filters=filters, resource=TABLE_RESOURCE):
+        query_json = generate_query_json(filters=filters, page_index=page_index, search_term=search_term)
+        url_base = app.config['SEARCHSERVICE_BASE'] + SEARCH_TABLE_FILTER_ENDPOINT
+        response = request_search(url=url_base,
+                                  headers={'Content-Type': 'application/json'},
+                                  method='POST',
+                                  data=dumpb(query_json),
+                                  timeout_sec=timeout_sec)
+    else:
+        url_base = app.config['SEARCHSERVICE_BASE'] + SEARCH_TABLE_ENDPOINT
+        url = f'{url_base}?query_term={search_term}&page_index={page_index}'
+        response = request_search(url=url, timeout_sec=timeout_sec)
+
+    if response.status_code != HTTPStatus.OK:
+        return response.status_code, {}
+    return HTTPStatus.OK, {
+        'results': [map_table_result(result) for result in response.json().get('results')],
+        'total_results': response.json().get('total_results'),
+    }
+
+
 @search_blueprint.route('/user', methods=['GET'])
 def search_user() -> Response:
     """
@@ -131,11 +165,11 @@ def search_user() -> Response:
     except Exception as e:
         message = 'Encountered exception: ' + str(e)
         logging.exception(message)
-        return make_response(jsonify(results_dict), HTTPStatus.INTERNAL_SERVER_ERROR)
+        return make_response(jsonify(results_dict), get_error_status_code(e))
 
 
 @action_logging
-def _search_user(*, search_term: str, page_index: int, search_type: str) -> Dict[str, Any]:
+def _search_user(*, search_term: str, page_index: int, search_type: str, timeout_sec: float = 0) -> Dict[str, Any]:
     """
     Call the search service endpoint and return matching results
     Search service logic defined here:
@@ -143,12 +177,6 @@ def _search_user(*, search_term: str, page_index: int, search_type: str) -> Dict
 
     :return: a json output containing search results array as 'results'
     """
-
-    def _map_user_result(result: Dict) -> Dict:
-        user_result = dump_user(load_user(result))
-        user_result['type'] = 'user'
-        return user_result
-
     users = {
         'page_index': page_index,
         'results': [],
@@ -163,17 +191,14 @@ def _search_user(*, search_term: str, page_index: int, search_type: str) -> Dict
     }
 
     try:
-        url_base = app.config['SEARCHSERVICE_BASE'] + SEARCH_USER_ENDPOINT
-        url = f'{url_base}?query_term={search_term}&page_index={page_index}'
-
-        response = request_search(url=url)
-        status_code = response.status_code
-
+        status_code, search_results = _get_search_results(resource=USER_RESOURCE,
+                                                          search_term=search_term,
+                                                          page_index=page_index,
+                                                          timeout_sec=timeout_sec)
         if status_code == HTTPStatus.OK:
             results_dict['msg'] = 'Success'
-            results = response.json().get('results', list())
-            users['results'] = [_map_user_result(result) for result in results]
-            users['total_results'] = response.json().get('total_results', 0)
+            users['results'] = search_results['results']
+            users['total_results'] = search_results['total_results']
         else:
             message = 'Encountered error: Search request failed'
             results_dict['msg'] = message
@@ -184,11 +209,30 @@ def _search_user(*, search_term: str, page_index: int, search_type: str) -> Dict
     except Exception as e:
         message = 'Encountered exception: ' + str(e)
         results_dict['msg'] = message
-        results_dict['status_code'] = HTTPStatus.INTERNAL_SERVER_ERROR
+        results_dict['status_code'] = get_error_status_code(e)
         logging.exception(message)
         return results_dict
 
 
+def _fetch_user_results(*, search_term: str, page_index: int, filters: Dict,
+                        timeout_sec: float = 0) -> Tuple[int, Dict]:
+    def _map_user_result(result: Dict) -> Dict:
+        user_result = dump_user(load_user(result))
+        user_result['type'] = 'user'
+        return user_result
+
+    url_base = app.config['SEARCHSERVICE_BASE'] + SEARCH_USER_ENDPOINT
+    url = f'{url_base}?query_term={search_term}&page_index={page_index}'
+    response = request_search(url=url, timeout_sec=timeout_sec)
+
+    if response.status_code != HTTPStatus.OK:
+        return response.status_code, {}
+    return HTTPStatus.OK, {
+        'results': [_map_user_result(result) for result in response.json().get('results', list())],
+        'total_results': response.json().get('total_results', 0),
+    }
+
+
 @search_blueprint.route('/dashboard', methods=['POST'])
 def search_dashboard() -> Response:
     """
@@ -201,7 +245,7 @@ def search_dashboard() -> Response:
         search_term = get_query_param(request_json, 'term', '"term" parameter expected in request data')
         page_index = get_query_param(request_json, 'pageIndex', '"pageIndex" parameter expected in request data')
         search_type = request_json.get('searchType')
-        transformed_filters = transform_filters(filters=request_json.get('filters', {}), resource='dashboard')
+        transformed_filters = transform_filters(filters=request_json.get('filters', {}), resource=DASHBOARD_RESOURCE)
 
         results_dict = _search_dashboard(filters=transformed_filters,
                                          search_term=search_term,
@@ -212,11 +256,12 @@ def search_dashboard() -> Response:
     except Exception as e:
         message = 'Encountered exception: ' + str(e)
         logging.exception(message)
-        return make_response(jsonify(results_dict), HTTPStatus.INTERNAL_SERVER_ERROR)
+        return make_response(jsonify(results_dict), get_error_status_code(e))
 
 
 @action_logging
-def _search_dashboard(*, search_term: str, page_index: int, filters: Dict, search_type: str) -> Dict[str, Any]:
+def _search_dashboard(*, search_term: str, page_index: int, filters: Dict, search_type: str,
+                      timeout_sec: float = 0) -> Dict[str, Any]:
     """
     Call the search service endpoint and return matching results
     Search service logic defined here:
@@ -235,27 +280,18 @@ def _search_dashboard(*, search_term: str, page_index: int, filters: Dict, searc
         'search_term': search_term,
         'msg': '',
         'dashboards': dashboards,
-    }
+    }  # type: Dict[str, Any]
 
     try:
-        if has_filters(filters=filters, resource='dashboard'):
-            query_json = generate_query_json(filters=filters, page_index=page_index, search_term=search_term)
-            url_base = app.config['SEARCHSERVICE_BASE'] + SEARCH_DASHBOARD_FILTER_ENDPOINT
-            response = request_search(url=url_base,
-                                      headers={'Content-Type': 'application/json'},
-                                      method='POST',
-                                      data=json.dumps(query_json))
-        else:
-            url_base = app.config['SEARCHSERVICE_BASE'] + SEARCH_DASHBOARD_ENDPOINT
-            url = f'{url_base}?query_term={search_term}&page_index={page_index}'
-            response = request_search(url=url)
-
-        status_code = response.status_code
+        status_code, search_results = _get_search_results(resource=DASHBOARD_RESOURCE,
+                                                          search_term=search_term,
+                                                          page_index=int(page_index),
+                                                          filters=filters,
+                                                          timeout_sec=timeout_sec)
         if status_code == HTTPStatus.OK:
             results_dict['msg'] = 'Success'
-            results = response.json().get('results')
-            dashboards['results'] = [marshall_dashboard_partial(result) for result in results]
-            dashboards['total_results'] = response.json().get('total_results')
+            dashboards['results'] = search_results['results']
+            dashboards['total_results'] = search_results['total_results']
         else:
             message = 'Encountered error: Search request failed'
             results_dict['msg'] = message
@@ -266,5 +302,271 @@ def _search_dashboard(*, search_term: str, page_index: int, filters: Dict, searc
     except Exception as e:
         message = 'Encountered exception: ' + str(e)
         results_dict['msg'] = message
+        results_dict['status_code'] = get_error_status_code(e)
         logging.exception(message)
         return results_dict
+
+
+def _fetch_dashboard_results(*, search_term: str, page_index: int, filters: Dict,
+                             timeout_sec: float = 0) -> Tuple[int, Dict]:
+    if has_filters(filters=filters, resource=DASHBOARD_RESOURCE):
+        query_json = generate_query_json(filters=filters, page_index=page_index, search_term=search_term)
+        url_base = app.config['SEARCHSERVICE_BASE'] + SEARCH_DASHBOARD_FILTER_ENDPOINT
+        response = request_search(url=url_base,
+                                  headers={'Content-Type': 'application/json'},
+                                  method='POST',
+                                  data=dumpb(query_json),
+                                  timeout_sec=timeout_sec)
+    else:
+        url_base = app.config['SEARCHSERVICE_BASE'] + SEARCH_DASHBOARD_ENDPOINT
+        url = f'{url_base}?query_term={search_term}&page_index={page_index}'
+        response = request_search(url=url, timeout_sec=timeout_sec)
+
+    if response.status_code != HTTPStatus.OK:
+        return response.status_code, {}
+    return HTTPStatus.OK, {
+        'results': [marshall_dashboard_partial(result) for result in response.json().get('results')],
+        'total_results': response.json().get('total_results'),
+    }
+
+
+@search_blueprint.route('/all', methods=['POST'])
+def search_all() -> Response:
+    """
+    Runs the table, dashboard and user searches concurrently and merges their results, so the latency is that of
+    the slowest search rather than the sum of all of them. A search still running after its
+    SEARCH_RESOURCE_TIMEOUT_SEC is reported as timed out without holding back the others.
+    Request data: 'term', 'pageIndex', optional 'searchType', 'filters' as {'table': {...}, 'dashboard': {...}}
+    and 'resources', the subset of ['table', 'dashboard', 'user'] to search (all by default).
+    :return: a JSON object with the payloads of '/table' as 'tables', '/dashboard' as 'dashboards' and '/user' as
+    'users', each with its own 'msg' and 'status_code'
+    """
+    try:
+        request_json = request.get_json()
+        if not isinstance(request_json, dict):
+            message = 'The body must be a JSON object'
+            return make_response(jsonify({'msg': message}), HTTPStatus.BAD_REQUEST)
+
+        search_term = get_query_param(request_json, 'term', '"term" parameter expected in request data')
+        page_index = int(get_query_param(request_json, 'pageIndex',
+                                         '"pageIndex" parameter expected in request data'))
+        search_type = request_json.get('searchType')
+        filters = request_json.get('filters', {})
+        resources = request_json.get('resources', [TABLE_RESOURCE, DASHBOARD_RESOURCE, USER_RESOURCE])
+
+        # The searches are also passed their timeout, so that a search given up on does not keep waiting for the
+        # search service
+        default_timeout_sec = app.config['REQUEST_SESSION_TIMEOUT_SEC']
+        timeouts = {resource: app.config['SEARCH_RESOURCE_TIMEOUT_SEC'].get(resource, default_timeout_sec)
+                    for resource in _RESOURCE_SECTIONS}
+        start = time.monotonic()
+        futures = {}  # type: Dict[str, Future]
+        if TABLE_RESOURCE in resources:
+            futures[TABLE_RESOURCE] = submit_in_context(
+                _search_table,
+                filters=transform_filters(filters=filters.get(TABLE_RESOURCE, {}), resource=TABLE_RESOURCE),
+                search_term=search_term,
+                page_index=page_index,
+                search_type=search_type,
+                timeout_sec=timeouts[TABLE_RESOURCE])
+        if DASHBOARD_RESOURCE in resources:
+            futures[DASHBOARD_RESOURCE] = submit_in_context(
+                _search_dashboard,
+                filters=transform_filters(filters=filters.get(DASHBOARD_RESOURCE, {}), resource=DASHBOARD_RESOURCE),
+                search_term=search_term,
+                page_index=page_index,
+                search_type=search_type,
+                timeout_sec=timeouts[DASHBOARD_RESOURCE])
+        if USER_RESOURCE in resources:
+            futures[USER_RESOURCE] = submit_in_context(_search_user,
+                                                       search_term=search_term,
+                                                       page_index=page_index,
+                                                       search_type=search_type,
+                                                       timeout_sec=timeouts[USER_RESOURCE])
+
+        payload = {'search_term': search_term, 'msg': 'Success'}  # type: Dict[str, Any]
+        status_codes = []
+        for resource, future in futures.items():
+            section = _get_search_section(resource=resource,
+                                          future=future,
+                                          timeout_sec=max(start + timeouts[resource] - time.monotonic(), 0),
+                                          page_index=page_index)
+            payload[_RESOURCE_SECTIONS[resource]] = section
+            status_codes.append(section['status_code'])
+
+        # Partial results are still results: the request only fails if every search did
+        if HTTPStatus.OK not in status_codes and status_codes:
+            payload['msg'] = 'Encountered error: Search request failed'
+            return make_response(jsonify(payload), status_codes[0])
+        return make_response(jsonify(payload), HTTPStatus.OK)
+    except Exception as e:
+        message = 'Encountered exception: ' + str(e)
+        logging.exception(message)
+        return make_response(jsonify({'msg': message}), get_error_status_code(e))
+
+
+def _get_search_section(*, resource: str, future: Future, timeout_sec: float, page_index: int) -> Dict[str, Any]:
+    """
+    Waits for the result of a search submitted by search_all
+    :return: the resource section of the search results, with the 'msg' and 'status_code' of the search
+    """
+    section = _RESOURCE_SECTIONS[resource]
+    try:
+        results_dict = future.result(timeout=timeout_sec)
+        status_code = results_dict.get('status_code', HTTPStatus.INTERNAL_SERVER_ERROR)
+        return dict(results_dict[section], msg=results_dict['msg'], status_code=status_code)
+    except TimeoutError:
+        message = f'Encountered error: {resource} search timed out'
+        status_code = HTTPStatus.GATEWAY_TIMEOUT
+    except Exception as e:
+        message = f'Encountered exception searching {resource}: ' + str(e)
+        status_code = get_error_status_code(e)
+    logging.error(message)
+    return {'page_index': page_index, 'results': [], 'total_results': 0, 'msg': message, 'status_code': status_code}
+
+
+_SEARCH_RESULT_FETCHERS = {
+    TABLE_RESOURCE: _fetch_table_results,
+    USER_RESOURCE: _fetch_user_results,
+    DASHBOARD_RESOURCE: _fetch_dashboard_results,
+}  # type: Dict[str, Callable[..., Tuple[int, Dict]]]
+
+
+@search_blueprint.route('/typeahead', methods=['GET'])
+def typeahead() -> Response:
+    """
+    Suggests tables, schemas, tags and dashboards whose name starts with the given prefix, from an index kept in
+    memory so that it can be called on every keystroke. Suggestions are not action logged.
+    Query parameters: 'prefix', optional 'limit' (TYPEAHEAD_MAX_RESULTS by default) and 'types', a comma separated
+    subset of 'table,schema,tag,dashboard'.
+    :return: a JSON object with the suggestions as 'results'
+    """
+    if not app.config['TYPEAHEAD_ENABLED']:
+        return make_response(jsonify({'results': [], 'msg': 'Typeahead is not enabled'}), HTTPStatus.NOT_IMPLEMENTED)
+
+    try:
+        prefix = get_query_param(request.args, 'prefix', 'Endpoint takes a "prefix" parameter')
+        limit = min(int(request.args.get('limit', app.config['TYPEAHEAD_MAX_RESULTS'])),
+                    app.config['TYPEAHEAD_MAX_RESULTS'])
+        types = request.args.get('types')
+
+        results = typeahead_index.search(prefix.strip(),
+                                         limit=limit,
+                                         types=types.split(',') if types else None) if prefix.strip() else []
+        return make_response(jsonify({'results': results, 'msg': 'Success'}), HTTPStatus.OK)
+    except Exception as e:
+        message = 'Encountered exception: ' + str(e)
+        logging.exception(message)
+        return make_response(jsonify({'results': [], 'msg': message}), get_error_status_code(e))
+
+
+def _load_typeahead_entries() -> List[Tuple[str, Dict]]:
+    """
+    Collects the names to suggest: all tags, and the tables (with their schemas) and dashboards of the popular
+    tables and of up to TYPEAHEAD_SEARCH_MAX_PAGES pages of search results for TYPEAHEAD_SEARCH_TERM
+    :return: (term, suggestion) pairs
+    """
+    metadata_base = app.config['METADATASERVICE_BASE']
+    entries = []  # type: List[Tuple[str, Dict]]
+
+    response = request_metadata(url=metadata_base + TAGS_ENDPOINT)
+    if response.status_code == HTTPStatus.OK:
+        for tag in response.json().get('tag_usages', []):
+            entries.append((tag['tag_name'], {'type': 'tag', 'name': tag['tag_name']}))
+
+    tables = {}  # type: Dict[str, Dict]
+    response = request_metadata(url=f'{metadata_base}{POPULAR_TABLES_ENDPOINT}/')
+    if response.status_code == HTTPStatus.OK:
+        for table in response.json().get('popular_tables', []):
+            table = map_table_result(table)
+            tables[table['key']] = table
+
+    tables.update(_search_typeahead_results(TABLE_RESOURCE))
+
+    schemas = set()
+    for table in tables.values():
+        entries.append((table['name'], table))
+        entries.append(('{}.{}'.format(table['schema'], table['name']), table))
+        schemas.add(table['schema'])
+    for schema in sorted(schema for schema in schemas if schema):
+        entries.append((schema, {'type': 'schema', 'name': schema}))
+    for dashboard in _search_typeahead_results(DASHBOARD_RESOURCE).values():
+        entries.append((dashboard['name'], dashboard))
+    return entries
+
+
+def _search_typeahead_results(resource: str) -> Dict[str, Dict]:
+    """
+    :return: the marshalled search results for TYPEAHEAD_SEARCH_TERM, by key
+    """
+    results = {}  # type: Dict[str, Dict]
+    for page_index in range(app.config['TYPEAHEAD_SEARCH_MAX_PAGES']):
+        status_code, search_results = _SEARCH_RESULT_FETCHERS[resource](search_term=app.config['TYPEAHEAD_SEARCH_TERM'],
+                                                                        page_index=page_index,
+                                                                        filters={})
+        if status_code != HTTPStatus.OK or not search_results['results']:
+            break
+        for result in search_results['results']:
+            results[result['key']] = result
+    return results
+
+
+typeahead_index = TypeaheadIndex(load=_load_typeahead_entries)
+
+
+def _get_search_results(*, resource: str, search_term: str, page_index: int,
+                        filters: Optional[Dict] = None, timeout_sec: float = 0) -> Tuple[int, Dict]:
+    """
+    Fetches a page of marshalled search results, from the search results cache when enabled.
+    With SEARCH_RESULTS_PREFETCH_ENABLED, the next page is then fetched in the background if there is one and the
+    page was not cached, so that paging through results prefetches one page ahead.
+    :param timeout_sec: The timeout of the call to the search service, REQUEST_SESSION_TIMEOUT_SEC if 0
+    :return: the status code of the search service and, if OK, a dict with 'results' and 'total_results'
+    """
+    filters = filters or {}
+    search_cache = get_search_results_cache()
+    if search_cache is None:
+        return _SEARCH_RESULT_FETCHERS[resource](search_term=search_term, page_index=page_index, filters=filters,
+                                                 timeout_sec=timeout_sec)
+
+    search_term = normalize_search_term(search_term)
+    credentials = get_credentials_fingerprint()
+    cache_key = search_cache_key(resource=resource, search_term=search_term, page_index=page_index, filters=filters,
+                                 credentials=credentials)
+    search_results = search_cache.get(cache_key)
+    if search_results is not None:
+        return HTTPStatus.OK, search_results
+
+    status_code, search_results = _SEARCH_RESULT_FETCHERS[resource](search_term=search_term,
+                                                                    page_index=page_index,
+                                                                    filters=filters,
+                                                                    timeout_sec=timeout_sec)
+    if status_code != HTTPStatus.OK:
+        return status_code, {}
+    search_cache.set(cache_key, search_results)
+
+    page_size = len(search_results['results'])
+    if app.config['SEARCH_RESULTS_PREFETCH_ENABLED'] and 0 < page_size and \
+            (page_index + 1) * page_size < (search_results['total_results'] or 0):
+        submit_in_background(_prefetch_search_results, resource=resource, search_term=search_term,
+                             page_index=page_index + 1, filters=filters, credentials=credentials)
+    return HTTPStatus.OK, search_results
+
+
+def _prefetch_search_results(*, resource: str, search_term: str, page_index: int, filters: Dict,
+                             credentials: str) -> None:
+    search_cache = get_search_results_cache()
+    cache_key = search_cache_key(resource=resource, search_term=search_term, page_index=page_index, filters=filters,
+                                 credentials=credentials)
+    if search_cache is None or search_cache.get(cache_key) is not None:
+        return
+
+    try:
+        status_code, search_results = _SEARCH_RESULT_FETCHERS[resource](search_term=search_term,
+                                                                        page_index=page_index,
+                                                                        filters=filters)
+        if status_code == HTTPStatus.OK:
+            search_cache.set(cache_key, search_results)
+    except Exception:
+        message = 'Failed to prefetch page {} of the {} search for {}'.format(page_index, resource, search_term)
+        LOGGER.exception(message)
@@ -0,0 +1,52 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+from collections import Counter
+from threading import Lock
+from typing import Dict, cast
+
+from flask import current_app as app
+from flask import g, has_request_context, request
+from werkzeug.local import LocalProxy
+
+from amundsen_application.models.user import User
+
+_stats = Counter()  # type: Counter
+_stats_lock = Lock()
+
+
+def _count(**increments: int) -> None:
+    with _stats_lock:
+        _stats.update(increments)
+
+
+def get_auth_user_stats() -> Dict[str, int]:
+    """
+    :return: Counters of the current process: 'resolved' calls of AUTH_USER_METHOD, and 'cached' calls of
+    get_current_user that returned the user resolved earlier in the same request
+    """
+    with _stats_lock:
+        return dict(_stats)
+
+
+def get_current_user() -> User:
+    """
+    Returns the user of the current request, resolved with AUTH_USER_METHOD on the first call of the request and
+    kept on flask.g for the following ones. Outside of a request, AUTH_USER_METHOD is called every time.
+    AUTH_USER_METHOD has to be configured.
+    """
+    if not has_request_context():
+        _count(resolved=1)
+        return app.config['AUTH_USER_METHOD'](app)
+
+    # The request is kept along with the user, as an application context, and so g, can outlive a request
+    current_request = cast(LocalProxy, request)._get_current_object()
+    cached = g.get('_current_user')
+    if cached is not None and cached[0] is current_request:
+        _count(cached=1)
+        return cached[1]
+
+    user = app.config['AUTH_USER_METHOD'](app)
+    g._current_user = (current_request, user)
+    _count(resolved=1)
+    return user
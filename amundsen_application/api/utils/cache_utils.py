@@ -0,0 +1,212 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import logging
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Optional, Tuple  # noqa: F401
+
+from flask import current_app as app
+
+from amundsen_application.base.base_cache_backend import BaseCacheBackend
+from amundsen_application.proxy.cache_backends import get_cache_backend
+
+LOGGER = logging.getLogger(__name__)
+
+TABLE_METADATA_CACHE = 'table_metadata'
+POPULAR_TABLES_CACHE = 'popular_tables'
+SEARCH_RESULTS_CACHE = 'search_results'
+METADATA_READS_CACHE = 'metadata_reads'
+
+
+class TTLCache:
+    """
+    A thread safe, size bounded LRU cache whose entries also expire after a time to live.
+    Keeps hit, miss and eviction counters.
+    """
+    def __init__(self, *, max_size: int, ttl_sec: float) -> None:
+        self.max_size = max_size
+        self.ttl_sec = ttl_sec
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._entries = OrderedDict()  # type: OrderedDict[str, Tuple[float, Any]]
+        self._lock = Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        :return: The cached value, or None if the key is missing or has expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any, ttl_sec: Optional[float] = None) -> None:
+        """
+        :param ttl_sec: Time to live of this entry, defaults to the ttl_sec of the cache
+        """
+        ttl_sec = self.ttl_sec if ttl_sec is None else ttl_sec
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl_sec, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'size': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+        }
+
+
+class CacheNamespace:
+    """
+    A view over the configured cache backend that prefixes keys with a namespace and applies the namespace's TTL.
+    Cache failures are logged and otherwise treated as misses: a broken cache never fails a request.
+    """
+    def __init__(self, *, backend: BaseCacheBackend, namespace: str, ttl_sec: float) -> None:
+        self.backend = backend
+        self.namespace = namespace
+        self.ttl_sec = ttl_sec
+
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            return self.backend.get(self._key(key))
+        except Exception:
+            LOGGER.exception('Failed to read {} from the {} cache'.format(key, self.namespace))
+            return None
+
+    def set(self, key: str, value: Any) -> None:
+        try:
+            self.backend.set(self._key(key), value, ttl_sec=self.ttl_sec)
+        except Exception:
+            LOGGER.exception('Failed to write {} to the {} cache'.format(key, self.namespace))
+
+    def delete(self, key: str) -> None:
+        try:
+            self.backend.delete(self._key(key))
+        except Exception:
+            LOGGER.exception('Failed to delete {} from the {} cache'.format(key, self.namespace))
+
+    def _key(self, key: str) -> str:
+        return '{}:{}'.format(self.namespace, key)
+
+
+def get_table_metadata_cache() -> Optional[CacheNamespace]:
+    """
+    Provides the cache of marshalled table details, keyed by table key
+    :return: CacheNamespace, or None if TABLE_METADATA_CACHE_ENABLED is off
+    """
+    if not app.config['TABLE_METADATA_CACHE_ENABLED']:
+        return None
+    return CacheNamespace(backend=get_cache_backend(),
+                          namespace=TABLE_METADATA_CACHE,
+                          ttl_sec=app.config['TABLE_METADATA_CACHE_TTL_SEC'])
+
+
+def get_popular_tables_cache() -> Optional[CacheNamespace]:
+    """
+    Provides the cache of marshalled popular tables, keyed by user id ('' for the global list)
+    :return: CacheNamespace, or None if POPULAR_TABLES_CACHE_ENABLED is off
+    """
+    if not app.config['POPULAR_TABLES_CACHE_ENABLED']:
+        return None
+    return CacheNamespace(backend=get_cache_backend(),
+                          namespace=POPULAR_TABLES_CACHE,
+                          ttl_sec=app.config['POPULAR_TABLES_CACHE_TTL_SEC'])
+
+
+def get_search_results_cache() -> Optional[CacheNamespace]:
+    """
+    Provides the cache of marshalled search result pages, keyed by search_utils.search_cache_key
+    :return: CacheNamespace, or None if SEARCH_RESULTS_CACHE_ENABLED is off
+    """
+    if not app.config['SEARCH_RESULTS_CACHE_ENABLED']:
+        return None
+    return CacheNamespace(backend=get_cache_backend(),
+                          namespace=SEARCH_RESULTS_CACHE,
+                          ttl_sec=app.config['SEARCH_RESULTS_CACHE_TTL_SEC'])
+
+
+def get_metadata_reads_cache() -> Optional[CacheNamespace]:
+    """
+    Provides the cache of the metadata reads served stale-while-revalidate (see swr_utils), keyed by read.
+    Entries are dropped after METADATA_SWR_HARD_TTL_SEC.
+    :return: CacheNamespace, or None if METADATA_SWR_ENABLED is off
+    """
+    if not app.config['METADATA_SWR_ENABLED']:
+        return None
+    return CacheNamespace(backend=get_cache_backend(),
+                          namespace=METADATA_READS_CACHE,
+                          ttl_sec=app.config['METADATA_SWR_HARD_TTL_SEC'])
+
+
+def get_table_metadata_read_key(table_key: str) -> str:
+    """
+    :return: The key of the details of a table in the metadata reads cache
+    """
+    return 'table:' + table_key
+
+
+def invalidate_table_metadata(table_key: str) -> None:
+    """
+    Drops the cached details of a table. To be called whenever the frontend changes that table.
+    :param table_key: table key e.g. 'database://cluster.schema/table'
+    """
+    table_cache = get_table_metadata_cache()
+    if table_cache is not None:
+        table_cache.delete(table_key)
+    metadata_reads_cache = get_metadata_reads_cache()
+    if metadata_reads_cache is not None:
+        metadata_reads_cache.delete(get_table_metadata_read_key(table_key))
+
+
+def get_dashboard_metadata_read_key(uri: str) -> str:
+    """
+    :return: The key of the details of a dashboard in the metadata reads cache
+    """
+    return 'dashboard:' + uri
+
+
+def invalidate_dashboard_metadata(uri: str) -> None:
+    """
+    Drops the cached details of a dashboard. To be called whenever the frontend changes that dashboard.
+    :param uri: dashboard uri e.g. 'product_dashboard://cluster.group/name'
+    """
+    metadata_reads_cache = get_metadata_reads_cache()
+    if metadata_reads_cache is not None:
+        metadata_reads_cache.delete(get_dashboard_metadata_read_key(uri))
+
+
+def get_cache_stats() -> Dict[str, int]:
+    """
+    :return: The usage counters of the configured cache backend for this process
+    """
+    return get_cache_backend().get_stats()
@@ -0,0 +1,187 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import gzip
+import hashlib
+import logging
+import mimetypes
+import os
+from collections import Counter
+from threading import Lock
+from typing import Dict, List, Optional
+
+from flask import Flask, Response, request, safe_join, send_file
+from flask import current_app as app
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None  # type: ignore
+
+LOGGER = logging.getLogger(__name__)
+
+BROTLI_ENCODING = 'br'
+GZIP_ENCODING = 'gzip'
+
+# File extension of the compressed copies of static files, by encoding
+_STATIC_EXTENSIONS = {
+    BROTLI_ENCODING: '.br',
+    GZIP_ENCODING: '.gz',
+}
+
+_stats = Counter()  # type: Counter
+_stats_lock = Lock()
+
+
+def _count(**increments: int) -> None:
+    with _stats_lock:
+        _stats.update(increments)
+
+
+def get_compression_stats() -> Dict[str, int]:
+    """
+    :return: Counters of the compressed API responses and of the compressed static files of the current process
+    """
+    with _stats_lock:
+        return dict(_stats)
+
+
+def get_available_encodings() -> List[str]:
+    """
+    :return: The content encodings the frontend can compress with, by order of preference
+    """
+    return [BROTLI_ENCODING, GZIP_ENCODING] if brotli is not None else [GZIP_ENCODING]
+
+
+def negotiate_encoding() -> Optional[str]:
+    """
+    :return: The preferred content encoding of the current request's Accept-Encoding header, or None if the client
+    accepts none of the available ones
+    """
+    best = None  # type: Optional[str]
+    best_quality = 0.0
+    for encoding in get_available_encodings():
+        quality = request.accept_encodings.quality(encoding)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(data: bytes, encoding: str, *, static: bool = False) -> bytes:
+    """
+    :param static: Compress with the maximum level, for content compressed once and served many times
+    """
+    if encoding == BROTLI_ENCODING:
+        quality = 11 if static else app.config['COMPRESSION_BROTLI_QUALITY']
+        return brotli.compress(data, quality=quality)
+    return gzip.compress(data, compresslevel=9 if static else app.config['COMPRESSION_GZIP_LEVEL'])
+
+
+def _is_compressible(mimetype: Optional[str]) -> bool:
+    return mimetype in app.config['COMPRESSION_MIMETYPES']
+
+
+def compress_response(response: Response) -> Response:
+    """
+    after_request hook compressing the API responses of at least COMPRESSION_MIN_SIZE bytes with the encoding
+    negotiated with the client. Streamed responses and static files (see send_static_file) are left as they are.
+    """
+    if not app.config['COMPRESSION_ENABLED'] or request.endpoint == 'static':
+        return response
+    if response.direct_passthrough or response.is_streamed or 'Content-Encoding' in response.headers:
+        return response
+    if response.status_code < 200 or response.status_code in (204, 206, 304):
+        return response
+    if not _is_compressible(response.mimetype) or 'no-transform' in response.headers.get('Cache-Control', ''):
+        return response
+
+    data = response.get_data()
+    if len(data) < app.config['COMPRESSION_MIN_SIZE']:
+        return response
+
+    # The response differs by Accept-Encoding, whether or not this client gets it compressed
+    response.vary.add('Accept-Encoding')
+    encoding = negotiate_encoding()
+    if encoding is None:
+        return response
+
+    compressed = compress(data, encoding)
+    response.set_data(compressed)
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag is not None:
+        response.set_etag('{}-{}'.format(etag, encoding), weak=bool(weak))
+    _count(compressed_responses=1, compressed_bytes_in=len(data), compressed_bytes_out=len(compressed))
+    return response
+
+
+def _static_cache_path(path: str, encoding: str) -> str:
+    stat = os.stat(path)
+    name = '{}-{}-{}{}'.format(hashlib.sha1(path.encode('utf-8')).hexdigest(), stat.st_mtime_ns, stat.st_size,
+                               _STATIC_EXTENSIONS[encoding])
+    return os.path.join(app.config['STATIC_COMPRESSION_CACHE_DIR'], name)
+
+
+def get_compressed_static_file(path: str, encoding: str) -> Optional[str]:
+    """
+    Provides a compressed copy of a static file: the file with a .br or .gz extension next to it when the build
+    produced one, else a copy compressed on first serve into STATIC_COMPRESSION_CACHE_DIR and shared by the
+    worker processes. Copies are named after the modification time and size of the file, so that a new build is
+    compressed again.
+    :return: The path of the compressed copy, or None if it could not be written
+    """
+    precompressed = path + _STATIC_EXTENSIONS[encoding]
+    if os.path.isfile(precompressed) and os.path.getmtime(precompressed) >= os.path.getmtime(path):
+        _count(static_precompressed=1)
+        return precompressed
+
+    cache_path = _static_cache_path(path, encoding)
+    if os.path.isfile(cache_path):
+        _count(static_cache_hits=1)
+        return cache_path
+
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(path, 'rb') as f:
+            compressed = compress(f.read(), encoding, static=True)
+        # Written under a temporary name, so that other workers never serve a partial file
+        tmp_path = '{}.{}.tmp'.format(cache_path, os.getpid())
+        with open(tmp_path, 'wb') as f:
+            f.write(compressed)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        LOGGER.exception('Failed to compress static file {}'.format(path))
+        return None
+    _count(static_cache_misses=1)
+    return cache_path
+
+
+def send_static_file(filename: str) -> Response:
+    """
+    View of the static endpoint serving the static files of at least COMPRESSION_MIN_SIZE bytes compressed, each
+    of them being compressed once (see get_compressed_static_file)
+    """
+    mimetype = mimetypes.guess_type(filename)[0]
+    if not app.config['STATIC_COMPRESSION_ENABLED'] or not _is_compressible(mimetype):
+        return app.send_static_file(filename)
+
+    path = safe_join(app.static_folder, filename)
+    if not os.path.isfile(path) or os.path.getsize(path) < app.config['COMPRESSION_MIN_SIZE']:
+        return app.send_static_file(filename)
+
+    encoding = negotiate_encoding()  # type: Optional[str]
+    compressed_path = get_compressed_static_file(path, encoding) if encoding is not None else None
+    if encoding is None or compressed_path is None:
+        response = app.send_static_file(filename)
+    else:
+        response = send_file(compressed_path, mimetype=mimetype, conditional=True,
+                             cache_timeout=app.get_send_file_max_age(filename))
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+def init_compression(flask_app: Flask) -> None:
+    flask_app.after_request(compress_response)
+    if flask_app.has_static_folder:
+        flask_app.view_functions['static'] = send_static_file
@@ -0,0 +1,100 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Request deadlines, used when REQUEST_DEADLINE_ENABLED is on: each API request gets a time budget when it starts, and
+its calls to the search and metadata services (see request_utils.request_wrapper) only get the time that is left.
+The deadline is kept on flask.g, so that the calls made on the upstream thread pool share it.
+"""
+
+import time
+from collections import Counter
+from threading import Lock
+from typing import Dict, Optional, Tuple
+
+from flask import Flask, g, has_app_context, request
+from flask import current_app as app
+
+from amundsen_application.api.exceptions import DeadlineExceededError
+
+# Lets the Envoy sidecar enforce the timeout of the calls made with an Envoy client, which takes no timeout
+ENVOY_TIMEOUT_HEADER = 'x-envoy-upstream-rq-timeout-ms'
+
+_stats = Counter()  # type: Counter
+_stats_lock = Lock()
+
+
+def _count(**increments: int) -> None:
+    with _stats_lock:
+        _stats.update(increments)
+
+
+def get_deadline_stats() -> Dict[str, int]:
+    """
+    :return: Counters of the current process: upstream calls not sent because the deadline had passed ('exceeded'),
+    and calls that timed out on a timeout shortened by the deadline ('timeouts')
+    """
+    with _stats_lock:
+        return dict(_stats)
+
+
+def set_request_deadline() -> None:
+    """
+    before_request hook setting the deadline of the request, REQUEST_DEADLINE_ENDPOINT_SEC of its endpoint or
+    REQUEST_DEADLINE_SEC from now
+    """
+    if not app.config['REQUEST_DEADLINE_ENABLED']:
+        g.pop('request_deadline', None)
+        return
+    budget_sec = app.config['REQUEST_DEADLINE_ENDPOINT_SEC'].get(request.endpoint, app.config['REQUEST_DEADLINE_SEC'])
+    g.request_deadline = time.time() + budget_sec
+
+
+def get_request_deadline() -> Optional[float]:
+    """
+    :return: The deadline of the current request in epoch seconds, or None if it has none
+    """
+    if not has_app_context():
+        return None
+    return g.get('request_deadline')
+
+
+def apply_request_deadline(*,
+                           timeout_sec: float,
+                           headers: Optional[Dict],
+                           envoy: bool) -> Tuple[float, Optional[Dict], bool]:
+    """
+    Fits an upstream call in the deadline of the current request: the timeout is cut to the time left, and the
+    deadline (epoch milliseconds) is added to the headers as REQUEST_DEADLINE_HEADER
+    :param envoy: Whether the call is made with an Envoy client, to which the timeout is passed as a header
+    :return: The timeout and headers of the call, and whether the timeout was shortened
+    :raise: DeadlineExceededError if the deadline has passed
+    """
+    deadline = get_request_deadline()
+    if deadline is None:
+        return timeout_sec, headers, False
+
+    remaining_sec = deadline - time.time()
+    if remaining_sec <= 0:
+        _count(exceeded=1)
+        raise DeadlineExceededError('The deadline of the request has passed')
+
+    shortened = remaining_sec < timeout_sec
+    timeout_sec = min(timeout_sec, remaining_sec)
+    headers = dict(headers or {})
+    headers[app.config['REQUEST_DEADLINE_HEADER']] = str(int(deadline * 1000))
+    if envoy:
+        headers[ENVOY_TIMEOUT_HEADER] = str(int(timeout_sec * 1000))
+    return timeout_sec, headers, shortened
+
+
+def deadline_timeout_error() -> DeadlineExceededError:
+    """
+    :return: The error to raise instead of the timeout of a call whose timeout was shortened by the deadline
+    """
+    _count(timeouts=1)
+    return DeadlineExceededError('The deadline of the request passed during the call')
+
+
+def init_request_deadlines(flask_app: Flask) -> None:
+    flask_app.before_request(set_request_deadline)
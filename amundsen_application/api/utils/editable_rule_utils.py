@@ -0,0 +1,127 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import re
+from typing import Any, Dict, Iterable, List, Optional, Pattern, Set, Tuple, Union  # noqa: F401
+
+from amundsen_application.config import MatchRuleObject
+
+# A pattern matching exactly one name, e.g. '^my_schema$' or 'my\.schema$'
+_LITERAL_PATTERN = re.compile(r'^\^?((?:[\w-]|\\\.)*)(?:\$|\\Z)$')
+# Patterns that cannot be merged into an alternation with others: group names and back references would clash across
+# the whole alternation, and global inline flags are only allowed at the very start of a pattern
+_UNMERGEABLE_PATTERN = re.compile(r'\\[1-9]|\(\?P[<=]|\(\?\(|\(\?[aiLmsux]+\)')
+
+UneditableRule = Union[str, MatchRuleObject]
+
+
+class _PatternSet:
+    """
+    Matches a name against many regexes at once. Patterns are combined into a single precompiled alternation, so
+    that a name matching none of them (the common case) costs one regex call whatever the number of patterns.
+    """
+    def __init__(self, patterns: Iterable[str]) -> None:
+        self.patterns = list(dict.fromkeys(patterns))
+        self._compiled = [re.compile(pattern) for pattern in self.patterns]
+
+        mergeable = [pattern for pattern in self.patterns if not _UNMERGEABLE_PATTERN.search(pattern)]
+        self._merged = re.compile('|'.join('(?:{})'.format(pattern) for pattern in mergeable)) if mergeable else None
+        self._unmerged = [regex for pattern, regex in zip(self.patterns, self._compiled) if pattern not in mergeable]
+
+    def matches_any(self, name: str) -> bool:
+        if self._merged is not None and self._merged.match(name):
+            return True
+        return any(regex.match(name) for regex in self._unmerged)
+
+    def matching(self, name: str) -> Set[str]:
+        """
+        :return: every pattern matching name
+        """
+        if not self.matches_any(name):
+            return set()
+        return {pattern for pattern, regex in zip(self.patterns, self._compiled) if regex.match(name)}
+
+
+class EditableRuleMatcher:
+    """
+    UNEDITABLE_SCHEMAS and UNEDITABLE_TABLE_DESCRIPTION_MATCH_RULES compiled into a matcher whose cost stays roughly
+    constant as rules are added: schemas and rules matching an exact schema name are looked up in a set, and the
+    regexes of the remaining rules are merged into one alternation per field. Rules keep the semantics of
+    re.match (anchored at the start of the name only), and a rule with both regexes requires both to match.
+    """
+    def __init__(self, *, uneditable_schemas: Iterable[str], rules: Iterable[MatchRuleObject]) -> None:
+        self._exact_schemas = {}  # type: Dict[str, UneditableRule]
+        for schema in uneditable_schemas:
+            self._exact_schemas.setdefault(schema, schema)
+
+        self._rules = []  # type: List[Tuple[MatchRuleObject, Optional[Pattern], Optional[Pattern]]]
+        schema_patterns = []  # type: List[str]
+        table_patterns = []  # type: List[str]
+        for rule in rules:
+            literal = _LITERAL_PATTERN.match(rule.schema_regex or '')
+            if rule.schema_regex and not rule.table_name_regex and literal:
+                self._exact_schemas.setdefault(literal.group(1).replace('\\.', '.'), rule)
+                continue
+            if not rule.schema_regex and not rule.table_name_regex:
+                # Matches nothing, see _parse_editable_rule
+                continue
+
+            self._rules.append((rule,
+                                re.compile(rule.schema_regex) if rule.schema_regex else None,
+                                re.compile(rule.table_name_regex) if rule.table_name_regex else None))
+            if rule.schema_regex:
+                schema_patterns.append(rule.schema_regex)
+            if rule.table_name_regex:
+                table_patterns.append(rule.table_name_regex)
+
+        self._schema_patterns = _PatternSet(schema_patterns)
+        self._table_patterns = _PatternSet(table_patterns)
+
+    def find_uneditable_rule(self, schema_name: str, table_name: str) -> Optional[UneditableRule]:
+        """
+        :return: The UNEDITABLE_SCHEMAS entry or MatchRuleObject making the table uneditable,
+        or None if the table is editable
+        """
+        exact = self._exact_schemas.get(schema_name)
+        if exact is not None:
+            return exact
+        if not self._rules:
+            return None
+
+        matching_schema_patterns = self._schema_patterns.matching(schema_name)
+        matching_table_patterns = self._table_patterns.matching(table_name)
+        if not matching_schema_patterns and not matching_table_patterns:
+            return None
+
+        # Only reached for uneditable tables (or near misses): find the rule that matched, in configuration order
+        for rule, schema_regex, table_regex in self._rules:
+            if (schema_regex is None or rule.schema_regex in matching_schema_patterns) and \
+                    (table_regex is None or rule.table_name_regex in matching_table_patterns):
+                return rule
+        return None
+
+    def is_editable(self, schema_name: str, table_name: str) -> bool:
+        return self.find_uneditable_rule(schema_name, table_name) is None
+
+
+_editable_rule_matcher = None  # type: Optional[Tuple[Any, Any, EditableRuleMatcher]]
+
+
+def get_editable_rule_matcher(cfg: Any) -> EditableRuleMatcher:
+    """
+    Provides the EditableRuleMatcher of the given configuration, compiled on first use and again only if the
+    UNEDITABLE_SCHEMAS or UNEDITABLE_TABLE_DESCRIPTION_MATCH_RULES setting is replaced
+    :param cfg: app.config, or any mapping with the two settings
+    :return: EditableRuleMatcher
+    """
+    global _editable_rule_matcher
+
+    schemas = cfg['UNEDITABLE_SCHEMAS']
+    rules = cfg['UNEDITABLE_TABLE_DESCRIPTION_MATCH_RULES']
+    cached = _editable_rule_matcher
+    if cached is not None and cached[0] is schemas and cached[1] is rules:
+        return cached[2]
+
+    matcher = EditableRuleMatcher(uneditable_schemas=schemas, rules=rules)
+    _editable_rule_matcher = (schemas, rules, matcher)
+    return matcher
@@ -0,0 +1,121 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import functools
+import json
+import logging
+from typing import Any, Callable, Optional
+
+from flask import current_app as app
+from flask import has_app_context
+from flask.json import JSONEncoder as FlaskJSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+try:
+    import ujson
+except ImportError:  # pragma: no cover
+    ujson = None  # type: ignore
+
+LOGGER = logging.getLogger(__name__)
+
+AUTO_BACKEND = 'auto'
+ORJSON_BACKEND = 'orjson'
+UJSON_BACKEND = 'ujson'
+STDLIB_BACKEND = 'json'
+
+_INSTALLED_BACKENDS = {
+    ORJSON_BACKEND: orjson is not None,
+    UJSON_BACKEND: ujson is not None,
+    STDLIB_BACKEND: True,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _resolve_backend(configured: str) -> str:
+    if configured == AUTO_BACKEND:
+        return next(backend for backend, installed in _INSTALLED_BACKENDS.items() if installed)
+    if _INSTALLED_BACKENDS.get(configured):
+        return configured
+    LOGGER.warning('JSON backend {} is not available, falling back to {}'.format(configured, STDLIB_BACKEND))
+    return STDLIB_BACKEND
+
+
+def get_json_backend() -> str:
+    """
+    :return: The JSON library used to encode, from the JSON_BACKEND config: 'orjson', 'ujson' or 'json'
+    """
+    configured = app.config['JSON_BACKEND'] if has_app_context() else STDLIB_BACKEND
+    return _resolve_backend(configured)
+
+
+def dumps(obj: Any, *, sort_keys: bool = False, default: Optional[Callable[[Any], Any]] = None,
+          pretty: bool = False, backend: Optional[str] = None) -> str:
+    """
+    Encodes obj to a JSON string with the configured JSON backend. The 'json' backend returns what json.dumps does,
+    the other ones encode compactly and without escaping non-ASCII characters.
+    Like json.dumps, raises a TypeError for objects that cannot be encoded, unless default converts them.
+    :param default: Called with the objects the backend cannot encode, returns an encodable replacement
+    :param pretty: Indent with 2 spaces
+    :param backend: Overrides the configured JSON backend
+    """
+    backend = backend or get_json_backend()
+    if backend == ORJSON_BACKEND:
+        return _orjson_dumps(obj, sort_keys=sort_keys, default=default, pretty=pretty).decode('utf-8')
+
+    if backend == UJSON_BACKEND and default is None:
+        try:
+            return ujson.dumps(obj, sort_keys=sort_keys, ensure_ascii=False, escape_forward_slashes=False,
+                               indent=2 if pretty else 0)
+        except OverflowError as e:
+            raise TypeError(str(e)) from e
+
+    return json.dumps(obj, sort_keys=sort_keys, default=default, indent=2 if pretty else None)
+
+
+def dumpb(obj: Any, *, sort_keys: bool = False) -> bytes:
+    """
+    Encodes obj to compact UTF-8 JSON with the configured JSON backend, e.g. for the body of a request to the
+    metadata or search service
+    """
+    if get_json_backend() == ORJSON_BACKEND:
+        return _orjson_dumps(obj, sort_keys=sort_keys)
+    return dumps(obj, sort_keys=sort_keys).encode('utf-8')
+
+
+def _orjson_dumps(obj: Any, *, sort_keys: bool = False, default: Optional[Callable[[Any], Any]] = None,
+                  pretty: bool = False) -> bytes:
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+    if sort_keys:
+        option |= orjson.OPT_SORT_KEYS
+    if pretty:
+        option |= orjson.OPT_INDENT_2
+    return orjson.dumps(obj, default=default, option=option)
+
+
+class JSONEncoder(FlaskJSONEncoder):
+    """
+    Flask JSON encoder (set as app.json_encoder) that encodes with the configured JSON backend, so that jsonify and
+    every other use of flask.json benefit from it. Objects unknown to the backend are converted by the default method
+    of the Flask encoder (dates, UUIDs...). Encodings the backend cannot reproduce (custom separators or indents,
+    iterencode) are left to the Flask encoder.
+    """
+    def encode(self, o: Any) -> str:
+        backend = get_json_backend()
+        if backend == STDLIB_BACKEND:
+            return super().encode(o)
+
+        compact = self.indent is None and self.item_separator == ','
+        pretty = self.indent == 2
+        if not (compact or pretty):
+            return super().encode(o)
+
+        # ujson has no default hook: a payload with objects it cannot encode is left to the Flask encoder
+        default = self.default if backend == ORJSON_BACKEND else None
+        try:
+            return dumps(o, sort_keys=self.sort_keys, default=default, pretty=pretty, backend=backend)
+        except TypeError:
+            return super().encode(o)
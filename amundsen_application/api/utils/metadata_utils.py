@@ -6,11 +6,12 @@ import urllib.parse
 
 from dataclasses import dataclass
 from marshmallow import EXCLUDE
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from amundsen_common.models.dashboard import DashboardSummary, DashboardSummarySchema
 from amundsen_common.models.popular_table import PopularTable, PopularTableSchema
 from amundsen_common.models.table import Table, TableSchema
+from amundsen_application.api.utils.editable_rule_utils import UneditableRule, get_editable_rule_matcher
 from amundsen_application.models.user import load_user, dump_user
 from amundsen_application.config import MatchRuleObject
 from flask import current_app as app
@@ -39,6 +40,14 @@ class TableUri:
         )
 
 
+# Marshmallow schemas hold no per call state, instances are built once and shared
+_POPULAR_TABLE_SCHEMA = PopularTableSchema()
+_DASHBOARD_SUMMARY_SCHEMA = DashboardSummarySchema(unknown=EXCLUDE)
+
+_POPULAR_TABLE_REQUIRED_FIELDS = ('database', 'cluster', 'schema', 'name')
+_DASHBOARD_SUMMARY_REQUIRED_FIELDS = ('uri', 'cluster', 'group_name', 'group_url', 'product', 'name', 'url')
+
+
 def marshall_table_partial(table_dict: Dict) -> Dict:
     """
     Forms a short version of a table Dict, with selected fields and an added 'key'
@@ -47,18 +56,40 @@ def marshall_table_partial(table_dict: Dict) -> Dict:
 
     TODO - Unify data format returned by search and metadata.
     """
-    schema = PopularTableSchema()
-    table: PopularTable = schema.load(table_dict, unknown=EXCLUDE)
-    results = schema.dump(table)
+    results = _project_popular_table(table_dict)
+    if results is None:
+        # Not a plain well formed table, let the schema validate (and convert) it
+        table: PopularTable = _POPULAR_TABLE_SCHEMA.load(table_dict, unknown=EXCLUDE)
+        results = _POPULAR_TABLE_SCHEMA.dump(table)
     # TODO: fix popular tables to provide these? remove if we're not using them?
     # TODO: Add the 'key' or 'id' to the base PopularTableSchema
-    results['key'] = f'{table.database}://{table.cluster}.{table.schema}/{table.name}'
+    results['key'] = f'{results["database"]}://{results["cluster"]}.{results["schema"]}/{results["name"]}'
     results['last_updated_timestamp'] = None
     results['type'] = 'table'
 
     return results
 
 
+def _project_popular_table(table_dict: Dict) -> Optional[Dict]:
+    """
+    Equivalent of loading and dumping table_dict with PopularTableSchema for the common case where every field
+    already has the expected type, without the cost of marshmallow.
+    :return: the dumped PopularTable, or None if table_dict needs the schema to be validated or converted
+    """
+    results = {}
+    for field in _POPULAR_TABLE_REQUIRED_FIELDS:
+        value = table_dict.get(field)
+        if type(value) is not str:
+            return None
+        results[field] = value
+
+    description = table_dict.get('description')
+    if description is not None and type(description) is not str:
+        return None
+    results['description'] = description
+    return results
+
+
 def _parse_editable_rule(rule: MatchRuleObject,
                          schema: str,
                          table: str) -> bool:
@@ -87,14 +118,19 @@ def is_table_editable(schema_name: str, table_name: str, cfg: Any = None) -> boo
     if cfg is None:
         cfg = app.config
 
-    if schema_name in cfg['UNEDITABLE_SCHEMAS']:
-        return False
+    return get_editable_rule_matcher(cfg).is_editable(schema_name, table_name)
 
-    for rule in cfg['UNEDITABLE_TABLE_DESCRIPTION_MATCH_RULES']:
-        if not _parse_editable_rule(rule, schema_name, table_name):
-            return False
 
-    return True
+def get_uneditable_rule(schema_name: str, table_name: str, cfg: Any = None) -> Optional[UneditableRule]:
+    """
+    Explains is_table_editable
+    :return: The UNEDITABLE_SCHEMAS entry or the MatchRuleObject of UNEDITABLE_TABLE_DESCRIPTION_MATCH_RULES making
+    the table uneditable, or None if the table is editable
+    """
+    if cfg is None:
+        cfg = app.config
+
+    return get_editable_rule_matcher(cfg).find_uneditable_rule(schema_name, table_name)
 
 
 def marshall_table_full(table_dict: Dict) -> Dict:
@@ -119,15 +155,7 @@ def marshall_table_full(table_dict: Dict) -> Dict:
     for reader_object in readers:
         reader_object['user'] = _map_user_object_to_schema(reader_object['user'])
 
-    columns = results['columns']
-    for col in columns:
-        # Set editable state
-        col['is_editable'] = is_editable
-        # If order is provided, we sort the column based on the pre-defined order
-        if app.config['COLUMN_STAT_ORDER']:
-            # the stat_type isn't defined in COLUMN_STAT_ORDER, we just use the max index for sorting
-            col['stats'].sort(key=lambda x: app.config['COLUMN_STAT_ORDER'].
-                              get(x['stat_type'], len(app.config['COLUMN_STAT_ORDER'])))
+    _marshall_columns(results['columns'], is_editable=is_editable, stat_order=app.config['COLUMN_STAT_ORDER'])
 
     # TODO: Add the 'key' or 'id' to the base TableSchema
     results['key'] = f'{table.database}://{table.cluster}.{table.schema}/{table.name}'
@@ -141,6 +169,28 @@ def marshall_table_full(table_dict: Dict) -> Dict:
     return results
 
 
+def _marshall_columns(columns: List[Dict], *, is_editable: bool, stat_order: Optional[Dict[str, int]]) -> None:
+    """
+    Sets the editable state of every column and, if a stat order is provided, sorts the column stats by it.
+    A single pass over the columns, all lookups shared by the columns are resolved beforehand.
+    :param stat_order: COLUMN_STAT_ORDER
+    """
+    stat_rank = None
+    if stat_order:
+        # the stat_type isn't defined in COLUMN_STAT_ORDER, we just use the max index for sorting
+        get_rank = stat_order.get
+        unordered_rank = len(stat_order)
+
+        def stat_rank(stat: Dict) -> int:
+            return get_rank(stat['stat_type'], unordered_rank)
+
+    for col in columns:
+        col['is_editable'] = is_editable
+        stats = col['stats']
+        if stat_rank is not None and len(stats) > 1:
+            stats.sort(key=stat_rank)
+
+
 def marshall_dashboard_partial(dashboard_dict: Dict) -> Dict:
     """
     Forms a short version of dashboard metadata, with selected fields and an added 'key'
@@ -148,9 +198,11 @@ def marshall_dashboard_partial(dashboard_dict: Dict) -> Dict:
     :param dashboard_dict: Dict of partial dashboard metadata
     :return: partial dashboard Dict
     """
-    schema = DashboardSummarySchema(unknown=EXCLUDE)
-    dashboard: DashboardSummary = schema.load(dashboard_dict)
-    results = schema.dump(dashboard)
+    results = _project_dashboard_summary(dashboard_dict)
+    if results is None:
+        # Not a plain well formed dashboard, let the schema validate (and convert) it
+        dashboard: DashboardSummary = _DASHBOARD_SUMMARY_SCHEMA.load(dashboard_dict)
+        results = _DASHBOARD_SUMMARY_SCHEMA.dump(dashboard)
     results['type'] = 'dashboard'
     # TODO: Bookmark logic relies on key, opting to add this here to avoid messy logic in
     # React app and we have to clean up later.
@@ -158,6 +210,38 @@ def marshall_dashboard_partial(dashboard_dict: Dict) -> Dict:
     return results
 
 
+def _project_dashboard_summary(dashboard_dict: Dict) -> Optional[Dict]:
+    """
+    Equivalent of loading and dumping dashboard_dict with DashboardSummarySchema for the common case where every
+    field already has the expected type, without the cost of marshmallow.
+    :return: the dumped DashboardSummary, or None if dashboard_dict needs the schema to be validated or converted
+    """
+    results = {}  # type: Dict[str, Any]
+    for field in _DASHBOARD_SUMMARY_REQUIRED_FIELDS:
+        value = dashboard_dict.get(field)
+        if type(value) is not str:
+            return None
+        results[field] = value
+
+    description = dashboard_dict.get('description')
+    if description is not None and type(description) is not str:
+        return None
+    results['description'] = description
+
+    timestamp = dashboard_dict.get('last_successful_run_timestamp')
+    if timestamp is not None and type(timestamp) is not int:
+        return None
+    results['last_successful_run_timestamp'] = timestamp
+
+    chart_names = dashboard_dict.get('chart_names', [])
+    if chart_names is not None:
+        if type(chart_names) is not list or any(type(chart_name) is not str for chart_name in chart_names):
+            return None
+        chart_names = list(chart_names)
+    results['chart_names'] = chart_names
+    return results
+
+
 def marshall_dashboard_full(dashboard_dict: Dict) -> Dict:
     """
     Cleanup some fields in the dashboard response
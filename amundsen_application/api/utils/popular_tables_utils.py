@@ -0,0 +1,167 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import logging
+import os
+import time
+from threading import Event, Lock, Thread
+from typing import Callable, Dict, List, Optional, Set, Tuple  # noqa: F401
+
+from flask import Flask
+from flask import current_app as app
+
+from amundsen_application.api.utils.cache_utils import TTLCache
+from amundsen_application.api.utils.request_utils import submit_in_background
+
+LOGGER = logging.getLogger(__name__)
+
+# Delay before the global list is loaded again after a failure, doubled up to the refresh interval
+GLOBAL_LOAD_MIN_RETRY_SEC = 1.0
+
+
+class PopularTablesRefresher:
+    """
+    Serves popular tables from memory. The global list is refreshed by a background thread every
+    POPULAR_TABLES_REFRESH_INTERVAL_SEC. Personalized lists are kept in a bounded per-user cache: a user without an
+    entry gets the global list while theirs is fetched in the background, and an entry older than the refresh
+    interval is served as is while it gets refreshed.
+    Only the very first request of a process waits for the metadata service, to load the global list. If that fails,
+    the load is retried with an exponential back-off, by one request at a time and by the background thread, and
+    get_popular_tables returns None meanwhile for the caller to fetch the popular tables itself.
+    """
+    def __init__(self, *, fetch: Callable[[str], List[Dict]]) -> None:
+        """
+        :param fetch: Returns the marshalled popular tables of a user id, or the global ones for ''
+        """
+        self._fetch = fetch
+        self._global_tables = None  # type: Optional[List[Dict]]
+        self._user_tables = None  # type: Optional[TTLCache]
+        self._pending_user_ids = set()  # type: Set[str]
+        self._global_loading = False
+        self._global_retry_at = 0.0
+        self._global_retry_sec = GLOBAL_LOAD_MIN_RETRY_SEC
+        self._lock = Lock()
+        self._stop = Event()
+        self._pid = None  # type: Optional[int]
+        self.refresh_interval_sec = 0  # type: float
+        self.global_refreshes = 0
+        self.global_refresh_failures = 0
+        self.user_refreshes = 0
+
+    def get_popular_tables(self, user_id: str = '') -> Optional[List[Dict]]:
+        """
+        :param user_id: The user to personalize the popular tables for, or '' for the global list
+        :return: marshalled popular tables, or None if the global list is not loaded and cannot be loaded right now
+        because it is being loaded by another request or because the last load failed recently
+        """
+        self._ensure_started()
+
+        if user_id:
+            entry = self._user_tables.get(user_id)  # type: ignore
+            if entry is None:
+                self._schedule_user_refresh(user_id)
+            else:
+                fetched_at, tables = entry
+                if time.monotonic() - fetched_at >= self.refresh_interval_sec:
+                    self._schedule_user_refresh(user_id)
+                return tables
+
+        if self._global_tables is None:
+            self._load_global()
+        return self._global_tables
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def get_stats(self) -> Dict[str, int]:
+        user_stats = self._user_tables.get_stats() if self._user_tables is not None else {}
+        return {
+            'global_refreshes': self.global_refreshes,
+            'global_refresh_failures': self.global_refresh_failures,
+            'user_refreshes': self.user_refreshes,
+            'user_hits': user_stats.get('hits', 0),
+            'user_misses': user_stats.get('misses', 0),
+            'user_evictions': user_stats.get('evictions', 0),
+        }
+
+    def _ensure_started(self) -> None:
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+
+        with self._lock:
+            if self._pid == pid:
+                return
+            # First use in this process, the state and thread inherited from a parent process are discarded
+            self.refresh_interval_sec = app.config['POPULAR_TABLES_REFRESH_INTERVAL_SEC']
+            self._global_tables = None
+            self._user_tables = TTLCache(max_size=app.config['POPULAR_TABLES_USER_CACHE_MAX_SIZE'],
+                                         ttl_sec=app.config['POPULAR_TABLES_USER_CACHE_TTL_SEC'])
+            self._pending_user_ids = set()
+            self._global_loading = False
+            self._global_retry_at = 0.0
+            self._global_retry_sec = GLOBAL_LOAD_MIN_RETRY_SEC
+            self._stop = Event()
+            Thread(target=self._run, args=(app._get_current_object(), self._stop),
+                   name='popular-tables-refresher', daemon=True).start()
+            self._pid = pid
+
+    def _run(self, flask_app: Flask, stop: Event) -> None:
+        while not stop.wait(self._next_refresh_delay()):
+            with flask_app.app_context():
+                if self._global_tables is None:
+                    self._load_global()
+                else:
+                    self._refresh_global()
+
+    def _next_refresh_delay(self) -> float:
+        if self._global_tables is None:
+            return max(self._global_retry_at - time.monotonic(), GLOBAL_LOAD_MIN_RETRY_SEC)
+        return self.refresh_interval_sec
+
+    def _load_global(self) -> None:
+        with self._lock:
+            if self._global_loading or time.monotonic() < self._global_retry_at:
+                return
+            self._global_loading = True
+        try:
+            if self._refresh_global():
+                self._global_retry_sec = GLOBAL_LOAD_MIN_RETRY_SEC
+            else:
+                self._global_retry_at = time.monotonic() + self._global_retry_sec
+                self._global_retry_sec = min(self._global_retry_sec * 2,
+                                             max(self.refresh_interval_sec, GLOBAL_LOAD_MIN_RETRY_SEC))
+        finally:
+            self._global_loading = False
+
+    def _refresh_global(self) -> bool:
+        """
+        :return: Whether the global list could be refreshed. Failures are logged, the calls made outside of a
+        request need BACKGROUND_REQUEST_HEADERS_METHOD when REQUEST_HEADERS_METHOD relies on the session of the user.
+        """
+        try:
+            self._global_tables = self._fetch('')
+            self.global_refreshes += 1
+            return True
+        except Exception:
+            self.global_refresh_failures += 1
+            LOGGER.exception('Failed to refresh the popular tables')
+            return False
+
+    def _schedule_user_refresh(self, user_id: str) -> None:
+        with self._lock:
+            if user_id in self._pending_user_ids:
+                return
+            self._pending_user_ids.add(user_id)
+        submit_in_background(self._refresh_user, user_id)
+
+    def _refresh_user(self, user_id: str) -> None:
+        try:
+            tables = self._fetch(user_id)
+            self._user_tables.set(user_id, (time.monotonic(), tables))  # type: ignore
+            self.user_refreshes += 1
+        except Exception:
+            LOGGER.exception('Failed to refresh the popular tables of {}'.format(user_id))
+        finally:
+            with self._lock:
+                self._pending_user_ids.discard(user_id)
@@ -1,10 +1,36 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
-from typing import Dict
+import base64
+import binascii
+import hashlib
+import json as json_lib
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+from http.cookiejar import DefaultCookiePolicy
+from http import HTTPStatus
+from threading import Lock
+from typing import Any, Callable, Deque, Dict, Hashable, Optional, Set, Tuple  # noqa: F401
 
 import requests
+from flask import copy_current_request_context, g, has_request_context, request
 from flask import current_app as app
+from requests.adapters import HTTPAdapter
+
+from amundsen_application.api.exceptions import CircuitOpenError, DeadlineExceededError
+from amundsen_application.api.utils.auth_utils import get_current_user
+from amundsen_application.api.utils.cache_utils import TTLCache
+from amundsen_application.api.utils.deadline_utils import apply_request_deadline, deadline_timeout_error, \
+    get_request_deadline
+from amundsen_application.api.utils.json_utils import dumpb
+
+LOGGER = logging.getLogger(__name__)
+
+METADATA_SERVICE = 'metadata'
+SEARCH_SERVICE = 'search'
 
 
 def get_query_param(args: Dict, param: str, error_msg: str = None) -> str:
@@ -19,7 +45,7 @@ def request_metadata(*,     # type: ignore
                      url: str,
                      method: str = 'GET',
                      headers=None,
-                     timeout_sec: int = 0,
+                     timeout_sec: float = 0,
                      data=None,
                      json=None):
     """
@@ -36,7 +62,7 @@ def request_metadata(*,     # type: ignore
         headers = {}
 
     if app.config['REQUEST_HEADERS_METHOD']:
-        headers.update(app.config['REQUEST_HEADERS_METHOD'](app))
+        headers.update(get_request_headers())
     elif app.config['METADATASERVICE_REQUEST_HEADERS']:
         headers.update(app.config['METADATASERVICE_REQUEST_HEADERS'])
     return request_wrapper(method=method,
@@ -45,14 +71,15 @@ def request_metadata(*,     # type: ignore
                            headers=headers,
                            timeout_sec=timeout_sec,
                            data=data,
-                           json=json)
+                           json=json,
+                           service=METADATA_SERVICE)
 
 
 def request_search(*,     # type: ignore
                    url: str,
                    method: str = 'GET',
                    headers=None,
-                   timeout_sec: int = 0,
+                   timeout_sec: float = 0,
                    data=None,
                    json=None):
     """
@@ -69,7 +96,7 @@ def request_search(*,     # type: ignore
         headers = {}
 
     if app.config['REQUEST_HEADERS_METHOD']:
-        headers.update(app.config['REQUEST_HEADERS_METHOD'](app))
+        headers.update(get_request_headers())
     elif app.config['SEARCHSERVICE_REQUEST_HEADERS']:
         headers.update(app.config['SEARCHSERVICE_REQUEST_HEADERS'])
 
@@ -79,11 +106,243 @@ def request_search(*,     # type: ignore
                            headers=headers,
                            timeout_sec=timeout_sec,
                            data=data,
-                           json=json)
+                           json=json,
+                           service=SEARCH_SERVICE)
+
+
+def get_request_headers() -> Optional[Dict]:
+    """
+    Provides the headers of REQUEST_HEADERS_METHOD for the service-to-service calls of the current user, from the
+    process-wide RequestHeadersCache when REQUEST_HEADERS_CACHE_ENABLED is on. Outside of a request, the headers of
+    BACKGROUND_REQUEST_HEADERS_METHOD are provided if it is configured.
+    """
+    if not has_request_context():
+        headers_method = app.config['BACKGROUND_REQUEST_HEADERS_METHOD'] or app.config['REQUEST_HEADERS_METHOD']
+        headers = headers_method(app)
+        if headers is None:
+            raise Exception('No headers for a service-to-service call made outside of a request, '
+                            'BACKGROUND_REQUEST_HEADERS_METHOD has to be configured')
+        return headers
+
+    if not app.config['REQUEST_HEADERS_CACHE_ENABLED']:
+        return app.config['REQUEST_HEADERS_METHOD'](app)
+    return get_request_headers_cache().get_headers()
+
+
+def get_headers_fingerprint(headers: Optional[Dict]) -> str:
+    """
+    :return: A digest of the given headers, to key what is cached per credentials without keeping the credentials
+    """
+    return hashlib.sha256(json_lib.dumps(headers or {}, sort_keys=True).encode()).hexdigest()
+
+
+def get_credentials_fingerprint() -> str:
+    """
+    :return: The fingerprint of the REQUEST_HEADERS_METHOD headers of the current user, or '' when the same headers
+    are sent for everyone
+    """
+    if not app.config['REQUEST_HEADERS_METHOD']:
+        return ''
+    return get_headers_fingerprint(get_request_headers())
+
+
+def get_token_expiry(headers: Optional[Dict]) -> Optional[float]:
+    """
+    :return: The expiry time (epoch seconds) of the JWT bearer token of the Authorization header, or None if the
+    headers carry no such token. The token is only decoded, its signature is for the upstream services to verify.
+    """
+    scheme, _, token = (headers or {}).get('Authorization', '').partition(' ')
+    if scheme.lower() != 'bearer':
+        return None
+    parts = token.split('.')
+    if len(parts) != 3:
+        return None
+    try:
+        claims = json_lib.loads(base64.urlsafe_b64decode(parts[1] + '=' * (-len(parts[1]) % 4)))
+        return float(claims['exp'])
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        return None
+
+
+class RequestHeadersCache:
+    """
+    Caches the headers computed by REQUEST_HEADERS_METHOD by user and by fingerprint of the credentials of their
+    request (Authorization header and session cookie), so that the many upstream calls of a page, and of the following
+    pages, do not compute them again. Without a request or a user identity, the headers are computed every time.
+    Headers carrying a JWT bearer token are kept until the token expires, the other ones for
+    REQUEST_HEADERS_CACHE_TTL_SEC. Within REQUEST_HEADERS_REFRESH_AHEAD_SEC of their expiry, the cached headers are
+    still served while new ones are computed in the background, with a copy of the request context of the user.
+    """
+    def __init__(self, *, max_size: int, ttl_sec: float, refresh_ahead_sec: float) -> None:
+        self.ttl_sec = ttl_sec
+        self.refresh_ahead_sec = refresh_ahead_sec
+        self.refreshes = 0
+        self.refresh_failures = 0
+        # Values are (time to refresh at, headers)
+        self._headers = TTLCache(max_size=max_size, ttl_sec=ttl_sec)
+        self._pending_keys = set()  # type: Set[str]
+        self._lock = Lock()
+
+    def get_headers(self) -> Optional[Dict]:
+        key = self._get_key()
+        if key is None:
+            return app.config['REQUEST_HEADERS_METHOD'](app)
+
+        entry = self._headers.get(key)
+        if entry is None:
+            return self._compute(key)
+
+        refresh_at, headers = entry
+        if refresh_at <= time.monotonic():
+            self._schedule_refresh(key)
+        return headers
+
+    def get_stats(self) -> Dict[str, int]:
+        return dict(self._headers.get_stats(), refreshes=self.refreshes, refresh_failures=self.refresh_failures)
+
+    @staticmethod
+    def _get_key() -> Optional[str]:
+        if not has_request_context() or not app.config['AUTH_USER_METHOD']:
+            return None
+        user_id = get_current_user().user_id
+        if not user_id:
+            return None
+        credentials = {
+            'authorization': request.headers.get('Authorization'),
+            'session': request.cookies.get(app.config['SESSION_COOKIE_NAME']),
+        }
+        return '{}:{}'.format(user_id, get_headers_fingerprint(credentials))
+
+    def _compute(self, key: str) -> Optional[Dict]:
+        headers = app.config['REQUEST_HEADERS_METHOD'](app)
+        if headers is None:
+            return None
+
+        ttl_sec = self.ttl_sec
+        expiry = get_token_expiry(headers)
+        if expiry is not None:
+            ttl_sec = expiry - time.time()
+            if ttl_sec <= 0:
+                return headers
+        self._headers.set(key, (time.monotonic() + ttl_sec - self.refresh_ahead_sec, headers), ttl_sec=ttl_sec)
+        return headers
+
+    def _schedule_refresh(self, key: str) -> None:
+        with self._lock:
+            if key in self._pending_keys:
+                return
+            self._pending_keys.add(key)
+        submit_in_background(self._refresh, key)
+
+    def _refresh(self, key: str) -> None:
+        try:
+            self._compute(key)
+            self.refreshes += 1
+        except Exception:
+            self.refresh_failures += 1
+            LOGGER.exception('Failed to refresh the request headers')
+        finally:
+            with self._lock:
+                self._pending_keys.discard(key)
+
+
+_request_headers_cache = None  # type: Optional[RequestHeadersCache]
+_request_headers_cache_lock = Lock()
+
+
+def get_request_headers_cache() -> RequestHeadersCache:
+    """
+    Provides the process-wide RequestHeadersCache, created from the REQUEST_HEADERS_CACHE_* configs on first use
+    """
+    global _request_headers_cache
+
+    with _request_headers_cache_lock:
+        if _request_headers_cache is None:
+            _request_headers_cache = RequestHeadersCache(
+                max_size=app.config['REQUEST_HEADERS_CACHE_MAX_SIZE'],
+                ttl_sec=app.config['REQUEST_HEADERS_CACHE_TTL_SEC'],
+                refresh_ahead_sec=app.config['REQUEST_HEADERS_REFRESH_AHEAD_SEC'])
+        return _request_headers_cache
+
+
+def request_metadata_async(**kwargs: Any) -> Future:
+    """
+    Non-blocking variant of request_metadata. Takes the same keyword arguments.
+    :return: A Future resolving to the response of the metadata service
+    """
+    return submit_in_context(request_metadata, **kwargs)
+
+
+def request_search_async(**kwargs: Any) -> Future:
+    """
+    Non-blocking variant of request_search. Takes the same keyword arguments.
+    :return: A Future resolving to the response of the search service
+    """
+    return submit_in_context(request_search, **kwargs)
+
+
+def submit_in_context(func: Callable, *args: Any, **kwargs: Any) -> Future:
+    """
+    Runs func on the process-wide upstream thread pool. The worker gets a copy of the caller's request context
+    (or app context, outside of a request) and of flask.g, so helpers relying on the current app, request or
+    the authenticated user behave the same as in the calling thread. This includes the deadline of the request (see
+    deadline_utils), meant for the calls whose results the request waits for.
+    :param func: The function to call
+    :return: A Future resolving to the return value of func
+    """
+    return _submit(func, args, kwargs, dict(vars(g)))
+
+
+def submit_in_background(func: Callable, *args: Any, **kwargs: Any) -> Future:
+    """
+    Like submit_in_context, for the work the request does not wait for, e.g. cache refreshes and prefetches: the
+    worker does not inherit the deadline of the request, which would cut its upstream calls short or fail them.
+    :param func: The function to call
+    :return: A Future resolving to the return value of func
+    """
+    g_snapshot = dict(vars(g))
+    g_snapshot.pop('request_deadline', None)
+    return _submit(func, args, kwargs, g_snapshot)
+
+
+def _submit(func: Callable, args: Tuple, kwargs: Dict[str, Any], g_snapshot: Dict[str, Any]) -> Future:
+    def _call() -> Any:
+        vars(g).update(g_snapshot)
+        return func(*args, **kwargs)
+
+    if has_request_context():
+        run = copy_current_request_context(_call)
+    else:
+        flask_app = app._get_current_object()
+
+        def run() -> Any:
+            with flask_app.app_context():
+                return _call()
+
+    return _get_executor().submit(run)
+
+
+_executor = None  # type: Optional[ThreadPoolExecutor]
+_executor_pid = None  # type: Optional[int]
+_executor_lock = Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor, _executor_pid
+
+    pid = os.getpid()
+    with _executor_lock:
+        # Worker threads do not survive a fork, so a pool inherited from the parent process is replaced
+        if _executor is None or _executor_pid != pid:
+            _executor = ThreadPoolExecutor(max_workers=app.config['REQUEST_ASYNC_MAX_WORKERS'],
+                                           thread_name_prefix='upstream')
+            _executor_pid = pid
+        return _executor
 
 
 # TODO: Define an interface for envoy_client
-def request_wrapper(method: str, url: str, client, headers, timeout_sec: int, data=None, json=None):  # type: ignore
+def request_wrapper(method: str, url: str, client, headers, timeout_sec: float, data=None, json=None,  # type: ignore
+                    service=None):
     """
     Wraps a request to use Envoy client and headers, if available
     :param method: DELETE | GET | POST | PUT
@@ -92,11 +351,58 @@ def request_wrapper(method: str, url: str, client, headers, timeout_sec: int, da
     :param headers: Optional Envoy request headers
     :param timeout_sec: Number of seconds before timeout is triggered. Not used with Envoy
     :param data: Optional request payload
+    :param service: Optional upstream name (METADATA_SERVICE | SEARCH_SERVICE). When given, the request is sent
+    through that upstream's pooled session instead of a one-off session, and its circuit breaker, if enabled.
     :return:
+    :raise: CircuitOpenError when the circuit breaker of the service is open, DeadlineExceededError when the
+    deadline of the current request passes (see deadline_utils)
     """
     # If no timeout specified, use the one from the configurations.
     timeout_sec = timeout_sec or app.config['REQUEST_SESSION_TIMEOUT_SEC']
+    # Computed before the deadline headers, which differ from one call to the next, are added
+    coalescing_key = (url, tuple(sorted((headers or {}).items())))
+    call_timeout_sec, headers, shortened = apply_request_deadline(timeout_sec=timeout_sec, headers=headers,
+                                                                  envoy=client is not None)
+
+    def call() -> Any:
+        try:
+            return _dispatch(method=method, url=url, client=client, headers=headers, timeout_sec=call_timeout_sec,
+                             data=data, json=json, service=service)
+        except requests.Timeout as e:
+            if not shortened:
+                raise
+            raise deadline_timeout_error() from e
 
+    if service is not None and app.config['CIRCUIT_BREAKER_ENABLED']:
+        breaker_call = call
+        breaker = get_circuit_breaker(service)
+
+        def call() -> Any:
+            return breaker.call(breaker_call)
+
+    # A call whose timeout was cut by the deadline of its request is not shared: it could fail other requests that
+    # still have time left
+    if service is not None and method == 'GET' and app.config['REQUEST_COALESCING_ENABLED'] and not shortened:
+        # Identical concurrent GETs share one upstream call. Headers are part of the key, so calls made on behalf
+        # of different users are only coalesced when they would have been sent with the same credentials.
+        deadline = get_request_deadline()
+        wait_sec = None if deadline is None else max(deadline - time.time(), 0)
+        try:
+            return get_single_flight(service).do(coalescing_key, call, timeout_sec=wait_sec)
+        except TimeoutError as e:
+            raise deadline_timeout_error() from e
+    return call()
+
+
+def _dispatch(*,  # type: ignore
+              method: str,
+              url: str,
+              client,
+              headers,
+              timeout_sec: float,
+              data=None,
+              json=None,
+              service=None):
     if client is not None:
         if method == 'DELETE':
             return client.delete(url, headers=headers, raw_response=True)
@@ -108,18 +414,37 @@ def request_wrapper(method: str, url: str, client, headers, timeout_sec: int, da
             return client.put(url, headers=headers, raw_response=True, raw_request=True, data=data, json=json)
         else:
             raise Exception('Method not allowed: {}'.format(method))
+    elif service is not None:
+        return _send(get_session_pool(service).get_session(), method=method, url=url, headers=headers,
+                     timeout_sec=timeout_sec, data=data, json=json)
     else:
         with build_session() as s:
-            if method == 'DELETE':
-                return s.delete(url, headers=headers, timeout=timeout_sec)
-            elif method == 'GET':
-                return s.get(url, headers=headers, timeout=timeout_sec)
-            elif method == 'POST':
-                return s.post(url, headers=headers, timeout=timeout_sec, data=data, json=json)
-            elif method == 'PUT':
-                return s.put(url, headers=headers, timeout=timeout_sec, data=data, json=json)
-            else:
-                raise Exception('Method not allowed: {}'.format(method))
+            return _send(s, method=method, url=url, headers=headers, timeout_sec=timeout_sec, data=data, json=json)
+
+
+def _send(session: requests.Session, *,  # type: ignore
+          method: str,
+          url: str,
+          headers,
+          timeout_sec: float,
+          data=None,
+          json=None):
+    if json is not None:
+        # Encoded with the configured JSON backend rather than by requests
+        data = dumpb(json)
+        headers = dict(headers or {})
+        headers.setdefault('Content-Type', 'application/json')
+        json = None
+    if method == 'DELETE':
+        return session.delete(url, headers=headers, timeout=timeout_sec)
+    elif method == 'GET':
+        return session.get(url, headers=headers, timeout=timeout_sec)
+    elif method == 'POST':
+        return session.post(url, headers=headers, timeout=timeout_sec, data=data, json=json)
+    elif method == 'PUT':
+        return session.put(url, headers=headers, timeout=timeout_sec, data=data, json=json)
+    else:
+        raise Exception('Method not allowed: {}'.format(method))
 
 
 def build_session() -> requests.Session:
@@ -131,3 +456,315 @@ def build_session() -> requests.Session:
         session.cert = (cert, key)
 
     return session
+
+
+class SessionPool:
+    """
+    A keep-alive requests.Session for a single upstream service, shared by every thread of the current process.
+    The underlying urllib3 connection pool is thread safe, so concurrent requests reuse the same TCP (and TLS)
+    connections instead of opening a new one per call. Sessions are never shared across processes: a pool created
+    before a fork (e.g. gunicorn --preload) is rebuilt on first use in the worker.
+    """
+    def __init__(self, *, pool_size: int, keep_alive: bool) -> None:
+        self.pool_size = pool_size
+        self.keep_alive = keep_alive
+        self.hits = 0
+        self.misses = 0
+        self._pid = None  # type: Optional[int]
+        self._session = None  # type: Optional[requests.Session]
+        self._lock = Lock()
+
+    def get_session(self) -> requests.Session:
+        pid = os.getpid()
+        with self._lock:
+            if self._session is not None and self._pid == pid:
+                self.hits += 1
+                return self._session
+
+            self.misses += 1
+            self._session = self._build_session()
+            self._pid = pid
+            return self._session
+
+    def _build_session(self) -> requests.Session:
+        session = build_session()
+        # The session is shared by the calls made on behalf of every user, so no cookie set by an upstream response
+        # may be sent along with the following calls
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        if not self.keep_alive:
+            session.headers['Connection'] = 'close'
+        return session
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        :return: session hits/misses, plus the number of upstream requests and how many of them reused an
+        already open connection
+        """
+        requests_sent = 0
+        connections_opened = 0
+        session = self._session
+        if session is not None and self._pid == os.getpid():
+            for adapter in set(session.adapters.values()):
+                pools = adapter.poolmanager.pools
+                for pool_key in pools.keys():
+                    pool = pools.get(pool_key)
+                    if pool is not None:
+                        requests_sent += pool.num_requests
+                        connections_opened += pool.num_connections
+        return {
+            'pool_hits': self.hits,
+            'pool_misses': self.misses,
+            'requests': requests_sent,
+            'connections_opened': connections_opened,
+            'connections_reused': max(requests_sent - connections_opened, 0),
+        }
+
+
+_session_pools = {}  # type: Dict[str, SessionPool]
+_session_pools_lock = Lock()
+
+
+def get_session_pool(service: str) -> SessionPool:
+    """
+    Provides the process-wide SessionPool of the given upstream service, created from the
+    <SERVICE>SERVICE_REQUEST_POOL_SIZE and <SERVICE>SERVICE_REQUEST_KEEP_ALIVE configs on first use
+    :param service: METADATA_SERVICE | SEARCH_SERVICE
+    :return: SessionPool
+    """
+    pool = _session_pools.get(service)
+    if pool is not None:
+        return pool
+
+    with _session_pools_lock:
+        if service not in _session_pools:
+            config_prefix = '{}SERVICE_REQUEST'.format(service.upper())
+            _session_pools[service] = SessionPool(pool_size=app.config[config_prefix + '_POOL_SIZE'],
+                                                  keep_alive=app.config[config_prefix + '_KEEP_ALIVE'])
+        return _session_pools[service]
+
+
+def get_session_pool_stats() -> Dict[str, Dict[str, int]]:
+    """
+    :return: SessionPool.get_stats() of every upstream service that has been called by this process
+    """
+    return {service: pool.get_stats() for service, pool in list(_session_pools.items())}
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent calls: while a call for a key is in flight, other callers asking for the same key wait
+    for it and get its result (or its exception) instead of making their own call. Nothing is kept once the call
+    completes, so this is not a cache: a caller arriving afterwards makes a new call.
+    """
+    def __init__(self) -> None:
+        self.calls = 0
+        self.coalesced = 0
+        self._in_flight = {}  # type: Dict[Hashable, Future]
+        self._lock = Lock()
+
+    def do(self, key: Hashable, func: Callable[[], Any], timeout_sec: Optional[float] = None) -> Any:
+        """
+        :param key: Identifies calls that are interchangeable
+        :param func: Makes the call
+        :param timeout_sec: How long to wait for the call already in flight for key, if any. No limit by default
+        :return: The return value of func, called by this thread or by the thread already calling it for key
+        :raise: concurrent.futures.TimeoutError if the call in flight does not complete within timeout_sec
+        """
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.coalesced += 1
+            else:
+                self.calls += 1
+                leader_future = Future()  # type: Future
+                self._in_flight[key] = leader_future
+        if future is not None:
+            try:
+                return future.result(timeout=timeout_sec)
+            except DeadlineExceededError:
+                # The call ran out of the time of the request that made it, which says nothing about this one
+                return func()
+
+        try:
+            result = func()
+        except BaseException as e:
+            leader_future.set_exception(e)
+            raise
+        else:
+            leader_future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'calls': self.calls,
+            'coalesced': self.coalesced,
+            'in_flight': len(self._in_flight),
+        }
+
+
+_single_flights = {}  # type: Dict[str, SingleFlight]
+_single_flights_lock = Lock()
+
+
+def get_single_flight(service: str) -> SingleFlight:
+    """
+    Provides the process-wide SingleFlight coalescing the GET requests sent to the given upstream service
+    :param service: METADATA_SERVICE | SEARCH_SERVICE
+    :return: SingleFlight
+    """
+    with _single_flights_lock:
+        if service not in _single_flights:
+            _single_flights[service] = SingleFlight()
+        return _single_flights[service]
+
+
+def get_single_flight_stats() -> Dict[str, Dict[str, int]]:
+    """
+    :return: SingleFlight.get_stats() of every upstream service, 'coalesced' being the number of GET requests
+    that were answered by a call already in flight
+    """
+    return {service: single_flight.get_stats() for service, single_flight in list(_single_flights.items())}
+
+
+CIRCUIT_CLOSED = 'closed'
+CIRCUIT_OPEN = 'open'
+CIRCUIT_HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """
+    Stops calling an upstream service that keeps failing, so that requests fail right away instead of each of them
+    holding a worker thread until the timeout. The outcomes of the last window_size calls are kept: a call fails
+    when it raises or gets a 5xx response, and is slow when it takes more than slow_call_sec. Once at least
+    min_calls calls are known and the share of failed or slow ones reaches failure_rate, the circuit opens: calls
+    raise CircuitOpenError without being sent. After open_sec, the circuit is half open: a single probe call is
+    sent, while the other ones are still rejected. The circuit closes if the probe succeeds, else opens again.
+    """
+    def __init__(self, *,
+                 window_size: int,
+                 min_calls: int,
+                 failure_rate: float,
+                 slow_call_sec: float,
+                 open_sec: float) -> None:
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_sec = slow_call_sec
+        self.open_sec = open_sec
+        self.state = CIRCUIT_CLOSED
+        self.calls = 0
+        self.failures = 0
+        self.slow_calls = 0
+        self.rejected = 0
+        self.opened = 0
+        # True for the calls that failed or were slow
+        self._outcomes = deque(maxlen=window_size)  # type: Deque[bool]
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = Lock()
+
+    def call(self, func: Callable[[], Any]) -> Any:
+        """
+        :param func: Sends the request
+        :return: The response returned by func
+        :raise: CircuitOpenError if the call is not allowed
+        """
+        probe = self._acquire()
+        start = time.monotonic()
+        try:
+            response = func()
+        except DeadlineExceededError:
+            # The request ran out of time, which says nothing about the service
+            if probe:
+                with self._lock:
+                    self._probing = False
+            raise
+        except BaseException:
+            self._record(probe=probe, failed=True, slow=False)
+            raise
+        failed = getattr(response, 'status_code', HTTPStatus.OK) >= HTTPStatus.INTERNAL_SERVER_ERROR
+        self._record(probe=probe, failed=failed, slow=time.monotonic() - start > self.slow_call_sec)
+        return response
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'state': self.state,
+            'calls': self.calls,
+            'failures': self.failures,
+            'slow_calls': self.slow_calls,
+            'rejected': self.rejected,
+            'opened': self.opened,
+        }
+
+    def _acquire(self) -> bool:
+        """
+        :return: Whether the call is the probe of a half open circuit
+        """
+        with self._lock:
+            if self.state == CIRCUIT_CLOSED:
+                return False
+            if self.state == CIRCUIT_OPEN and time.monotonic() - self._opened_at >= self.open_sec:
+                self.state = CIRCUIT_HALF_OPEN
+            if self.state == CIRCUIT_HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            self.rejected += 1
+        raise CircuitOpenError('The circuit breaker of the upstream service is open')
+
+    def _record(self, *, probe: bool, failed: bool, slow: bool) -> None:
+        with self._lock:
+            self.calls += 1
+            self.failures += failed
+            self.slow_calls += slow
+            if probe:
+                self._probing = False
+                if failed or slow:
+                    self._open()
+                else:
+                    self.state = CIRCUIT_CLOSED
+                    self._outcomes.clear()
+                return
+
+            self._outcomes.append(failed or slow)
+            if self.state == CIRCUIT_CLOSED and len(self._outcomes) >= self.min_calls \
+                    and sum(self._outcomes) >= self.failure_rate * len(self._outcomes):
+                self._open()
+
+    def _open(self) -> None:
+        self.state = CIRCUIT_OPEN
+        self._opened_at = time.monotonic()
+        self.opened += 1
+        LOGGER.warning('Circuit breaker opened for {} sec'.format(self.open_sec))
+
+
+_circuit_breakers = {}  # type: Dict[str, CircuitBreaker]
+_circuit_breakers_lock = Lock()
+
+
+def get_circuit_breaker(service: str) -> CircuitBreaker:
+    """
+    Provides the process-wide CircuitBreaker of the given upstream service, created from the CIRCUIT_BREAKER_*
+    configs on first use
+    :param service: METADATA_SERVICE | SEARCH_SERVICE
+    :return: CircuitBreaker
+    """
+    with _circuit_breakers_lock:
+        if service not in _circuit_breakers:
+            _circuit_breakers[service] = CircuitBreaker(window_size=app.config['CIRCUIT_BREAKER_WINDOW_SIZE'],
+                                                        min_calls=app.config['CIRCUIT_BREAKER_MIN_CALLS'],
+                                                        failure_rate=app.config['CIRCUIT_BREAKER_FAILURE_RATE'],
+                                                        slow_call_sec=app.config['CIRCUIT_BREAKER_SLOW_CALL_SEC'],
+                                                        open_sec=app.config['CIRCUIT_BREAKER_OPEN_SEC'])
+        return _circuit_breakers[service]
+
+
+def get_circuit_breaker_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    :return: CircuitBreaker.get_stats() of every upstream service, including its current 'state'
+    """
+    return {service: breaker.get_stats() for service, breaker in list(_circuit_breakers.items())}
@@ -1,11 +1,20 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
+import hashlib
 import logging
 
-from typing import Dict  # noqa: F401
+from http import HTTPStatus
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence  # noqa: F401
 
-from flask import Response, jsonify, make_response
+from flask import Response, jsonify, make_response, request, stream_with_context
+from flask import current_app as app
+
+from amundsen_application.api.exceptions import CircuitOpenError, DeadlineExceededError
+from amundsen_application.api.utils.compression_utils import get_available_encodings
+from amundsen_application.api.utils.json_utils import dumpb
+
+STREAMED_JSON_CHUNK_SIZE = 64 * 1024
 
 
 def create_error_response(*, message: str, payload: Dict, status_code: int) -> Response:
@@ -17,3 +26,121 @@ def create_error_response(*, message: str, payload: Dict, status_code: int) -> R
     logging.info(message)
     payload['msg'] = message
     return make_response(jsonify(payload), status_code)
+
+
+def get_error_status_code(e: Exception) -> int:
+    """
+    :return: The status code of the response to a request that failed with e: the code of CircuitOpenError and
+    DeadlineExceededError, raised instead of calling an upstream service or waiting for it, or 500 for any other
+    exception
+    """
+    if isinstance(e, (CircuitOpenError, DeadlineExceededError)):
+        return e.code
+    return HTTPStatus.INTERNAL_SERVER_ERROR
+
+
+def compute_etag(payload: Any) -> str:
+    """
+    :return: A strong ETag of the JSON payload, the same for equal payloads whatever the order of their keys
+    """
+    return hashlib.blake2b(dumpb(payload, sort_keys=True), digest_size=16).hexdigest()
+
+
+def is_not_modified(etag: str) -> bool:
+    """
+    :return: Whether METADATA_ETAG_ENABLED is on and the If-None-Match header of the current request matches etag,
+    including as suffixed by compression_utils for a compressed response
+    """
+    if not app.config['METADATA_ETAG_ENABLED'] or not request.if_none_match:
+        return False
+    return any(request.if_none_match.contains_weak(tag)
+               for tag in [etag] + ['{}-{}'.format(etag, encoding) for encoding in get_available_encodings()])
+
+
+def create_not_modified_response(etag: str) -> Response:
+    response = make_response('', HTTPStatus.NOT_MODIFIED)
+    set_etag(response, etag)
+    if app.config['COMPRESSION_ENABLED']:
+        response.vary.add('Accept-Encoding')
+    return response
+
+
+def set_etag(response: Response, etag: str) -> None:
+    """
+    Sets the ETag of a response, and asks browsers to revalidate it (If-None-Match) before each use
+    """
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+
+
+def create_etag_response(*, payload: Dict, status_code: int, etag: Optional[str] = None) -> Response:
+    """
+    Returns jsonify(payload), with an ETag when METADATA_ETAG_ENABLED is on and the status code is 200. A request
+    whose If-None-Match matches gets an empty 304 response instead.
+    :param etag: ETag of the payload when known, e.g. stored with a cache entry, computed from the payload otherwise
+    """
+    if not app.config['METADATA_ETAG_ENABLED'] or status_code != HTTPStatus.OK:
+        return make_response(jsonify(payload), status_code)
+
+    etag = etag or compute_etag(payload)
+    if is_not_modified(etag):
+        return create_not_modified_response(etag)
+    response = make_response(jsonify(payload), status_code)
+    set_etag(response, etag)
+    return response
+
+
+def create_streamed_json_response(*, payload: Dict, stream_path: Sequence[str], status_code: int) -> Response:
+    """
+    Returns a JSON response whose body is serialized incrementally while it is sent, instead of as one string.
+    The list found at stream_path, e.g. ('tableData', 'columns'), is serialized one item at a time and written in
+    chunks of STREAMED_JSON_CHUNK_SIZE characters, so the size of the serialized body held in memory does not grow
+    with the length of that list.
+    """
+    return Response(stream_with_context(_iter_json_chunks(payload, stream_path)),
+                    status=status_code,
+                    mimetype='application/json')
+
+
+def _iter_json_chunks(payload: Any, stream_path: Sequence[str]) -> Iterator[str]:
+    # Same encoder, key order and escaping as jsonify, in its compact form, built once for the whole body
+    encode = app.json_encoder(separators=(',', ':'),
+                              sort_keys=app.config['JSON_SORT_KEYS'],
+                              ensure_ascii=app.config['JSON_AS_ASCII']).encode
+    buffer = []  # type: List[str]
+    buffered = 0
+    for part in _iter_json_parts(payload, stream_path, encode):
+        buffer.append(part)
+        buffered += len(part)
+        if buffered >= STREAMED_JSON_CHUNK_SIZE:
+            yield ''.join(buffer)
+            buffer = []
+            buffered = 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+def _iter_json_parts(value: Any, stream_path: Sequence[str], encode: Callable[[Any], str]) -> Iterator[str]:
+    if not stream_path:
+        if isinstance(value, list):
+            yield '['
+            for i, item in enumerate(value):
+                yield (',' if i else '') + encode(item)
+            yield ']'
+        else:
+            yield encode(value)
+        return
+
+    if not isinstance(value, dict) or stream_path[0] not in value:
+        yield encode(value)
+        return
+
+    keys = sorted(value) if app.config['JSON_SORT_KEYS'] else list(value)
+    yield '{'
+    for i, key in enumerate(keys):
+        yield (',' if i else '') + encode(key) + ':'
+        if key == stream_path[0]:
+            yield from _iter_json_parts(value[key], stream_path[1:], encode)
+        else:
+            yield encode(value[key])
+    yield '}'
@@ -1,6 +1,8 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
+import json
+
 from typing import Dict, List  # noqa: F401
 
 
@@ -87,3 +89,24 @@ def has_filters(*, filters: Dict = {}, resource: str = '') -> bool:
         if len(filter_list) > 0:
             return True
     return False
+
+
+def normalize_search_term(search_term: str) -> str:
+    """
+    Returns the search term sent to the search service and used in the search results cache key, so that equivalent
+    searches share a cache entry and get the same results
+    """
+    return search_term.strip()
+
+
+def search_cache_key(*, resource: str, search_term: str, page_index: int, filters: Dict = {},
+                     credentials: str = '') -> str:
+    """
+    Builds the search results cache key of a page of results. Filters are normalized, so that the same
+    filters selected in a different order share a cache entry. The search term is expected to be normalized with
+    normalize_search_term already.
+    :param credentials: The fingerprint of the headers sent to the search service, so that users with different
+    credentials do not share cached results
+    """
+    normalized_filters = {category: sorted(values) for category, values in filters.items() if values}
+    return json.dumps([resource, search_term, int(page_index), normalized_filters, credentials], sort_keys=True)
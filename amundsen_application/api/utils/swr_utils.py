@@ -0,0 +1,97 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Stale-while-revalidate serving of the metadata reads, used when METADATA_SWR_ENABLED is on: a read is fetched from the
+metadata service once, then served from the metadata reads cache. Past METADATA_SWR_SOFT_TTL_SEC, the cached result
+is still served right away while it is fetched again in the background. It is only dropped after
+METADATA_SWR_HARD_TTL_SEC, so that a slow or failing metadata service (see the circuit breaker of request_utils)
+delays the updates rather than the pages.
+"""
+
+import logging
+import time
+from collections import Counter
+from http import HTTPStatus
+from threading import Lock
+from typing import Any, Callable, Dict, Set  # noqa: F401
+
+from flask import current_app as app
+
+from amundsen_application.api.utils.cache_utils import CacheNamespace, get_metadata_reads_cache
+from amundsen_application.api.utils.request_utils import submit_in_background
+
+LOGGER = logging.getLogger(__name__)
+
+_pending_keys = set()  # type: Set[str]
+_pending_keys_lock = Lock()
+
+_stats = Counter()  # type: Counter
+_stats_lock = Lock()
+
+
+def _count(**increments: int) -> None:
+    with _stats_lock:
+        _stats.update(increments)
+
+
+def get_swr_stats() -> Dict[str, int]:
+    """
+    :return: Counters of the current process: reads served 'fresh' or 'stale' from the cache, 'misses' fetched
+    during the request, and background 'refreshes' and 'refresh_failures'
+    """
+    with _stats_lock:
+        return dict(_stats)
+
+
+def get_metadata(key: str, fetch: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Serves a metadata read stale-while-revalidate when METADATA_SWR_ENABLED is on, else calls fetch
+    :param key: Identifies the read in the metadata reads cache
+    :param fetch: Fetches the read from the metadata service and returns it as a results dict, with its
+    'status_code'. Only results with a 200 status code are cached.
+    :return: A copy of the results dict
+    """
+    cache = get_metadata_reads_cache()
+    if cache is None:
+        return fetch()
+
+    entry = cache.get(key)
+    if not isinstance(entry, dict):
+        _count(misses=1)
+        results = fetch()
+        _store(cache, key, results)
+        return dict(results)
+
+    if time.time() - entry['fetched_at'] < app.config['METADATA_SWR_SOFT_TTL_SEC']:
+        _count(fresh=1)
+    else:
+        _count(stale=1)
+        _schedule_refresh(cache, key, fetch)
+    return dict(entry['results'])
+
+
+def _store(cache: CacheNamespace, key: str, results: Dict[str, Any]) -> None:
+    if results.get('status_code') == HTTPStatus.OK:
+        cache.set(key, {'results': results, 'fetched_at': time.time()})
+
+
+def _schedule_refresh(cache: CacheNamespace, key: str, fetch: Callable[[], Dict[str, Any]]) -> None:
+    with _pending_keys_lock:
+        if key in _pending_keys:
+            return
+        _pending_keys.add(key)
+    submit_in_background(_refresh, cache, key, fetch)
+
+
+def _refresh(cache: CacheNamespace, key: str, fetch: Callable[[], Dict[str, Any]]) -> None:
+    try:
+        results = fetch()
+        _store(cache, key, results)
+        _count(refreshes=1)
+    except Exception:
+        _count(refresh_failures=1)
+        LOGGER.exception('Failed to refresh {}'.format(key))
+    finally:
+        with _pending_keys_lock:
+            _pending_keys.discard(key)
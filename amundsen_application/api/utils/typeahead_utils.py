@@ -0,0 +1,173 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import heapq
+import logging
+import os
+from bisect import bisect_left
+from threading import Event, Lock, Thread
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple  # noqa: F401
+
+from flask import Flask
+from flask import current_app as app
+
+from amundsen_application.api.utils.request_utils import submit_in_background
+
+LOGGER = logging.getLogger(__name__)
+
+TypeaheadEntries = Iterable[Tuple[str, Dict]]
+
+
+class PrefixIndex:
+    """
+    An immutable prefix index: for each entry type, a sorted array of lowercased terms searched with bisect.
+    An entry can be indexed under several terms (e.g. a table under 'table' and 'schema.table'), it is returned once.
+    """
+    def __init__(self, entries: TypeaheadEntries) -> None:
+        """
+        :param entries: (term, entry) pairs, each entry being a dict with at least a 'type'
+        """
+        by_type = {}  # type: Dict[str, List[Tuple[str, int, Dict]]]
+        for position, (term, entry) in enumerate(entries):
+            if term:
+                by_type.setdefault(entry['type'], []).append((term.lower(), position, entry))
+
+        self._terms = {}  # type: Dict[str, List[str]]
+        self._entries = {}  # type: Dict[str, List[Dict]]
+        for entry_type, indexed in by_type.items():
+            indexed.sort(key=lambda item: (item[0], item[1]))
+            self._terms[entry_type] = [term for term, _, _ in indexed]
+            self._entries[entry_type] = [entry for _, _, entry in indexed]
+
+    def __len__(self) -> int:
+        return sum(len(terms) for terms in self._terms.values())
+
+    def search(self, prefix: str, *, limit: int, types: Optional[Iterable[str]] = None) -> List[Dict]:
+        """
+        :param prefix: Matched case insensitively against the start of the indexed terms
+        :param limit: Maximum number of entries returned
+        :param types: Entry types to search, all of them by default
+        :return: The entries having a term starting with prefix, ordered by term
+        """
+        prefix = prefix.lower()
+        matches = [self._search_type(entry_type, prefix, limit)
+                   for entry_type in (self._terms if types is None else types)
+                   if entry_type in self._terms]
+
+        results = []  # type: List[Dict]
+        seen = set()  # type: Set[int]
+        for _, _, entry in heapq.merge(*matches, key=lambda match: (match[0], match[1])):
+            if id(entry) not in seen:
+                seen.add(id(entry))
+                results.append(entry)
+                if len(results) == limit:
+                    break
+        return results
+
+    def _search_type(self, entry_type: str, prefix: str, limit: int) -> List[Tuple[str, str, Dict]]:
+        terms = self._terms[entry_type]
+        entries = self._entries[entry_type]
+        matches = []  # type: List[Tuple[str, str, Dict]]
+        seen = set()  # type: Set[int]
+        i = bisect_left(terms, prefix)
+        while i < len(terms) and terms[i].startswith(prefix) and len(seen) < limit:
+            if id(entries[i]) not in seen:
+                seen.add(id(entries[i]))
+                matches.append((terms[i], entry_type, entries[i]))
+            i += 1
+        return matches
+
+
+class TypeaheadIndex:
+    """
+    Serves typeahead suggestions from a PrefixIndex held in memory, rebuilt by a background thread every
+    TYPEAHEAD_REFRESH_INTERVAL_SEC. Lookups never wait for the metadata or search service: until the first load of
+    the process completes, they return no suggestions.
+    The background thread calls the services outside of any request, with the headers of
+    BACKGROUND_REQUEST_HEADERS_METHOD. When its refresh fails, the next lookup starts one in the background within
+    its request instead, with the headers of the user.
+    """
+    def __init__(self, *, load: Callable[[], TypeaheadEntries]) -> None:
+        """
+        :param load: Returns the (term, entry) pairs to index, fetched from the metadata and search services
+        """
+        self._load = load
+        self._index = PrefixIndex([])
+        self._lock = Lock()
+        self._stop = Event()
+        self._pid = None  # type: Optional[int]
+        self._background_refresh_failed = False
+        self._request_refresh_pending = False
+        self.refreshes = 0
+        self.refresh_failures = 0
+
+    def search(self, prefix: str, *, limit: int, types: Optional[Iterable[str]] = None) -> List[Dict]:
+        self._ensure_started()
+        if self._background_refresh_failed:
+            self._schedule_request_refresh()
+        return self._index.search(prefix, limit=limit, types=types)
+
+    def refresh(self) -> None:
+        try:
+            self._index = PrefixIndex(self._load())
+            self.refreshes += 1
+        except Exception:
+            self.refresh_failures += 1
+            raise
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'size': len(self._index),
+            'refreshes': self.refreshes,
+            'refresh_failures': self.refresh_failures,
+        }
+
+    def _schedule_request_refresh(self) -> None:
+        with self._lock:
+            if self._request_refresh_pending:
+                return
+            self._request_refresh_pending = True
+        submit_in_background(self._refresh_in_request)
+
+    def _refresh_in_request(self) -> None:
+        try:
+            self.refresh()
+            self._background_refresh_failed = False
+        except Exception:
+            LOGGER.exception('Failed to refresh the typeahead index within a request')
+        finally:
+            with self._lock:
+                self._request_refresh_pending = False
+
+    def _ensure_started(self) -> None:
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+
+        with self._lock:
+            if self._pid == pid:
+                return
+            # First use in this process, the thread inherited from a parent process is gone
+            self._background_refresh_failed = False
+            self._request_refresh_pending = False
+            self._stop = Event()
+            Thread(target=self._run,
+                   args=(app._get_current_object(), self._stop, app.config['TYPEAHEAD_REFRESH_INTERVAL_SEC']),
+                   name='typeahead-refresher', daemon=True).start()
+            self._pid = pid
+
+    def _run(self, flask_app: Flask, stop: Event, interval_sec: float) -> None:
+        while not stop.is_set():
+            with flask_app.app_context():
+                try:
+                    self.refresh()
+                    self._background_refresh_failed = False
+                except Exception:
+                    # e.g. no BACKGROUND_REQUEST_HEADERS_METHOD while REQUEST_HEADERS_METHOD needs a user session
+                    LOGGER.exception('Failed to refresh the typeahead index in the background, '
+                                     'it is refreshed within the next typeahead request instead')
+                    self._background_refresh_failed = True
+            stop.wait(interval_sec)
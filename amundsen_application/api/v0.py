@@ -10,7 +10,9 @@ from flask import current_app as app
 from flask.blueprints import Blueprint
 
 from amundsen_application.api.metadata.v0 import USER_ENDPOINT
+from amundsen_application.api.utils.auth_utils import get_current_user
 from amundsen_application.api.utils.request_utils import request_metadata
+from amundsen_application.api.utils.response_utils import get_error_status_code
 from amundsen_application.models.user import load_user, dump_user
 
 
@@ -23,7 +25,7 @@ blueprint = Blueprint('main', __name__, url_prefix='/api')
 def current_user() -> Response:
     try:
         if app.config['AUTH_USER_METHOD']:
-            user = app.config['AUTH_USER_METHOD'](app)
+            user = get_current_user()
         else:
             raise Exception('AUTH_USER_METHOD is not configured')
 
@@ -46,4 +48,4 @@ def current_user() -> Response:
         message = 'Encountered exception: ' + str(e)
         logging.exception(message)
         payload = jsonify({'msg': message})
-        return make_response(payload, HTTPStatus.INTERNAL_SERVER_ERROR)
+        return make_response(payload, get_error_status_code(e))
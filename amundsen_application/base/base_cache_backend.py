@@ -0,0 +1,51 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import abc
+from typing import Any, Dict, Optional
+
+
+class BaseCacheBackend(abc.ABC):
+    """
+    Storage used by the metadata and search blueprints to cache upstream responses. Values are JSON serializable
+    objects, so implementations backed by a shared store can serve every worker process of a node.
+    """
+    @abc.abstractmethod
+    def __init__(self) -> None:
+        pass  # pragma: no cover
+
+    @abc.abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Returns the value stored under the key, or None if it is missing or expired
+        :param key: Cache key
+        :return:
+        """
+        raise NotImplementedError  # pragma: no cover
+
+    @abc.abstractmethod
+    def set(self, key: str, value: Any, ttl_sec: float) -> None:
+        """
+        Stores a value under the key
+        :param key: Cache key
+        :param value: A JSON serializable object
+        :param ttl_sec: Number of seconds after which the entry expires
+        :return:
+        """
+        raise NotImplementedError  # pragma: no cover
+
+    @abc.abstractmethod
+    def delete(self, key: str) -> None:
+        """
+        Removes the key from the cache, if present
+        :param key: Cache key
+        :return:
+        """
+        raise NotImplementedError  # pragma: no cover
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Returns counters describing the cache usage of the current process, e.g. hits and misses
+        :return:
+        """
+        return {}
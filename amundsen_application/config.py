@@ -2,7 +2,8 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import os
-from typing import Callable, Dict, List, Optional, Set  # noqa: F401
+import tempfile
+from typing import Callable, Dict, Iterable, List, Optional, Set  # noqa: F401
 from amundsen_application.models.user import User
 
 from flask import Flask  # noqa: F401
@@ -19,6 +20,27 @@ class MatchRuleObject:
         self.table_name_regex = table_name_regex
 
 
+class ActionLogCommandConfig:
+    def __init__(self,
+                 sample_rate=1.0,  # type: float
+                 capture_output=True,  # type: bool
+                 max_output_size=None,  # type: Optional[int]
+                 redacted_fields=(),  # type: Iterable[str]
+                 ) -> None:
+        """
+        :param sample_rate: Share of the calls that are action logged, between 0 and 1
+        :param capture_output: Whether the output is serialized and logged
+        :param max_output_size: Serialized outputs longer than this many characters are replaced by
+        {"truncated": true, "size": <length>}
+        :param redacted_fields: Keys whose values are replaced by '<redacted>' in the arguments and output, at any
+        depth. Arguments passed positionally are redacted by the name of their parameter.
+        """
+        self.sample_rate = sample_rate
+        self.capture_output = capture_output
+        self.max_output_size = max_output_size
+        self.redacted_fields = frozenset(redacted_fields)
+
+
 class Config:
     LOG_FORMAT = '%(asctime)s.%(msecs)03d [%(levelname)s] %(module)s.%(funcName)s:%(lineno)d (%(process)d:' \
                  + '%(threadName)s) - %(message)s'
@@ -44,6 +66,162 @@ class Config:
     # Request Timeout Configurations in Seconds
     REQUEST_SESSION_TIMEOUT_SEC = 3
 
+    # Connection pool settings for calls to the search and metadata services. Each service gets one keep-alive
+    # session per process, holding at most *_POOL_SIZE open connections.
+    SEARCHSERVICE_REQUEST_POOL_SIZE = 10  # type: int
+    SEARCHSERVICE_REQUEST_KEEP_ALIVE = True  # type: bool
+    METADATASERVICE_REQUEST_POOL_SIZE = 10  # type: int
+    METADATASERVICE_REQUEST_KEEP_ALIVE = True  # type: bool
+
+    # Cache used for metadata and search service responses. Maps to a class path and name of a subclass of
+    # BaseCacheBackend, defaults to the in-process MemoryCacheBackend. Please see docs/flask_config.md
+    CACHE_BACKEND = None  # type: Optional[str]
+    # Max number of entries held by MemoryCacheBackend
+    CACHE_MEMORY_MAX_SIZE = 1000  # type: int
+    # Database file of SqliteCacheBackend, shared by every worker on the node
+    CACHE_SQLITE_PATH = os.getenv('CACHE_SQLITE_PATH', '/tmp/amundsen_frontend_cache.db')  # type: str
+    # Connection settings of RedisCacheBackend
+    CACHE_REDIS_HOST = os.getenv('CACHE_REDIS_HOST', 'localhost')  # type: str
+    CACHE_REDIS_PORT = int(os.getenv('CACHE_REDIS_PORT', '6379'))  # type: int
+    CACHE_REDIS_DB = 0  # type: int
+    CACHE_REDIS_PASSWORD = os.getenv('CACHE_REDIS_PASSWORD')  # type: Optional[str]
+    CACHE_REDIS_KEY_PREFIX = 'amundsen_frontend:'  # type: str
+    CACHE_REDIS_TIMEOUT_SEC = 0.5  # type: float
+
+    # Cache table details served by /api/metadata/v0/table. Entries are dropped after
+    # TABLE_METADATA_CACHE_TTL_SEC, or as soon as the table is edited through the frontend.
+    TABLE_METADATA_CACHE_ENABLED = False  # type: bool
+    TABLE_METADATA_CACHE_TTL_SEC = 300  # type: int
+
+    # Stream the /api/metadata/v0/table response of tables having at least this many columns, serializing it column
+    # by column instead of as one string. None to never stream.
+    TABLE_METADATA_STREAMING_MIN_COLUMNS = None  # type: Optional[int]
+
+    # Default and maximum number of columns served by a /api/metadata/v0/table/columns request. The column_limit of
+    # /api/metadata/v0/table is ignored unless TABLE_METADATA_CACHE_ENABLED or METADATA_SWR_ENABLED is on, as the
+    # pages would otherwise each fetch the whole table from the metadata service.
+    TABLE_METADATA_COLUMN_PAGE_SIZE = 100  # type: int
+    TABLE_METADATA_COLUMN_PAGE_MAX_SIZE = 1000  # type: int
+
+    # Add strong ETags to the table, table columns, dashboard, bookmark and popular tables responses of the metadata
+    # API, and answer requests whose If-None-Match matches with an empty 304. ETags are stored with the entries of
+    # the table and popular tables caches, so that a 304 for a cached entry is served without serializing it.
+    METADATA_ETAG_ENABLED = False  # type: bool
+
+    # Serve the table details, dashboard details, related dashboards, tags, last indexed time and lineage reads of the
+    # metadata API stale-while-revalidate: cached reads older than METADATA_SWR_SOFT_TTL_SEC are served while they are
+    # fetched again in the background, and dropped after METADATA_SWR_HARD_TTL_SEC. Takes precedence over
+    # TABLE_METADATA_CACHE_ENABLED.
+    METADATA_SWR_ENABLED = False  # type: bool
+    METADATA_SWR_SOFT_TTL_SEC = 60  # type: int
+    METADATA_SWR_HARD_TTL_SEC = 3600  # type: int
+
+    # Cache the popular tables served by /api/metadata/v0/popular_tables
+    POPULAR_TABLES_CACHE_ENABLED = False  # type: bool
+    POPULAR_TABLES_CACHE_TTL_SEC = 300  # type: int
+
+    # Cache pages of table, dashboard and user search results
+    SEARCH_RESULTS_CACHE_ENABLED = False  # type: bool
+    SEARCH_RESULTS_CACHE_TTL_SEC = 60  # type: int
+    # When a page of cached search results is served, fetch the next page in the background
+    SEARCH_RESULTS_PREFETCH_ENABLED = False  # type: bool
+
+    # Per resource timeout of the searches run concurrently by /api/search/v0/all, also passed to their calls to the
+    # search service. Resources missing here use REQUEST_SESSION_TIMEOUT_SEC
+    SEARCH_RESOURCE_TIMEOUT_SEC = {
+        'table': 3,
+        'dashboard': 3,
+        'user': 3,
+    }  # type: Dict[str, float]
+
+    # Serve /api/search/v0/typeahead from an in-memory prefix index of table, schema, tag and dashboard names,
+    # rebuilt every TYPEAHEAD_REFRESH_INTERVAL_SEC from the tags, the popular tables and up to
+    # TYPEAHEAD_SEARCH_MAX_PAGES pages of table and dashboard search results for TYPEAHEAD_SEARCH_TERM
+    TYPEAHEAD_ENABLED = False  # type: bool
+    TYPEAHEAD_REFRESH_INTERVAL_SEC = 600  # type: int
+    TYPEAHEAD_MAX_RESULTS = 10  # type: int
+    TYPEAHEAD_SEARCH_TERM = '*'  # type: str
+    TYPEAHEAD_SEARCH_MAX_PAGES = 100  # type: int
+
+    # Serve the popular tables from memory, refreshing them in the background every
+    # POPULAR_TABLES_REFRESH_INTERVAL_SEC. Takes precedence over POPULAR_TABLES_CACHE_ENABLED.
+    POPULAR_TABLES_REFRESH_ENABLED = False  # type: bool
+    POPULAR_TABLES_REFRESH_INTERVAL_SEC = 300  # type: int
+    # Bounds the personalized popular tables kept in memory when POPULAR_TABLE_PERSONALIZATION is on
+    POPULAR_TABLES_USER_CACHE_MAX_SIZE = 1000  # type: int
+    POPULAR_TABLES_USER_CACHE_TTL_SEC = 3600  # type: int
+
+    # Number of threads used for the concurrent (fan-out) calls to the search and metadata services
+    REQUEST_ASYNC_MAX_WORKERS = 16  # type: int
+
+    # Whether identical concurrent GET requests to the search or metadata service share a single upstream call
+    REQUEST_COALESCING_ENABLED = False  # type: bool
+
+    # Time budget of each API request for its calls to the search and metadata services. Each call gets the time left
+    # as timeout (or REQUEST_SESSION_TIMEOUT_SEC if shorter), calls made once the budget is spent fail with a 504
+    # without being sent, and the deadline is sent to the services in epoch milliseconds as REQUEST_DEADLINE_HEADER.
+    # REQUEST_DEADLINE_ENDPOINT_SEC overrides REQUEST_DEADLINE_SEC by endpoint, e.g. {'metadata.get_table_page': 5}.
+    REQUEST_DEADLINE_ENABLED = False  # type: bool
+    REQUEST_DEADLINE_SEC = 10  # type: float
+    REQUEST_DEADLINE_ENDPOINT_SEC = {}  # type: Dict[str, float]
+    REQUEST_DEADLINE_HEADER = 'X-Request-Deadline'  # type: str
+
+    # Per service circuit breaker of the calls to the search and metadata services: once at least
+    # CIRCUIT_BREAKER_MIN_CALLS of the last CIRCUIT_BREAKER_WINDOW_SIZE calls are known, and a share of
+    # CIRCUIT_BREAKER_FAILURE_RATE of them failed (error or 5xx) or took more than CIRCUIT_BREAKER_SLOW_CALL_SEC, calls
+    # fail with a 503 for CIRCUIT_BREAKER_OPEN_SEC. A single probe call then decides whether the service is called
+    # again.
+    CIRCUIT_BREAKER_ENABLED = False  # type: bool
+    CIRCUIT_BREAKER_WINDOW_SIZE = 20  # type: int
+    CIRCUIT_BREAKER_MIN_CALLS = 10  # type: int
+    CIRCUIT_BREAKER_FAILURE_RATE = 0.5  # type: float
+    CIRCUIT_BREAKER_SLOW_CALL_SEC = 2.0  # type: float
+    CIRCUIT_BREAKER_OPEN_SEC = 30  # type: float
+
+    # Compress the API responses of at least COMPRESSION_MIN_SIZE bytes with brotli (when the brotli package is
+    # installed) or gzip, as accepted by the client
+    COMPRESSION_ENABLED = False  # type: bool
+    COMPRESSION_MIN_SIZE = 1024  # type: int
+    COMPRESSION_MIMETYPES = {
+        'application/javascript',
+        'application/json',
+        'image/svg+xml',
+        'text/css',
+        'text/html',
+        'text/javascript',
+        'text/plain',
+    }  # type: Set[str]
+    COMPRESSION_GZIP_LEVEL = 6  # type: int
+    COMPRESSION_BROTLI_QUALITY = 4  # type: int
+    # Serve the static files (e.g. the JS bundle) compressed as well. Each file is compressed once, with the maximum
+    # level, on first serve into STATIC_COMPRESSION_CACHE_DIR, unless the build wrote a .br or .gz copy next to it.
+    STATIC_COMPRESSION_ENABLED = False  # type: bool
+    STATIC_COMPRESSION_CACHE_DIR = os.getenv(
+        'STATIC_COMPRESSION_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'amundsen_frontend_static'))  # type: str
+
+    # Deliver the action logs from a background thread instead of during the request: action_logging only adds a
+    # record to a queue of at most ACTION_LOG_QUEUE_MAX_SIZE records, and the thread serializes and delivers them to
+    # the callbacks in batches of up to ACTION_LOG_BATCH_SIZE, at least every ACTION_LOG_FLUSH_INTERVAL_SEC.
+    # When the queue is full, the new record ('drop_newest') or the oldest queued one ('drop_oldest') is dropped.
+    ACTION_LOG_ASYNC_ENABLED = False  # type: bool
+    ACTION_LOG_QUEUE_MAX_SIZE = 10000  # type: int
+    ACTION_LOG_BATCH_SIZE = 100  # type: int
+    ACTION_LOG_FLUSH_INTERVAL_SEC = 1.0  # type: float
+    ACTION_LOG_BACKPRESSURE_POLICY = 'drop_newest'  # type: str
+
+    # Action logging settings of specific commands (the names of the action logged functions, or the 'command' of
+    # frontend events), e.g. {'_search_table': ActionLogCommandConfig(sample_rate=0.1, capture_output=False)}.
+    # The '*' entry applies to the commands without one. Commands without settings are always logged in full.
+    ACTION_LOG_COMMAND_CONFIG = {}  # type: Dict[str, ActionLogCommandConfig]
+
+    # Maximum number of events accepted by a /api/log/v0/log_events request
+    LOG_EVENTS_MAX_BATCH_SIZE = 100  # type: int
+
+    # JSON library encoding the API responses, the action log arguments and the request bodies sent to the search
+    # and metadata services: 'json' (standard library), 'orjson', 'ujson', or 'auto' for the fastest one installed.
+    # orjson and ujson encode compactly and do not escape non-ASCII characters, so they are opt-in.
+    JSON_BACKEND = 'json'  # type: str
+
     # Frontend Application
     FRONTEND_BASE = ''
 
@@ -99,6 +277,18 @@ class Config:
     # 1. METADATASERVICE_REQUEST_HEADERS
     # 2. SEARCHSERVICE_REQUEST_HEADERS
     REQUEST_HEADERS_METHOD: Optional[Callable[[Flask], Optional[Dict]]] = None
+    # If specified, used instead of REQUEST_HEADERS_METHOD for the calls made outside of a request by the background
+    # refreshes (POPULAR_TABLES_REFRESH_ENABLED, TYPEAHEAD_ENABLED), e.g. to send service credentials when
+    # REQUEST_HEADERS_METHOD relies on the session of the user, as get_access_headers of the OIDC config does
+    BACKGROUND_REQUEST_HEADERS_METHOD: Optional[Callable[[Flask], Optional[Dict]]] = None
+
+    # Whether the headers of REQUEST_HEADERS_METHOD are cached by user rather than computed for every call. Headers
+    # with a JWT bearer token are cached until the token expires, the other ones for REQUEST_HEADERS_CACHE_TTL_SEC.
+    # They are computed again in the background from REQUEST_HEADERS_REFRESH_AHEAD_SEC before expiry.
+    REQUEST_HEADERS_CACHE_ENABLED = False  # type: bool
+    REQUEST_HEADERS_CACHE_TTL_SEC = 300  # type: int
+    REQUEST_HEADERS_REFRESH_AHEAD_SEC = 60  # type: int
+    REQUEST_HEADERS_CACHE_MAX_SIZE = 1000  # type: int
 
     AUTH_USER_METHOD: Optional[Callable[[Flask], User]] = None
     GET_PROFILE_URL = None
@@ -170,6 +360,8 @@ class TestConfig(LocalConfig):
     ISSUE_TRACKER_PROJECT_ID = 1
     ISSUE_TRACKER_CLIENT_ENABLED = True
     ISSUE_TRACKER_MAX_RESULTS = 3
+    # Tests compare encoded JSON, whichever JSON libraries are installed
+    JSON_BACKEND = 'json'
 
 
 class TestNotificationsDisabledConfig(LocalConfig):
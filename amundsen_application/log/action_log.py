@@ -4,15 +4,19 @@
 import functools
 import getpass
 
-import json
 import logging
 import socket
 from datetime import datetime, timezone, timedelta
 
-from typing import Any, Dict, Callable
+from typing import Any, Dict, Callable, List, Optional
 from flask import current_app as flask_app
+from amundsen_application.api.utils.auth_utils import get_current_user
+from amundsen_application.config import ActionLogCommandConfig
 from amundsen_application.log import action_log_callback
+from amundsen_application.log.action_log_filters import PositionalParameters, get_command_config, \
+    get_positional_parameters, is_sampled, serialize_args, serialize_kwargs, serialize_output
 from amundsen_application.log.action_log_model import ActionLogParams
+from amundsen_application.log.action_log_queue import ActionLogRecord, action_log_queue
 
 LOGGER = logging.getLogger(__name__)
 EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)  # use POSIX epoch
@@ -22,11 +26,14 @@ def action_logging(f: Callable) -> Any:
     """
     Decorates function to execute function at the same time triggering action logger callbacks.
     It will call action logger callbacks twice, one for pre-execution and the other one for post-execution.
-    Action logger will be called with ActionLogParams
+    Action logger will be called with ActionLogParams. Sampling, output capture and redaction follow the
+    ACTION_LOG_COMMAND_CONFIG settings of the command.
 
     :param f: function instance
     :return: wrapped function
     """
+    parameters = get_positional_parameters(f)
+
     @functools.wraps(f)
     def wrapper(*args: Any,
                 **kwargs: Any) -> Any:
@@ -37,7 +44,14 @@ def action_logging(f: Callable) -> Any:
         :param args: A passthrough positional arguments.
         :param kwargs: A passthrough keyword argument
         """
-        metrics = _build_metrics(f.__name__, *args, **kwargs)
+        command_config = get_command_config(kwargs.get('command', f.__name__))
+        if not is_sampled(command_config):
+            return f(*args, **kwargs)
+
+        if flask_app.config['ACTION_LOG_ASYNC_ENABLED']:
+            return _call_with_queued_action_log(f, parameters, command_config, *args, **kwargs)
+
+        metrics = _build_metrics(f.__name__, parameters, *args, **kwargs)
         action_log_callback.on_pre_execution(ActionLogParams(**metrics))
         output = None
         try:
@@ -48,42 +62,111 @@ def action_logging(f: Callable) -> Any:
             raise
         finally:
             metrics['end_epoch_ms'] = get_epoch_millisec()
-            try:
-                metrics['output'] = json.dumps(output)
-            except Exception:
-                metrics['output'] = output
+            metrics['output'] = serialize_output(output, command_config)
 
             action_log_callback.on_post_execution(ActionLogParams(**metrics))
 
     return wrapper
 
 
+def _call_with_queued_action_log(f: Callable,
+                                 parameters: PositionalParameters,
+                                 command_config: Optional[ActionLogCommandConfig],
+                                 *args: Any,
+                                 **kwargs: Any) -> Any:
+    """
+    Calls f, then queues its action log for the background worker of action_log_queue, which serializes it and calls
+    the action log callbacks. Only what depends on the request (the user) and the output, which the caller may
+    change once it is returned, are serialized here.
+    """
+    start_epoch_ms = get_epoch_millisec()
+    user = _get_user()
+    output = None
+    error = None
+    try:
+        output = f(*args, **kwargs)
+        return output
+    except Exception as e:
+        error = e
+        raise
+    finally:
+        action_log_queue.put(ActionLogRecord(command=kwargs.get('command', f.__name__),
+                                             start_epoch_ms=start_epoch_ms,
+                                             end_epoch_ms=get_epoch_millisec(),
+                                             user=user,
+                                             args=args,
+                                             kwargs=kwargs,
+                                             output=serialize_output(output, command_config),
+                                             error=error,
+                                             parameters=parameters))
+
+
+def log_actions(actions: List[Dict[str, Any]]) -> None:
+    """
+    Logs a batch of actions that already happened, e.g. events posted by the frontend. Each action is logged as
+    the call of an action_logging decorated function with the action as keyword arguments, its 'command' being the
+    command. The pre-execution callbacks are called with each action, then the post-execution batch callbacks with
+    the whole batch, or with the action log queue when ACTION_LOG_ASYNC_ENABLED is on.
+    :param actions: The keyword arguments of each action, including 'command'
+    """
+    actions = [action for action in actions if is_sampled(get_command_config(action['command']))]
+    if not actions:
+        return
+
+    epoch_ms = get_epoch_millisec()
+    user = _get_user()
+    records = [ActionLogRecord(command=action['command'],
+                               start_epoch_ms=epoch_ms,
+                               end_epoch_ms=epoch_ms,
+                               user=user,
+                               args=(),
+                               kwargs=action,
+                               output=serialize_output(None, get_command_config(action['command'])),
+                               error=None) for action in actions]
+
+    if flask_app.config['ACTION_LOG_ASYNC_ENABLED']:
+        for record in records:
+            action_log_queue.put(record)
+        return
+
+    host_name = socket.gethostname()
+    params_list = [record.to_params(host_name) for record in records]
+    for params in params_list:
+        action_log_callback.on_pre_execution(params)
+    action_log_callback.on_post_execution_batch(params_list)
+
+
 def get_epoch_millisec() -> int:
     return (datetime.now(timezone.utc) - EPOCH) // timedelta(milliseconds=1)
 
 
 def _build_metrics(func_name: str,
+                   parameters: PositionalParameters,
                    *args: Any,
                    **kwargs: Any) -> Dict[str, Any]:
     """
     Builds metrics dict from function args
     :param func_name:
+    :param parameters:
     :param args:
     :param kwargs:
     :return: Dict that matches ActionLogParams variable
     """
 
+    command_config = get_command_config(kwargs.get('command', func_name))
     metrics = {
         'command': kwargs.get('command', func_name),
         'start_epoch_ms': get_epoch_millisec(),
         'host_name': socket.gethostname(),
-        'pos_args_json': json.dumps(args),
-        'keyword_args_json': json.dumps(kwargs),
+        'pos_args_json': serialize_args(args, parameters, command_config),
+        'keyword_args_json': serialize_kwargs(kwargs, command_config),
     }  # type: Dict[str, Any]
 
-    if flask_app.config['AUTH_USER_METHOD']:
-        metrics['user'] = flask_app.config['AUTH_USER_METHOD'](flask_app).email
-    else:
-        metrics['user'] = getpass.getuser()
-
+    metrics['user'] = _get_user()
     return metrics
+
+
+def _get_user() -> str:
+    if flask_app.config['AUTH_USER_METHOD']:
+        return get_current_user().email or ''
+    return getpass.getuser()
@@ -18,6 +18,7 @@ LOGGER = logging.getLogger(__name__)
 
 __pre_exec_callbacks = []  # type: List[Callable]
 __post_exec_callbacks = []  # type: List[Callable]
+__post_exec_batch_callbacks = []  # type: List[Callable]
 
 
 def register_pre_exec_callback(action_log_callback: Callable) -> None:
@@ -44,6 +45,19 @@ def register_post_exec_callback(action_log_callback: Callable) -> None:
     __post_exec_callbacks.append(action_log_callback)
 
 
+def register_post_exec_batch_callback(action_log_callback: Callable) -> None:
+    """
+    Registers an action_logger function callback called with lists of ActionLogParams, post-execution: by the
+    background worker delivering the action logs when ACTION_LOG_ASYNC_ENABLED is on, once per batch, and for the
+    batches of frontend events (see action_log.log_actions). This lets a sink write a batch at once. The
+    post-execution callbacks are called for each ActionLogParams of the batch either way.
+    :param action_logger: An action logger callback function
+    :return: None
+    """
+    LOGGER.debug("Adding {} to post execution batch callback".format(action_log_callback))
+    __post_exec_batch_callbacks.append(action_log_callback)
+
+
 def on_pre_execution(action_log_params: ActionLogParams) -> None:
     """
     Calls callbacks before execution.
@@ -75,6 +89,22 @@ def on_post_execution(action_log_params: ActionLogParams) -> None:
             logging.exception('Failed on post-execution callback using {}'.format(call_back_function))
 
 
+def on_post_execution_batch(action_log_params_list: List[ActionLogParams]) -> None:
+    """
+    Calls the batch callbacks with a batch of ActionLogParams, and the other post-execution callbacks with each
+    of them. Note that any exception from callback will be logged but won't be propagated.
+    :return: None
+    """
+    for call_back_function in __post_exec_batch_callbacks:
+        try:
+            call_back_function(action_log_params_list)
+        except Exception:
+            logging.exception('Failed on post-execution batch callback using {}'.format(call_back_function))
+
+    for action_log_params in action_log_params_list:
+        on_post_execution(action_log_params)
+
+
 def logging_action_log(action_log_params: ActionLogParams) -> None:
     """
     An action logger callback that just logs the ActionLogParams that it receives.
@@ -87,9 +117,11 @@ def logging_action_log(action_log_params: ActionLogParams) -> None:
 
 def register_action_logs() -> None:
     """
-    Retrieve declared action log callbacks from entry point where there are two groups that can be registered:
+    Retrieve declared action log callbacks from entry point where there are three groups that can be registered:
      1. "action_log.post_exec.plugin": callback for pre-execution
      2. "action_log.pre_exec.plugin": callback for post-execution
+     3. "action_log.post_exec_batch.plugin": callback for batches of post-execution, see
+        register_post_exec_batch_callback
     :return: None
     """
     for entry_point in iter_entry_points(group='action_log.post_exec.plugin', name=None):
@@ -100,5 +132,9 @@ def register_action_logs() -> None:
         print('Registering pre_exec action_log entry_point: {}'.format(entry_point), file=sys.stderr)
         register_pre_exec_callback(entry_point.load())
 
+    for entry_point in iter_entry_points(group='action_log.post_exec_batch.plugin', name=None):
+        print('Registering post_exec_batch action_log entry_point: {}'.format(entry_point), file=sys.stderr)
+        register_post_exec_batch_callback(entry_point.load())
+
 
 register_action_logs()
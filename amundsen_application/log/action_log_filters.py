@@ -0,0 +1,105 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Applies the ACTION_LOG_COMMAND_CONFIG settings of a command: sampling, output capture and size limit, and redaction.
+"""
+
+import inspect
+import random
+from typing import Any, Callable, FrozenSet, Optional, Sequence, Tuple
+
+from flask import current_app as app
+
+from amundsen_application.api.utils.json_utils import dumps
+from amundsen_application.config import ActionLogCommandConfig
+
+REDACTED = '<redacted>'
+
+# The names of the parameters of a function that positional arguments are bound to, and the name of its *args
+# parameter if it has one
+PositionalParameters = Tuple[Tuple[str, ...], Optional[str]]
+
+
+def get_command_config(command: str) -> Optional[ActionLogCommandConfig]:
+    command_config = app.config['ACTION_LOG_COMMAND_CONFIG']
+    if not command_config:
+        return None
+    return command_config.get(command, command_config.get('*'))
+
+
+def is_sampled(command_config: Optional[ActionLogCommandConfig]) -> bool:
+    """
+    :return: Whether this call of the command is to be action logged
+    """
+    if command_config is None or command_config.sample_rate >= 1:
+        return True
+    return random.random() < command_config.sample_rate
+
+
+def redact(value: Any, fields: FrozenSet[str]) -> Any:
+    """
+    :return: A copy of value in which the values of the given keys are replaced by '<redacted>', at any depth
+    """
+    if isinstance(value, dict):
+        return {key: REDACTED if key in fields else redact(item, fields) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [redact(item, fields) for item in value]
+    return value
+
+
+def get_positional_parameters(func: Callable) -> PositionalParameters:
+    names = []
+    var_name = None
+    for parameter in inspect.signature(func).parameters.values():
+        if parameter.kind in (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD):
+            names.append(parameter.name)
+        elif parameter.kind == inspect.Parameter.VAR_POSITIONAL:
+            var_name = parameter.name
+    return tuple(names), var_name
+
+
+def serialize_args(args: Sequence,
+                   parameters: PositionalParameters,
+                   command_config: Optional[ActionLogCommandConfig]) -> str:
+    """
+    :param parameters: The parameters the args are bound to, so that an argument passed positionally is redacted like
+    the keyword argument of the same name
+    """
+    if command_config is not None and command_config.redacted_fields:
+        names, var_name = parameters
+        args = [REDACTED if (names[i] if i < len(names) else var_name) in command_config.redacted_fields
+                else redact(arg, command_config.redacted_fields)
+                for i, arg in enumerate(args)]
+    return dumps(args)
+
+
+def serialize_kwargs(kwargs: Any, command_config: Optional[ActionLogCommandConfig]) -> str:
+    if command_config is not None and command_config.redacted_fields:
+        kwargs = redact(kwargs, command_config.redacted_fields)
+    return dumps(kwargs)
+
+
+def serialize_output(output: Any, command_config: Optional[ActionLogCommandConfig]) -> Any:
+    """
+    :return: The output serialized to JSON, or as it is if it cannot be serialized, or None if it is not captured.
+    A serialized output longer than max_output_size is replaced by {"truncated": true, "size": <its length>}, which
+    unlike a cut string is still valid JSON.
+    """
+    if command_config is None:
+        try:
+            return dumps(output)
+        except Exception:
+            return output
+
+    if not command_config.capture_output:
+        return None
+    if command_config.redacted_fields:
+        output = redact(output, command_config.redacted_fields)
+    try:
+        serialized = dumps(output)
+    except Exception:
+        return output
+    if command_config.max_output_size is not None and len(serialized) > command_config.max_output_size:
+        return dumps({'truncated': True, 'size': len(serialized)})
+    return serialized
@@ -0,0 +1,204 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Asynchronous delivery of the action logs, used when ACTION_LOG_ASYNC_ENABLED is on: action_logging only appends a
+record to a bounded in-memory queue, and a background thread of each process serializes the records and delivers
+them in batches to the action log callbacks.
+"""
+
+import atexit
+import logging
+import os
+import socket
+from collections import deque
+from threading import Event, Lock, Thread
+from typing import Any, Deque, Dict, List, Optional, Tuple  # noqa: F401
+
+from flask import Flask
+from flask import current_app as app
+
+from amundsen_application.log import action_log_callback
+from amundsen_application.log.action_log_filters import PositionalParameters, get_command_config, serialize_args, \
+    serialize_kwargs
+from amundsen_application.log.action_log_model import ActionLogParams
+
+LOGGER = logging.getLogger(__name__)
+
+# Backpressure policies, applied when a record is added to a full queue
+DROP_NEWEST = 'drop_newest'
+DROP_OLDEST = 'drop_oldest'
+
+
+class ActionLogRecord:
+    """
+    What action_logging captures during the request: the arguments are kept as they are and only serialized by the
+    worker, the output is serialized beforehand (see serialize_output) as the caller gets it back and may change it
+    """
+    __slots__ = ('command', 'start_epoch_ms', 'end_epoch_ms', 'user', 'args', 'kwargs', 'output', 'error',
+                 'parameters')
+
+    def __init__(self, *,
+                 command: str,
+                 start_epoch_ms: int,
+                 end_epoch_ms: int,
+                 user: str,
+                 args: Tuple,
+                 kwargs: Dict[str, Any],
+                 output: Any,
+                 error: Optional[Exception],
+                 parameters: PositionalParameters = ((), None)) -> None:
+        """
+        :param output: The output as returned by serialize_output
+        :param parameters: The parameters of the logged function that args are bound to, see serialize_args
+        """
+        self.command = command
+        self.start_epoch_ms = start_epoch_ms
+        self.end_epoch_ms = end_epoch_ms
+        self.user = user
+        self.args = args
+        self.kwargs = kwargs
+        self.output = output
+        self.error = error
+        self.parameters = parameters
+
+    def to_params(self, host_name: str) -> ActionLogParams:
+        command_config = get_command_config(self.command)
+        return ActionLogParams(command=self.command,
+                               start_epoch_ms=self.start_epoch_ms,
+                               end_epoch_ms=self.end_epoch_ms,
+                               user=self.user,
+                               host_name=host_name,
+                               pos_args_json=serialize_args(self.args, self.parameters, command_config),
+                               keyword_args_json=serialize_kwargs(self.kwargs, command_config),
+                               output=self.output,
+                               error=self.error)
+
+
+class ActionLogQueue:
+    """
+    A bounded queue of ActionLogRecords, drained by a background thread started on first use in each process.
+    The thread wakes up every ACTION_LOG_FLUSH_INTERVAL_SEC, or as soon as ACTION_LOG_BATCH_SIZE records are queued,
+    and delivers the records in batches of up to ACTION_LOG_BATCH_SIZE: the pre-execution callbacks are called with
+    each record, then the post-execution ones (see action_log_callback.on_post_execution_batch).
+    When ACTION_LOG_QUEUE_MAX_SIZE records are already queued, the ACTION_LOG_BACKPRESSURE_POLICY decides which record
+    is dropped: the new one (drop_newest) or the oldest queued one (drop_oldest). Adding a record never waits.
+    """
+    def __init__(self) -> None:
+        self._records = deque()  # type: Deque[ActionLogRecord]
+        self._lock = Lock()
+        self._wakeup = Event()
+        self._stop = Event()
+        self._pid = None  # type: Optional[int]
+        self._host_name = socket.gethostname()
+        self.enqueued = 0
+        self.dropped = 0
+        self.delivered = 0
+        self.batches = 0
+        self.delivery_failures = 0
+
+    def put(self, record: ActionLogRecord) -> bool:
+        """
+        :return: False if the record was dropped
+        """
+        self._ensure_started()
+        max_size = app.config['ACTION_LOG_QUEUE_MAX_SIZE']
+        with self._lock:
+            if len(self._records) >= max_size:
+                self.dropped += 1
+                if app.config['ACTION_LOG_BACKPRESSURE_POLICY'] != DROP_OLDEST:
+                    return False
+                self._records.popleft()
+            self._records.append(record)
+            self.enqueued += 1
+            queued = len(self._records)
+
+        if queued >= app.config['ACTION_LOG_BATCH_SIZE']:
+            self._wakeup.set()
+        return True
+
+    def flush(self) -> None:
+        """
+        Delivers the queued records in the calling thread, which needs an application context
+        """
+        batch_size = app.config['ACTION_LOG_BATCH_SIZE']
+        while True:
+            with self._lock:
+                batch = [self._records.popleft() for _ in range(min(batch_size, len(self._records)))]
+            if not batch:
+                return
+            self._deliver(batch)
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wakeup.set()
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'queued': len(self._records),
+            'enqueued': self.enqueued,
+            'dropped': self.dropped,
+            'delivered': self.delivered,
+            'batches': self.batches,
+            'delivery_failures': self.delivery_failures,
+        }
+
+    def _deliver(self, batch: List[ActionLogRecord]) -> None:
+        try:
+            self._deliver_batch(batch)
+        except Exception:
+            if len(batch) == 1:
+                self.delivery_failures += 1
+                LOGGER.exception('Failed to deliver the action log of {}'.format(batch[0].command))
+                return
+            # e.g. arguments of a record that cannot be serialized: the records are delivered one by one instead, so
+            # that a bad record does not cost the others. Nothing was delivered yet, the callbacks are only called
+            # once the whole batch is serialized.
+            for record in batch:
+                self._deliver([record])
+
+    def _deliver_batch(self, batch: List[ActionLogRecord]) -> None:
+        params_list = [record.to_params(self._host_name) for record in batch]
+        for params in params_list:
+            action_log_callback.on_pre_execution(params)
+        action_log_callback.on_post_execution_batch(params_list)
+        self.delivered += len(batch)
+        self.batches += 1
+
+    def _ensure_started(self) -> None:
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+
+        with self._lock:
+            if self._pid == pid:
+                return
+            # First use in this process, the thread inherited from a parent process is gone, and so are the records
+            # it had not delivered
+            self._records.clear()
+            self._stop = Event()
+            flask_app = app._get_current_object()
+            Thread(target=self._run, args=(flask_app, self._stop), name='action-log-worker', daemon=True).start()
+            atexit.register(self._flush_at_exit, flask_app)
+            self._pid = pid
+
+    def _run(self, flask_app: Flask, stop: Event) -> None:
+        while not stop.is_set():
+            self._wakeup.wait(flask_app.config['ACTION_LOG_FLUSH_INTERVAL_SEC'])
+            self._wakeup.clear()
+            with flask_app.app_context():
+                self.flush()
+
+    def _flush_at_exit(self, flask_app: Flask) -> None:
+        with flask_app.app_context():
+            self.flush()
+
+
+action_log_queue = ActionLogQueue()
+
+
+def get_action_log_stats() -> Dict[str, int]:
+    """
+    :return: The counters of the action log queue of the current process
+    """
+    return action_log_queue.get_stats()
@@ -0,0 +1,31 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+from flask import current_app as app
+from threading import Lock
+from werkzeug.utils import import_string
+
+from amundsen_application.base.base_cache_backend import BaseCacheBackend
+
+DEFAULT_CACHE_BACKEND = 'amundsen_application.proxy.cache_backends.memory_cache_backend.MemoryCacheBackend'
+
+_cache_backend = None
+_cache_backend_lock = Lock()
+
+
+def get_cache_backend() -> BaseCacheBackend:
+    """
+    Provides singleton cache backend based on the config
+    :return: Instance of the subclass of BaseCacheBackend configured as CACHE_BACKEND
+    """
+    global _cache_backend
+
+    if _cache_backend:
+        return _cache_backend
+
+    with _cache_backend_lock:
+        if not _cache_backend:
+            backend = import_string(app.config['CACHE_BACKEND'] or DEFAULT_CACHE_BACKEND)
+            _cache_backend = backend()
+
+    return _cache_backend
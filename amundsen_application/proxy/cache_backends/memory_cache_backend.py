@@ -0,0 +1,31 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+from typing import Any, Dict, Optional
+
+from flask import current_app as app
+
+from amundsen_application.api.utils.cache_utils import TTLCache
+from amundsen_application.base.base_cache_backend import BaseCacheBackend
+
+
+class MemoryCacheBackend(BaseCacheBackend):
+    """
+    Keeps entries in the memory of the current process. Every worker process holds its own copy.
+    """
+    def __init__(self, max_size: Optional[int] = None) -> None:
+        if max_size is None:
+            max_size = app.config['CACHE_MEMORY_MAX_SIZE']
+        self._cache = TTLCache(max_size=max_size, ttl_sec=0)
+
+    def get(self, key: str) -> Optional[Any]:
+        return self._cache.get(key)
+
+    def set(self, key: str, value: Any, ttl_sec: float) -> None:
+        self._cache.set(key, value, ttl_sec=ttl_sec)
+
+    def delete(self, key: str) -> None:
+        self._cache.delete(key)
+
+    def get_stats(self) -> Dict[str, int]:
+        return self._cache.get_stats()
@@ -0,0 +1,138 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import math
+import os
+import socket
+import threading
+from typing import Any, Dict, List, Optional, Union  # noqa: F401
+
+from flask import current_app as app
+
+from amundsen_application.base.base_cache_backend import BaseCacheBackend
+
+
+class RedisError(Exception):
+    pass
+
+
+class RedisConnection:
+    """
+    Minimal client for the Redis serialization protocol (RESP), enough to run the handful of commands the cache
+    needs without pulling in a Redis client library. Works with Redis and any server speaking the same protocol.
+    """
+    def __init__(self, *, host: str, port: int, timeout_sec: float) -> None:
+        self._socket = socket.create_connection((host, port), timeout=timeout_sec)
+        self._reader = self._socket.makefile('rb')
+
+    def execute(self, *args: Union[str, bytes]) -> Any:
+        command = [b'*%d\r\n' % len(args)]
+        for arg in args:
+            value = arg.encode('utf-8') if isinstance(arg, str) else arg
+            command.append(b'$%d\r\n%s\r\n' % (len(value), value))
+        self._socket.sendall(b''.join(command))
+        return self._read_reply()
+
+    def close(self) -> None:
+        self._reader.close()
+        self._socket.close()
+
+    def _read_reply(self) -> Any:
+        line = self._reader.readline()
+        if not line.endswith(b'\r\n'):
+            raise ConnectionError('Connection closed by the cache server')
+
+        prefix, payload = line[:1], line[1:-2]
+        if prefix == b'+':
+            return payload.decode('utf-8')
+        if prefix == b'-':
+            raise RedisError(payload.decode('utf-8'))
+        if prefix == b':':
+            return int(payload)
+        if prefix == b'$':
+            length = int(payload)
+            if length == -1:
+                return None
+            data = self._reader.read(length + 2)
+            return data[:-2]
+        if prefix == b'*':
+            length = int(payload)
+            if length == -1:
+                return None
+            return [self._read_reply() for _ in range(length)]
+        raise RedisError('Unexpected reply from the cache server: {!r}'.format(line))
+
+
+class RedisCacheBackend(BaseCacheBackend):
+    """
+    Keeps entries in a Redis server, shared by every worker process that connects to it.
+    Each thread of each process uses its own connection.
+    """
+    def __init__(self,
+                 host: Optional[str] = None,
+                 port: Optional[int] = None,
+                 db: Optional[int] = None,
+                 password: Optional[str] = None,
+                 key_prefix: Optional[str] = None,
+                 timeout_sec: Optional[float] = None) -> None:
+        self.host = host or app.config['CACHE_REDIS_HOST']
+        self.port = port or app.config['CACHE_REDIS_PORT']
+        self.db = db if db is not None else app.config['CACHE_REDIS_DB']
+        self.password = password or app.config['CACHE_REDIS_PASSWORD']
+        self.key_prefix = key_prefix if key_prefix is not None else app.config['CACHE_REDIS_KEY_PREFIX']
+        self.timeout_sec = timeout_sec or app.config['CACHE_REDIS_TIMEOUT_SEC']
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self._execute('GET', self.key_prefix + key)
+        if value is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return json.loads(value)
+
+    def set(self, key: str, value: Any, ttl_sec: float) -> None:
+        ttl_ms = max(int(math.ceil(ttl_sec * 1000)), 1)
+        self._execute('SET', self.key_prefix + key, json.dumps(value), 'PX', str(ttl_ms))
+
+    def delete(self, key: str) -> None:
+        self._execute('DEL', self.key_prefix + key)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+    def _execute(self, *args: str) -> Any:
+        try:
+            return self._get_connection().execute(*args)
+        except OSError:
+            # The server may have dropped an idle connection; retry once on a new one
+            self._reset_connection()
+            return self._get_connection().execute(*args)
+
+    def _get_connection(self) -> RedisConnection:
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = RedisConnection(host=self.host, port=self.port, timeout_sec=self.timeout_sec)
+            if self.password:
+                connection.execute('AUTH', self.password)
+            if self.db:
+                connection.execute('SELECT', str(self.db))
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def _reset_connection(self) -> None:
+        connection = getattr(self._local, 'connection', None)
+        self._local.connection = None
+        if connection is not None:
+            try:
+                connection.close()
+            except OSError:
+                pass
@@ -0,0 +1,74 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from flask import current_app as app
+
+from amundsen_application.base.base_cache_backend import BaseCacheBackend
+
+CREATE_TABLE_STATEMENT = 'CREATE TABLE IF NOT EXISTS cache_entries ' \
+                         '(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)'
+# Expired rows are only purged once every PURGE_INTERVAL writes, to keep writes cheap
+PURGE_INTERVAL = 1000
+
+
+class SqliteCacheBackend(BaseCacheBackend):
+    """
+    Keeps entries in a local SQLite database, shared by every worker process of the node.
+    Each thread of each process uses its own connection; the database runs in WAL mode so readers never wait
+    for writers.
+    """
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path or app.config['CACHE_SQLITE_PATH']
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._local = threading.local()
+
+        connection = self._get_connection()
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute(CREATE_TABLE_STATEMENT)
+
+    def get(self, key: str) -> Optional[Any]:
+        row = self._get_connection().execute('SELECT value FROM cache_entries WHERE key = ? AND expires_at > ?',
+                                             (key, time.time())).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl_sec: float) -> None:
+        now = time.time()
+        connection = self._get_connection()
+        connection.execute('INSERT OR REPLACE INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?)',
+                           (key, json.dumps(value), now + ttl_sec))
+
+        self._writes += 1
+        if self._writes % PURGE_INTERVAL == 0:
+            connection.execute('DELETE FROM cache_entries WHERE expires_at <= ?', (now,))
+
+    def delete(self, key: str) -> None:
+        self._get_connection().execute('DELETE FROM cache_entries WHERE key = ?', (key,))
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+    def _get_connection(self) -> sqlite3.Connection:
+        # SQLite connections must not be shared across threads, nor carried over a fork
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=1, isolation_level=None)
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
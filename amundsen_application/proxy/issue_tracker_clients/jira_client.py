@@ -6,6 +6,7 @@ from typing import List
 
 from flask import current_app as app
 
+from amundsen_application.api.utils.auth_utils import get_current_user
 from amundsen_application.base.base_issue_tracker_client import BaseIssueTrackerClient
 from amundsen_application.proxy.issue_tracker_clients.issue_exceptions import IssueConfigurationException
 from amundsen_application.models.data_issue import DataIssue, Priority
@@ -76,7 +77,9 @@ class JiraClient(BaseIssueTrackerClient):
         """
         try:
             if app.config['AUTH_USER_METHOD']:
-                user_email = app.config['AUTH_USER_METHOD'](app).email
+                user_email = get_current_user().email
+                if not user_email:
+                    raise Exception('The current user has no email to set as the JIRA issue reporter')
                 # We currently cannot use the email directly because of the following issue:
                 # https://community.atlassian.com/t5/Answers-Developer-Questions/JIRA-Rest-API-find-JIRA-user-based-on-user-s-email-address/qaq-p/532715
                 jira_id = user_email.split('@')[0]
@@ -0,0 +1,68 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Micro-benchmark of the column post-processing of marshall_table_full on a wide table.
+'config' is the previous implementation (COLUMN_STAT_ORDER read from the config for every stat of every column),
+'ranked' is _marshall_columns. The cost of the whole marshall_table_full is shown for reference.
+
+    python -m benchmarks.benchmark_column_stats
+"""
+
+import copy
+import timeit
+from typing import Dict, List
+
+from amundsen_application import create_app
+from amundsen_application.api.utils.metadata_utils import _marshall_columns, marshall_table_full
+from benchmarks.fixtures import STAT_TYPES, wide_table_metadata
+
+COLUMN_COUNT = 10000
+REPEAT = 5
+
+app = create_app('amundsen_application.config.LocalConfig')
+app.config['COLUMN_STAT_ORDER'] = {stat_type: rank for rank, stat_type in enumerate(STAT_TYPES[:-1])}
+
+
+def _config_columns(columns: List[Dict], is_editable: bool) -> None:
+    from flask import current_app
+
+    for col in columns:
+        col['is_editable'] = is_editable
+        if current_app.config['COLUMN_STAT_ORDER']:
+            col['stats'].sort(key=lambda x: current_app.config['COLUMN_STAT_ORDER'].
+                              get(x['stat_type'], len(current_app.config['COLUMN_STAT_ORDER'])))
+
+
+def _ranked_columns(columns: List[Dict], is_editable: bool) -> None:
+    _marshall_columns(columns, is_editable=is_editable, stat_order=app.config['COLUMN_STAT_ORDER'])
+
+
+def _best_msec(func: object, table: Dict) -> float:
+    def _run() -> None:
+        func(copy.deepcopy(table['columns']), True)  # type: ignore
+    copy_sec = min(timeit.repeat(lambda: copy.deepcopy(table['columns']), number=1, repeat=REPEAT))
+    return (min(timeit.repeat(_run, number=1, repeat=REPEAT)) - copy_sec) * 1e3
+
+
+def main() -> None:
+    table = wide_table_metadata(COLUMN_COUNT)
+    with app.app_context():
+        expected = copy.deepcopy(table['columns'])
+        actual = copy.deepcopy(table['columns'])
+        _config_columns(expected, True)
+        _ranked_columns(actual, True)
+        assert expected == actual
+
+        config_msec = _best_msec(_config_columns, table)
+        ranked_msec = _best_msec(_ranked_columns, table)
+        full_msec = min(timeit.repeat(lambda: marshall_table_full(copy.deepcopy(table)), number=1, repeat=REPEAT)) * 1e3
+
+    print('{} columns'.format(COLUMN_COUNT))
+    print('column pass, config lookups: {:8.2f} ms'.format(config_msec))
+    print('column pass, rank lookup:    {:8.2f} ms ({:.1f}x)'.format(ranked_msec, config_msec / ranked_msec))
+    print('marshall_table_full:         {:8.2f} ms'.format(full_msec))
+
+
+if __name__ == '__main__':
+    main()
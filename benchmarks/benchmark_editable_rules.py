@@ -0,0 +1,57 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Micro-benchmark of is_table_editable as the number of UNEDITABLE_TABLE_DESCRIPTION_MATCH_RULES grows.
+'loop' is the previous implementation (every rule matched in turn with re.match), 'compiled' is the
+EditableRuleMatcher. Tables are editable, the worst case of the loop.
+
+    python -m benchmarks.benchmark_editable_rules
+"""
+
+import timeit
+from typing import List
+
+from amundsen_application.api.utils.editable_rule_utils import EditableRuleMatcher
+from amundsen_application.api.utils.metadata_utils import _parse_editable_rule
+from amundsen_application.config import MatchRuleObject
+
+RULE_COUNTS = (10, 100, 500)
+LOOKUPS = 1000
+REPEAT = 3
+
+
+def _rules(count: int) -> List[MatchRuleObject]:
+    rules = []
+    for i in range(count):
+        if i % 3 == 0:
+            rules.append(MatchRuleObject(schema_regex=r'^schema_{}$'.format(i)))
+        elif i % 3 == 1:
+            rules.append(MatchRuleObject(schema_regex=r'^staging_{}_.*'.format(i)))
+        else:
+            rules.append(MatchRuleObject(schema_regex=r'^prod_{}'.format(i), table_name_regex=r'.*_tmp_{}$'.format(i)))
+    return rules
+
+
+def main() -> None:
+    print('{:>6} {:>10} {:>14} {:>9}'.format('rules', 'loop (us)', 'compiled (us)', 'speedup'))
+    for count in RULE_COUNTS:
+        rules = _rules(count)
+        matcher = EditableRuleMatcher(uneditable_schemas=set(), rules=rules)
+        names = [('analytics_{}'.format(i), 'table_{}'.format(i)) for i in range(LOOKUPS)]
+
+        def _loop() -> None:
+            for schema, table in names:
+                all(_parse_editable_rule(rule, schema, table) for rule in rules)
+
+        def _compiled() -> None:
+            for schema, table in names:
+                matcher.is_editable(schema, table)
+
+        loop_usec = min(timeit.repeat(_loop, number=1, repeat=REPEAT)) / LOOKUPS * 1e6
+        compiled_usec = min(timeit.repeat(_compiled, number=1, repeat=REPEAT)) / LOOKUPS * 1e6
+        print('{:>6} {:>10.2f} {:>14.2f} {:>8.1f}x'.format(count, loop_usec, compiled_usec, loop_usec / compiled_usec))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Encode throughput of a marshalled wide table response and of a page of table search results, with the Flask JSON
+encoder and with JSONEncoder of json_utils for each installed JSON_BACKEND.
+
+    python -m benchmarks.benchmark_json
+"""
+
+import json
+import timeit
+from typing import Any, Callable, Dict
+
+from flask.json import JSONEncoder as FlaskJSONEncoder
+
+from amundsen_application import create_app
+from amundsen_application.api.utils import json_utils
+from amundsen_application.api.utils.metadata_utils import marshall_table_full
+from amundsen_application.api.utils.search_utils import map_table_result
+from benchmarks.fixtures import table_search_results, wide_table_metadata
+
+REPEAT = 5
+
+app = create_app('amundsen_application.config.LocalConfig')
+
+
+def _payloads() -> Dict[str, Any]:
+    search_results = table_search_results(10)
+    return {
+        'table (1000 columns)': {
+            'msg': 'Success',
+            'status_code': 200,
+            'tableData': marshall_table_full(wide_table_metadata(1000)),
+        },
+        'search (10 results)': {
+            'msg': 'Success',
+            'status_code': 200,
+            'search_term': 'table',
+            'tables': {
+                'page_index': 0,
+                'results': [map_table_result(result) for result in search_results['results']],
+                'total_results': search_results['total_results'],
+            },
+        },
+    }
+
+
+def _ops_per_sec(encode: Callable[[], Any], number: int) -> float:
+    return number / min(timeit.repeat(encode, repeat=REPEAT, number=number))
+
+
+def main() -> None:
+    backends = [backend for backend, installed in json_utils._INSTALLED_BACKENDS.items() if installed]
+    print('{:>22} {:>10} {:>12} {:>10}'.format('payload', 'encoder', 'encodes/s', 'speedup'))
+    with app.test_request_context():
+        for name, payload in _payloads().items():
+            number = max(1, 2000000 // len(json.dumps(payload)))
+            flask_encoder = FlaskJSONEncoder(separators=(',', ':'))
+            baseline = _ops_per_sec(lambda: flask_encoder.encode(payload), number)
+            print('{:>22} {:>10} {:>12.0f} {:>10}'.format(name, 'flask', baseline, '1.0x'))
+            for backend in backends:
+                app.config['JSON_BACKEND'] = backend
+                encoder = json_utils.JSONEncoder(separators=(',', ':'))
+                ops = _ops_per_sec(lambda: encoder.encode(payload), number)
+                print('{:>22} {:>10} {:>12.0f} {:>9.1f}x'.format(name, backend, ops, ops / baseline))
+        app.config['JSON_BACKEND'] = json_utils.AUTO_BACKEND
+
+
+if __name__ == '__main__':
+    main()
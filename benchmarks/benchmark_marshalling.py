@@ -0,0 +1,90 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Micro-benchmark of the per-row cost of marshalling partial tables and dashboards.
+'schema' is the previous implementation (a new marshmallow schema loading and dumping every row),
+'current' is marshall_table_partial / marshall_dashboard_partial.
+
+    python -m benchmarks.benchmark_marshalling
+"""
+
+import timeit
+from typing import Callable, Dict, List
+
+from amundsen_common.models.dashboard import DashboardSummarySchema
+from amundsen_common.models.popular_table import PopularTableSchema
+from marshmallow import EXCLUDE
+
+from amundsen_application.api.utils.metadata_utils import marshall_dashboard_partial, marshall_table_partial
+
+ROW_COUNTS = (1000, 10000)
+REPEAT = 3
+
+
+def _table_rows(count: int) -> List[Dict]:
+    return [{
+        'database': 'hive',
+        'cluster': 'gold',
+        'schema': 'schema_{}'.format(i % 100),
+        'name': 'table_{}'.format(i),
+        'description': 'Description of table {}'.format(i),
+        'key': 'hive://gold.schema_{}/table_{}'.format(i % 100, i),
+        'badges': [],
+    } for i in range(count)]
+
+
+def _dashboard_rows(count: int) -> List[Dict]:
+    return [{
+        'uri': 'mode_dashboard://gold.group/dashboard_{}'.format(i),
+        'cluster': 'gold',
+        'group_name': 'group',
+        'group_url': 'https://app.mode.com/group',
+        'product': 'mode',
+        'name': 'dashboard_{}'.format(i),
+        'url': 'https://app.mode.com/group/dashboard_{}'.format(i),
+        'description': None,
+        'last_successful_run_timestamp': 1588000000 + i,
+        'chart_names': ['chart_1', 'chart_2'],
+    } for i in range(count)]
+
+
+def _schema_table_partial(table_dict: Dict) -> Dict:
+    schema = PopularTableSchema()
+    table = schema.load(table_dict, unknown=EXCLUDE)
+    results = schema.dump(table)
+    results['key'] = f'{table.database}://{table.cluster}.{table.schema}/{table.name}'
+    results['last_updated_timestamp'] = None
+    results['type'] = 'table'
+    return results
+
+
+def _schema_dashboard_partial(dashboard_dict: Dict) -> Dict:
+    schema = DashboardSummarySchema(unknown=EXCLUDE)
+    results = schema.dump(schema.load(dashboard_dict))
+    results['type'] = 'dashboard'
+    results['key'] = results.get('uri', '')
+    return results
+
+
+def _per_row_usec(marshall: Callable[[Dict], Dict], rows: List[Dict]) -> float:
+    best = min(timeit.repeat(lambda: [marshall(row) for row in rows], number=1, repeat=REPEAT))
+    return best / len(rows) * 1e6
+
+
+def main() -> None:
+    print('{:<10} {:>7} {:>14} {:>14} {:>9}'.format('shape', 'rows', 'schema (us)', 'current (us)', 'speedup'))
+    for shape, build_rows, before, after in (
+            ('table', _table_rows, _schema_table_partial, marshall_table_partial),
+            ('dashboard', _dashboard_rows, _schema_dashboard_partial, marshall_dashboard_partial)):
+        for count in ROW_COUNTS:
+            rows = build_rows(count)
+            assert [before(row) for row in rows] == [after(row) for row in rows]
+            before_usec = _per_row_usec(before, rows)
+            after_usec = _per_row_usec(after, rows)
+            speedup = before_usec / after_usec
+            print('{:<10} {:>7} {:>14.2f} {:>14.2f} {:>8.1f}x'.format(shape, count, before_usec, after_usec, speedup))
+
+
+if __name__ == '__main__':
+    main()
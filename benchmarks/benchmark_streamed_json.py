@@ -0,0 +1,55 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Peak memory allocated while serializing a marshalled wide table response, with jsonify and with
+create_streamed_json_response (the marshalled table itself is allocated beforehand and not counted).
+
+    python -m benchmarks.benchmark_streamed_json
+"""
+
+import tracemalloc
+from typing import Callable
+
+from flask import jsonify
+
+from amundsen_application import create_app
+from amundsen_application.api.utils.metadata_utils import marshall_table_full
+from amundsen_application.api.utils.response_utils import create_streamed_json_response
+from benchmarks.fixtures import wide_table_metadata
+
+COLUMN_COUNTS = (1000, 10000, 30000)
+
+app = create_app('amundsen_application.config.LocalConfig')
+
+
+def _peak_kib(serialize: Callable[[], None]) -> float:
+    tracemalloc.start()
+    serialize()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def main() -> None:
+    print('{:>8} {:>14} {:>15}'.format('columns', 'jsonify (KiB)', 'streamed (KiB)'))
+    with app.test_request_context():
+        for count in COLUMN_COUNTS:
+            table_data = marshall_table_full(wide_table_metadata(count))
+            payload = {'msg': 'Success', 'status_code': 200, 'tableData': table_data}
+
+            def _jsonify() -> None:
+                jsonify(payload).get_data()
+
+            def _streamed() -> None:
+                response = create_streamed_json_response(payload=payload,
+                                                         stream_path=('tableData', 'columns'),
+                                                         status_code=200)
+                for _ in response.response:
+                    pass
+
+            print('{:>8} {:>14.0f} {:>15.0f}'.format(count, _peak_kib(_jsonify), _peak_kib(_streamed)))
+
+
+if __name__ == '__main__':
+    main()
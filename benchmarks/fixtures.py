@@ -0,0 +1,61 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+from typing import Any, Dict
+
+STAT_TYPES = ('count', 'count_null', 'count_distinct', 'min', 'max', 'avg')
+
+
+def wide_table_metadata(column_count: int) -> Dict[str, Any]:
+    """
+    :return: a table as returned by the metadata service, with column_count columns having a few stats each
+    """
+    return {
+        'cluster': 'gold',
+        'columns': [{
+            'name': 'column_{}'.format(i),
+            'description': 'Description of column {}'.format(i),
+            'col_type': 'bigint',
+            'sort_order': i,
+            'stats': [{
+                'stat_type': stat_type,
+                'stat_val': str(i),
+                'start_epoch': 1588000000,
+                'end_epoch': 1588000000,
+            } for stat_type in reversed(STAT_TYPES)],
+        } for i in range(column_count)],
+        'database': 'hive',
+        'is_view': False,
+        'key': 'hive://gold.schema/wide_table',
+        'last_updated_timestamp': 1588000000,
+        'owners': [],
+        'schema': 'schema',
+        'name': 'wide_table',
+        'description': 'A wide table',
+        'resource_reports': [],
+        'programmatic_descriptions': [],
+        'tags': [],
+        'table_readers': [],
+        'watermarks': [],
+        'table_writer': None,
+    }
+
+
+def table_search_results(result_count: int) -> Dict[str, Any]:
+    """
+    :return: a page of table search results as returned by the search service
+    """
+    return {
+        'total_results': result_count * 100,
+        'results': [{
+            'key': 'hive://gold.schema_{}/table_{}'.format(i % 10, i),
+            'name': 'table_{}'.format(i),
+            'cluster': 'gold',
+            'description': 'Description of table {}, with some non-ASCII text: données'.format(i),
+            'database': 'hive',
+            'schema': 'schema_{}'.format(i % 10),
+            'schema_description': None,
+            'badges': [{'badge_name': 'beta', 'category': 'table_status'}],
+            'last_updated_timestamp': 1588000000 + i,
+        } for i in range(result_count)],
+    }
@@ -42,7 +42,8 @@ __version__ = '3.7.0'
 oicd = ['flaskoidc==0.1.1']
 pyarrrow = ['pyarrow==3.0.0']
 bigquery_preview = ['google-cloud-bigquery>=2.13.1,<3.0.0', 'flatten-dict==0.3.0']
-all_deps = requirements + oicd + pyarrrow + bigquery_preview
+fast_json = ['orjson>=3.3.0']
+all_deps = requirements + oicd + pyarrrow + bigquery_preview + fast_json
 
 setup(
     name='amundsen-frontend',
@@ -51,7 +52,7 @@ setup(
     url='https://www.github.com/lyft/amundsenfrontendlibrary',
     maintainer='Lyft',
     maintainer_email='amundsen-dev@lyft.com',
-    packages=find_packages(exclude=['tests*']),
+    packages=find_packages(exclude=['tests*', 'benchmarks*']),
     include_package_data=True,
     dependency_links=[],
     setup_requires=['cython >= 0.29'],
@@ -60,6 +61,7 @@ setup(
         'oidc': oicd,
         'pyarrow': pyarrrow,
         'bigquery_preview': bigquery_preview,
+        'fast_json': fast_json,
         'all': all_deps,
     },
     python_requires=">=3.6",
@@ -0,0 +1,105 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import unittest
+
+from http import HTTPStatus
+from typing import Any, List
+from unittest.mock import Mock, patch
+
+from amundsen_application import create_app
+
+local_app = create_app('amundsen_application.config.TestConfig', 'tests/templates')
+
+EVENTS = [
+    {'command': 'click', 'target_id': 'tag::payments', 'target_type': 'tag', 'label': 'payments'},
+    {'command': 'search', 'target_id': 'search_bar', 'value': 'payments'},
+]  # type: List[Any]
+
+
+class LogEventsTest(unittest.TestCase):
+    @patch('amundsen_application.log.action_log_callback.on_post_execution_batch')
+    def test_log_events(self, post_batch_mock: Mock) -> None:
+        """
+        Test the events are logged as one batch, with the keyword arguments of /log_event
+        """
+        with local_app.test_client() as test:
+            response = test.post('/api/log/v0/log_events', json=EVENTS)
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response.json['logged'], 2)
+        self.assertEqual(response.json['errors'], [])
+
+        post_batch_mock.assert_called_once()
+        params_list = post_batch_mock.call_args[0][0]
+        self.assertEqual([params.command for params in params_list], ['click', 'search'])
+        self.assertEqual(json.loads(params_list[0].keyword_args_json), {
+            'command': 'click',
+            'target_id': 'tag::payments',
+            'target_type': 'tag',
+            'label': 'payments',
+            'location': None,
+            'value': None,
+        })
+        self.assertEqual(params_list[0].user, 'test@email.com')
+
+    @patch('amundsen_application.log.action_log_callback.on_post_execution_batch')
+    def test_log_events_beacon(self, post_batch_mock: Mock) -> None:
+        """
+        Test a text/plain body, as sent by navigator.sendBeacon, with the events under 'events'
+        """
+        with local_app.test_client() as test:
+            response = test.post('/api/log/v0/log_events',
+                                 data=json.dumps({'events': EVENTS}),
+                                 content_type='text/plain;charset=UTF-8')
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(len(post_batch_mock.call_args[0][0]), 2)
+
+    @patch('amundsen_application.log.action_log_callback.on_post_execution_batch')
+    def test_log_events_invalid_events(self, post_batch_mock: Mock) -> None:
+        """
+        Test the valid events are logged, and the invalid ones reported
+        """
+        invalid_events = [{'command': 'click'}, 'click', {'command': 'click', 'target_id': 'id', 'value': [1]}]
+        events = EVENTS + invalid_events  # type: List[Any]
+        with local_app.test_client() as test:
+            response = test.post('/api/log/v0/log_events', json=events)
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response.json['logged'], 2)
+        self.assertEqual([error['index'] for error in response.json['errors']], [2, 3, 4])
+        self.assertEqual(response.json['errors'][0]['msg'], '"target_id" is a required field.')
+        self.assertEqual(len(post_batch_mock.call_args[0][0]), 2)
+
+    @patch('amundsen_application.log.action_log_callback.on_post_execution_batch')
+    def test_log_events_bad_request(self, post_batch_mock: Mock) -> None:
+        with local_app.test_client() as test:
+            for body in ('not json', '{"command": "click"}', '[{"command": "click"}]'):
+                response = test.post('/api/log/v0/log_events', data=body, content_type='application/json')
+                self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+        post_batch_mock.assert_not_called()
+
+    def test_log_events_too_many_events(self) -> None:
+        local_app.config['LOG_EVENTS_MAX_BATCH_SIZE'] = 1
+        try:
+            with local_app.test_client() as test:
+                response = test.post('/api/log/v0/log_events', json=EVENTS)
+            self.assertEqual(response.status_code, HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+        finally:
+            local_app.config['LOG_EVENTS_MAX_BATCH_SIZE'] = 100
+
+    @patch('amundsen_application.log.action_log.action_log_queue')
+    def test_log_events_async(self, queue_mock: Mock) -> None:
+        """
+        Test the events are queued when ACTION_LOG_ASYNC_ENABLED is on
+        """
+        local_app.config['ACTION_LOG_ASYNC_ENABLED'] = True
+        try:
+            with local_app.test_client() as test:
+                response = test.post('/api/log/v0/log_events', json=EVENTS)
+            self.assertEqual(response.status_code, HTTPStatus.OK)
+            self.assertEqual([call[0][0].command for call in queue_mock.put.call_args_list], ['click', 'search'])
+        finally:
+            local_app.config['ACTION_LOG_ASYNC_ENABLED'] = False
@@ -4,13 +4,16 @@
 import json
 import responses
 import unittest
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 from http import HTTPStatus
 
 from amundsen_application import create_app
+from amundsen_application.api.exceptions import CircuitOpenError
+from amundsen_application.api.utils.popular_tables_utils import PopularTablesRefresher
 from amundsen_application.api.metadata.v0 import TABLE_ENDPOINT, LAST_INDEXED_ENDPOINT,\
-    POPULAR_TABLES_ENDPOINT, TAGS_ENDPOINT, USER_ENDPOINT, DASHBOARD_ENDPOINT
+    POPULAR_TABLES_ENDPOINT, TAGS_ENDPOINT, USER_ENDPOINT, DASHBOARD_ENDPOINT, _get_popular_tables
+from amundsen_application.proxy import cache_backends
 from amundsen_application.config import MatchRuleObject
 
 from amundsen_application.tests.test_utils import TEST_USER_ID
@@ -522,6 +525,106 @@ class MetadataTest(unittest.TestCase):
             response = test.get('/api/metadata/v0/popular_tables')
             self.assertEqual(response.status_code, HTTPStatus.INTERNAL_SERVER_ERROR)
 
+    @responses.activate
+    def test_popular_tables_cached(self) -> None:
+        """
+        Test popular_tables serves repeated requests from the cache
+        :return:
+        """
+        cache_backends._cache_backend = None
+        local_app.config['POPULAR_TABLES_CACHE_ENABLED'] = True
+        mock_url = local_app.config['METADATASERVICE_BASE'] \
+            + POPULAR_TABLES_ENDPOINT \
+            + f'/{TEST_USER_ID}'
+        responses.add(responses.GET, mock_url,
+                      json=self.mock_popular_tables, status=HTTPStatus.OK)
+
+        try:
+            with local_app.test_client() as test:
+                for _ in range(2):
+                    response = test.get('/api/metadata/v0/popular_tables')
+                    self.assertEqual(response.status_code, HTTPStatus.OK)
+                    self.assertCountEqual(json.loads(response.data).get('results'),
+                                          self.expected_parsed_popular_tables)
+                self.assertEqual(len(responses.calls), 1)
+        finally:
+            local_app.config['POPULAR_TABLES_CACHE_ENABLED'] = False
+
+    @responses.activate
+    def test_popular_tables_etag(self) -> None:
+        """
+        Test popular_tables answers a matching If-None-Match with 304, using the ETag stored in the cache
+        :return:
+        """
+        cache_backends._cache_backend = None
+        local_app.config['POPULAR_TABLES_CACHE_ENABLED'] = True
+        local_app.config['METADATA_ETAG_ENABLED'] = True
+        mock_url = local_app.config['METADATASERVICE_BASE'] + POPULAR_TABLES_ENDPOINT + f'/{TEST_USER_ID}'
+        responses.add(responses.GET, mock_url, json=self.mock_popular_tables, status=HTTPStatus.OK)
+
+        try:
+            with local_app.test_client() as test:
+                etag = test.get('/api/metadata/v0/popular_tables').headers['ETag']
+                with patch('amundsen_application.api.metadata.v0.compute_etag') as compute_etag_mock:
+                    response = test.get('/api/metadata/v0/popular_tables', headers={'If-None-Match': etag})
+                    compute_etag_mock.assert_not_called()
+                self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+                self.assertEqual(len(responses.calls), 1)
+        finally:
+            local_app.config['POPULAR_TABLES_CACHE_ENABLED'] = False
+            local_app.config['METADATA_ETAG_ENABLED'] = False
+
+    @responses.activate
+    @patch('amundsen_application.api.utils.popular_tables_utils.submit_in_background')
+    def test_popular_tables_refresher(self, submit_mock: unittest.mock.Mock) -> None:
+        """
+        Test popular_tables serves the in-memory popular tables when the refresher is enabled
+        :return:
+        """
+        local_app.config['POPULAR_TABLES_REFRESH_ENABLED'] = True
+        mock_url = local_app.config['METADATASERVICE_BASE'] + POPULAR_TABLES_ENDPOINT + '/'
+        responses.add(responses.GET, mock_url, json=self.mock_popular_tables, status=HTTPStatus.OK)
+        refresher = PopularTablesRefresher(fetch=_get_popular_tables)
+
+        try:
+            with patch('amundsen_application.api.metadata.v0.popular_tables_refresher', refresher), \
+                    local_app.test_client() as test:
+                for _ in range(2):
+                    response = test.get('/api/metadata/v0/popular_tables')
+                    self.assertEqual(response.status_code, HTTPStatus.OK)
+                    self.assertCountEqual(json.loads(response.data).get('results'),
+                                          self.expected_parsed_popular_tables)
+                self.assertEqual(len(responses.calls), 1)
+                submit_mock.assert_called_with(refresher._refresh_user, TEST_USER_ID)
+        finally:
+            refresher.stop()
+            local_app.config['POPULAR_TABLES_REFRESH_ENABLED'] = False
+
+    @responses.activate
+    @patch('amundsen_application.api.utils.popular_tables_utils.submit_in_background')
+    def test_popular_tables_refresher_fallback(self, submit_mock: unittest.mock.Mock) -> None:
+        """
+        Test popular_tables fetches the popular tables itself while the refresher cannot load the global list
+        :return:
+        """
+        local_app.config['POPULAR_TABLES_REFRESH_ENABLED'] = True
+        mock_url = local_app.config['METADATASERVICE_BASE'] + POPULAR_TABLES_ENDPOINT + '/'
+        responses.add(responses.GET, mock_url, json={}, status=HTTPStatus.SERVICE_UNAVAILABLE)
+        responses.add(responses.GET, mock_url + TEST_USER_ID, json=self.mock_popular_tables, status=HTTPStatus.OK)
+        refresher = PopularTablesRefresher(fetch=_get_popular_tables)
+
+        try:
+            with patch('amundsen_application.api.metadata.v0.popular_tables_refresher', refresher), \
+                    local_app.test_client() as test:
+                response = test.get('/api/metadata/v0/popular_tables')
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+                self.assertCountEqual(json.loads(response.data).get('results'),
+                                      self.expected_parsed_popular_tables)
+                self.assertEqual(refresher.get_stats()['global_refresh_failures'], 1)
+        finally:
+            refresher.stop()
+            local_app.config['POPULAR_TABLES_REFRESH_ENABLED'] = False
+
     @responses.activate
     def test_get_table_metadata_success(self) -> None:
         """
@@ -544,6 +647,193 @@ class MetadataTest(unittest.TestCase):
             self.assertEqual(response.status_code, HTTPStatus.OK)
             self.assertCountEqual(data.get('tableData'), self.expected_parsed_metadata)
 
+    @responses.activate
+    def test_get_table_metadata_streamed(self) -> None:
+        """
+        Test get_table_metadata streams the response of tables with at least TABLE_METADATA_STREAMING_MIN_COLUMNS
+        :return:
+        """
+        url = local_app.config['METADATASERVICE_BASE'] + TABLE_ENDPOINT + '/db://cluster.schema/table'
+        responses.add(responses.GET, url, json=self.mock_metadata, status=HTTPStatus.OK)
+
+        local_app.config['TABLE_METADATA_STREAMING_MIN_COLUMNS'] = 1
+        try:
+            with local_app.test_client() as test:
+                response = test.get('/api/metadata/v0/table', query_string=dict(key='db://cluster.schema/table'))
+                self.assertTrue(response.is_streamed)
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+                data = json.loads(response.data)
+                self.assertEqual(data.get('msg'), 'Success')
+                self.assertCountEqual(data.get('tableData'), self.expected_parsed_metadata)
+        finally:
+            local_app.config['TABLE_METADATA_STREAMING_MIN_COLUMNS'] = None
+
+    @responses.activate
+    def test_get_table_metadata_cached(self) -> None:
+        """
+        Test get_table_metadata serves repeated requests from the table cache until the table is edited
+        :return:
+        """
+        cache_backends._cache_backend = None
+        local_app.config['TABLE_METADATA_CACHE_ENABLED'] = True
+        table_key = 'db://cluster.schema/table'
+        url = local_app.config['METADATASERVICE_BASE'] + TABLE_ENDPOINT + '/' + table_key
+        responses.add(responses.GET, url, json=self.mock_metadata, status=HTTPStatus.OK)
+        responses.add(responses.PUT, url + '/description', json={}, status=HTTPStatus.OK)
+
+        try:
+            with local_app.test_client() as test:
+                for _ in range(2):
+                    response = test.get('/api/metadata/v0/table', query_string=dict(key=table_key))
+                    self.assertEqual(response.status_code, HTTPStatus.OK)
+                    self.assertCountEqual(json.loads(response.data).get('tableData'), self.expected_parsed_metadata)
+                self.assertEqual(len(responses.calls), 1)
+
+                test.put('/api/metadata/v0/put_table_description',
+                         json={'key': table_key, 'description': 'test', 'source': 'source'})
+                test.get('/api/metadata/v0/table', query_string=dict(key=table_key))
+                self.assertEqual(len(responses.calls), 3)
+        finally:
+            local_app.config['TABLE_METADATA_CACHE_ENABLED'] = False
+
+    @responses.activate
+    def test_get_table_metadata_stale_while_revalidate(self) -> None:
+        """
+        Test get_table_metadata serves a stale table while it is refreshed, and drops it when the table is edited
+        :return:
+        """
+        cache_backends._cache_backend = None
+        local_app.config['METADATA_SWR_ENABLED'] = True
+        table_key = 'db://cluster.schema/table'
+        url = local_app.config['METADATASERVICE_BASE'] + TABLE_ENDPOINT + '/' + table_key
+        responses.add(responses.GET, url, json=self.mock_metadata, status=HTTPStatus.OK)
+        responses.add(responses.PUT, url + '/description', json={}, status=HTTPStatus.OK)
+
+        try:
+            with local_app.test_client() as test, \
+                    patch('amundsen_application.api.utils.swr_utils.submit_in_background') as submit_mock:
+                test.get('/api/metadata/v0/table', query_string=dict(key=table_key))
+                with patch('amundsen_application.api.utils.swr_utils.time.time', return_value=2e9):
+                    response = test.get('/api/metadata/v0/table', query_string=dict(key=table_key))
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+                self.assertCountEqual(json.loads(response.data).get('tableData'), self.expected_parsed_metadata)
+                self.assertEqual(len(responses.calls), 1)
+                submit_mock.assert_called_once()
+
+                test.put('/api/metadata/v0/put_table_description',
+                         json={'key': table_key, 'description': 'test', 'source': 'source'})
+                test.get('/api/metadata/v0/table', query_string=dict(key=table_key))
+                self.assertEqual(len(responses.calls), 3)
+        finally:
+            local_app.config['METADATA_SWR_ENABLED'] = False
+
+    @responses.activate
+    def test_get_table_metadata_etag(self) -> None:
+        """
+        Test get_table_metadata answers a matching If-None-Match with 304, from the cache when the table is cached
+        :return:
+        """
+        cache_backends._cache_backend = None
+        local_app.config['TABLE_METADATA_CACHE_ENABLED'] = True
+        local_app.config['METADATA_ETAG_ENABLED'] = True
+        table_key = 'db://cluster.schema/table'
+        url = local_app.config['METADATASERVICE_BASE'] + TABLE_ENDPOINT + '/' + table_key
+        responses.add(responses.GET, url, json=self.mock_metadata, status=HTTPStatus.OK)
+
+        try:
+            with local_app.test_client() as test:
+                response = test.get('/api/metadata/v0/table', query_string=dict(key=table_key))
+                etag = response.headers['ETag']
+                self.assertCountEqual(json.loads(response.data).get('tableData'), self.expected_parsed_metadata)
+
+                response = test.get('/api/metadata/v0/table', query_string=dict(key=table_key),
+                                    headers={'If-None-Match': etag})
+                self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+                self.assertEqual(response.data, b'')
+                self.assertEqual(response.headers['ETag'], etag)
+
+                # Fewer columns, another representation
+                response = test.get('/api/metadata/v0/table', query_string=dict(key=table_key, column_limit=0),
+                                    headers={'If-None-Match': etag})
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+                self.assertNotEqual(response.headers['ETag'], etag)
+                self.assertEqual(len(responses.calls), 1)
+        finally:
+            local_app.config['TABLE_METADATA_CACHE_ENABLED'] = False
+            local_app.config['METADATA_ETAG_ENABLED'] = False
+
+    @responses.activate
+    def test_get_table_metadata_column_limit(self) -> None:
+        """
+        Test get_table_metadata only returns the first column_limit columns, and the remaining columns are served by
+        get_table_columns from the cached table
+        :return:
+        """
+        cache_backends._cache_backend = None
+        local_app.config['TABLE_METADATA_CACHE_ENABLED'] = True
+        table_key = 'db://cluster.schema/table'
+        url = local_app.config['METADATASERVICE_BASE'] + TABLE_ENDPOINT + '/' + table_key
+        column = self.mock_metadata['columns'][0]  # type: ignore
+        mock_metadata = dict(self.mock_metadata,
+                             columns=[dict(column, name=f'column_{i}', sort_order=i) for i in range(5)])
+        responses.add(responses.GET, url, json=mock_metadata, status=HTTPStatus.OK)
+
+        try:
+            with local_app.test_client() as test:
+                response = test.get('/api/metadata/v0/table', query_string=dict(key=table_key, column_limit=2))
+                data = json.loads(response.data)
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+                self.assertEqual([col['name'] for col in data['tableData']['columns']], ['column_0', 'column_1'])
+                self.assertEqual(data['total_columns'], 5)
+
+                response = test.get('/api/metadata/v0/table/columns',
+                                    query_string=dict(key=table_key, offset=2, limit=2))
+                data = json.loads(response.data)
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+                self.assertEqual([col['name'] for col in data['columns']], ['column_2', 'column_3'])
+                self.assertEqual(data['total_columns'], 5)
+
+                response = test.get('/api/metadata/v0/table/columns', query_string=dict(key=table_key, offset=4))
+                self.assertEqual([col['name'] for col in json.loads(response.data)['columns']], ['column_4'])
+
+                # The cached table still has all of its columns
+                response = test.get('/api/metadata/v0/table', query_string=dict(key=table_key))
+                self.assertEqual(len(json.loads(response.data)['tableData']['columns']), 5)
+                self.assertEqual(len(responses.calls), 1)
+        finally:
+            local_app.config['TABLE_METADATA_CACHE_ENABLED'] = False
+
+    @responses.activate
+    def test_get_table_metadata_column_limit_without_cache(self) -> None:
+        """
+        Test get_table_metadata ignores column_limit when the table is not cached
+        :return:
+        """
+        table_key = 'db://cluster.schema/table'
+        url = local_app.config['METADATASERVICE_BASE'] + TABLE_ENDPOINT + '/' + table_key
+        responses.add(responses.GET, url, json=self.mock_metadata, status=HTTPStatus.OK)
+
+        with local_app.test_client() as test:
+            response = test.get('/api/metadata/v0/table', query_string=dict(key=table_key, column_limit=0))
+            data = json.loads(response.data)
+            self.assertEqual(response.status_code, HTTPStatus.OK)
+            self.assertEqual(len(data['tableData']['columns']), len(self.mock_metadata['columns']))  # type: ignore
+            self.assertNotIn('total_columns', data)
+
+    @responses.activate
+    def test_get_table_columns_failure(self) -> None:
+        """
+        Test get_table_columns returns the status code of the metadata service on failure
+        :return:
+        """
+        url = local_app.config['METADATASERVICE_BASE'] + TABLE_ENDPOINT + '/db://cluster.schema/table'
+        responses.add(responses.GET, url, json={}, status=HTTPStatus.NOT_FOUND)
+
+        with local_app.test_client() as test:
+            response = test.get('/api/metadata/v0/table/columns', query_string=dict(key='db://cluster.schema/table'))
+            self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+            self.assertEqual(json.loads(response.data)['columns'], [])
+
     @responses.activate
     def test_update_table_owner_success(self) -> None:
         """
@@ -794,6 +1084,18 @@ class MetadataTest(unittest.TestCase):
             data = json.loads(response.data)
             self.assertCountEqual(data.get('tags'), self.expected_parsed_tags)
 
+    @patch('amundsen_application.api.metadata.v0.request_metadata')
+    def test_get_tags_circuit_open(self, request_metadata_mock: Mock) -> None:
+        """
+        Test that a call not sent because the circuit breaker of the metadata service is open fails with a 503
+        :return:
+        """
+        request_metadata_mock.side_effect = CircuitOpenError('The circuit breaker of the upstream service is open')
+
+        with local_app.test_client() as test:
+            response = test.get('/api/metadata/v0/tags')
+            self.assertEqual(response.status_code, HTTPStatus.SERVICE_UNAVAILABLE)
+
     @responses.activate
     def test_update_table_tags_put(self) -> None:
         """
@@ -869,6 +1171,33 @@ class MetadataTest(unittest.TestCase):
             )
             self.assertEqual(response.status_code, HTTPStatus.OK)
 
+    @responses.activate
+    def test_update_dashboard_tags_invalidates_dashboard(self) -> None:
+        """
+        Test updating the tags of a dashboard drops the dashboard served stale-while-revalidate
+        :return:
+        """
+        cache_backends._cache_backend = None
+        local_app.config['METADATA_SWR_ENABLED'] = True
+        url = local_app.config['METADATASERVICE_BASE'] + DASHBOARD_ENDPOINT + '/test_dashboard_uri'
+        responses.add(responses.GET, url, json=self.mock_dashboard_metadata, status=HTTPStatus.OK)
+        responses.add(responses.PUT, url + '/tag/test_tag', json={}, status=HTTPStatus.OK)
+
+        try:
+            with local_app.test_client() as test:
+                for _ in range(2):
+                    test.get('/api/metadata/v0/dashboard', query_string=dict(uri='test_dashboard_uri'))
+                self.assertEqual(len(responses.calls), 1)
+
+                test.put('/api/metadata/v0/update_dashboard_tags',
+                         json={'key': 'test_dashboard_uri', 'tag': 'test_tag'})
+                response = test.get('/api/metadata/v0/dashboard', query_string=dict(uri='test_dashboard_uri'))
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+                self.assertEqual(len(responses.calls), 3)
+        finally:
+            local_app.config['METADATA_SWR_ENABLED'] = False
+            cache_backends._cache_backend = None
+
     @responses.activate
     def test_update_dashboard_tags_delete(self) -> None:
         """
@@ -928,6 +1257,23 @@ class MetadataTest(unittest.TestCase):
             self.assertEqual(response.status_code, HTTPStatus.OK)
             self.assertCountEqual(data.get('bookmarks'), self.expected_parsed_user_resources)
 
+    @responses.activate
+    def test_get_bookmark_etag(self) -> None:
+        """
+        Test get_bookmark answers a matching If-None-Match with 304
+        """
+        url = '{0}{1}/{2}/follow/'.format(local_app.config['METADATASERVICE_BASE'], USER_ENDPOINT, TEST_USER_ID)
+        responses.add(responses.GET, url, json=self.get_user_resource_response, status=HTTPStatus.OK)
+
+        local_app.config['METADATA_ETAG_ENABLED'] = True
+        try:
+            with local_app.test_client() as test:
+                etag = test.get('/api/metadata/v0/user/bookmark').headers['ETag']
+                response = test.get('/api/metadata/v0/user/bookmark', headers={'If-None-Match': etag})
+                self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+        finally:
+            local_app.config['METADATA_ETAG_ENABLED'] = False
+
     @responses.activate
     def test_get_bookmark_failure(self) -> None:
         """
@@ -1120,3 +1466,54 @@ class MetadataTest(unittest.TestCase):
                 'status_code': 400
             }
             self.assertEqual(response.json, expected)
+
+    @responses.activate
+    @patch('amundsen_application.api.metadata.v0.get_issue_tracker_client')
+    def test_get_table_page_success(self, mock_issue_tracker_client: unittest.mock.Mock) -> None:
+        """
+        Test get_table_page fetches every section of the table page
+        :return:
+        """
+        test_table = 'db://cluster.schema/table'
+        table_url = local_app.config['METADATASERVICE_BASE'] + TABLE_ENDPOINT + '/' + test_table
+        responses.add(responses.GET, table_url, json=self.mock_metadata, status=HTTPStatus.OK)
+        responses.add(responses.GET, table_url + '/dashboard/', json=self.expected_related_dashboard_response,
+                      status=HTTPStatus.OK)
+        responses.add(responses.GET, table_url + '/lineage',
+                      json={'downstream_entities': [], 'upstream_entities': [{'key': 'hive://gold.test/up'}]},
+                      status=HTTPStatus.OK)
+        bookmark_url = '{0}{1}/{2}/follow/'.format(local_app.config['METADATASERVICE_BASE'], USER_ENDPOINT,
+                                                   TEST_USER_ID)
+        responses.add(responses.GET, bookmark_url, json=self.get_user_resource_response, status=HTTPStatus.OK)
+        mock_issue_tracker_client.return_value.get_issues.return_value.serialize.return_value = {'issues': []}
+
+        with local_app.test_client() as test:
+            response = test.get('/api/metadata/v0/table_page', query_string=dict(key=test_table))
+            data = json.loads(response.data)
+            self.assertEqual(response.status_code, HTTPStatus.OK)
+            self.assertCountEqual(data['table'].get('tableData'), self.expected_parsed_metadata)
+            self.assertEqual(len(data['dashboards'].get('dashboards')),
+                             len(self.expected_related_dashboard_response['dashboards']))
+            self.assertEqual(data['lineage']['upstream_entities'][0]['schema'], 'test')
+            self.assertCountEqual(data['bookmarks'].get('bookmarks'), self.expected_parsed_user_resources)
+            self.assertEqual(data['issues'].get('issues'), {'issues': []})
+
+    @responses.activate
+    def test_get_table_page_partial_failure(self) -> None:
+        """
+        Test a failing section of get_table_page does not fail the whole page
+        :return:
+        """
+        test_table = 'db://cluster.schema/table'
+        table_url = local_app.config['METADATASERVICE_BASE'] + TABLE_ENDPOINT + '/' + test_table
+        responses.add(responses.GET, table_url, json=self.mock_metadata, status=HTTPStatus.OK)
+        responses.add(responses.GET, table_url + '/dashboard/', json={}, status=HTTPStatus.BAD_REQUEST)
+        responses.add(responses.GET, table_url + '/lineage', body='not json', status=HTTPStatus.OK)
+
+        with local_app.test_client() as test:
+            response = test.get('/api/metadata/v0/table_page', query_string=dict(key=test_table))
+            data = json.loads(response.data)
+            self.assertEqual(response.status_code, HTTPStatus.OK)
+            self.assertEqual(data['dashboards'].get('status_code'), HTTPStatus.BAD_REQUEST)
+            self.assertIn('msg', data['lineage'])
+            self.assertIn('msg', data['bookmarks'])
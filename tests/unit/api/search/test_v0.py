@@ -2,7 +2,8 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import json
-from typing import Dict
+from threading import Event
+from typing import Any, Dict
 import responses
 import unittest
 
@@ -10,8 +11,10 @@ from http import HTTPStatus
 from unittest.mock import Mock, patch
 
 from amundsen_application import create_app
+from amundsen_application.proxy import cache_backends
+from amundsen_application.api.metadata.v0 import POPULAR_TABLES_ENDPOINT, TAGS_ENDPOINT
 from amundsen_application.api.search.v0 import SEARCH_DASHBOARD_ENDPOINT, SEARCH_DASHBOARD_FILTER_ENDPOINT, \
-    SEARCH_TABLE_ENDPOINT, SEARCH_TABLE_FILTER_ENDPOINT, SEARCH_USER_ENDPOINT
+    SEARCH_TABLE_ENDPOINT, SEARCH_TABLE_FILTER_ENDPOINT, SEARCH_USER_ENDPOINT, _load_typeahead_entries
 
 local_app = create_app('amundsen_application.config.TestConfig', 'tests/templates')
 
@@ -224,6 +227,86 @@ class SearchTable(unittest.TestCase):
             self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
             self.assertEqual(data.get('msg'), 'Encountered error: Search request failed')
 
+    @responses.activate
+    def test_request_cached(self) -> None:
+        """
+        Test that a page of results is only requested once from the search service when the cache is enabled
+        :return:
+        """
+        responses.add(responses.GET, self.search_service_url, json=self.mock_table_results, status=HTTPStatus.OK)
+        local_app.config['SEARCH_RESULTS_CACHE_ENABLED'] = True
+        cache_backends._cache_backend = None
+        try:
+            with local_app.test_client() as test:
+                for _ in range(2):
+                    response = test.post(self.fe_flask_endpoint,
+                                         json={'term': 'cached', 'pageIndex': 0, 'filters': {}})
+                    self.assertEqual(response.status_code, HTTPStatus.OK)
+                    results = json.loads(response.data).get('tables')
+                    self.assertEqual(results.get('results'), self.expected_parsed_table_results)
+                self.assertEqual(len(responses.calls), 1)
+        finally:
+            local_app.config['SEARCH_RESULTS_CACHE_ENABLED'] = False
+            cache_backends._cache_backend = None
+
+    @responses.activate
+    def test_request_cached_per_credentials(self) -> None:
+        """
+        Test that cached results are not shared by users with different service-to-service headers, and that the
+        search service gets the normalized search term of the cache key
+        :return:
+        """
+        responses.add(responses.GET, self.search_service_url, json=self.mock_table_results, status=HTTPStatus.OK)
+        local_app.config['SEARCH_RESULTS_CACHE_ENABLED'] = True
+        # Called for the cache key and for the search service call of each request
+        headers = [{'Authorization': 'Basic a'}] * 2 + [{'Authorization': 'Basic b'}] * 2
+        local_app.config['REQUEST_HEADERS_METHOD'] = Mock(side_effect=headers)
+        cache_backends._cache_backend = None
+        try:
+            with local_app.test_client() as test:
+                for _ in range(2):
+                    response = test.post(self.fe_flask_endpoint,
+                                         json={'term': ' cached ', 'pageIndex': 0, 'filters': {}})
+                    self.assertEqual(response.status_code, HTTPStatus.OK)
+                self.assertEqual(len(responses.calls), 2)
+                self.assertIn('query_term=cached&', responses.calls[0].request.url)
+        finally:
+            local_app.config['SEARCH_RESULTS_CACHE_ENABLED'] = False
+            local_app.config['REQUEST_HEADERS_METHOD'] = None
+            cache_backends._cache_backend = None
+
+    @responses.activate
+    @patch('amundsen_application.api.search.v0.submit_in_background')
+    def test_request_prefetches_next_page(self, submit_mock: Mock) -> None:
+        """
+        Test that the next page of results is prefetched if there is one
+        :return:
+        """
+        submit_mock.side_effect = lambda func, **kwargs: func(**kwargs)
+        mock_results = dict(self.mock_table_results, total_results=2)
+        responses.add(responses.GET, self.search_service_url, json=mock_results, status=HTTPStatus.OK)
+        local_app.config['SEARCH_RESULTS_CACHE_ENABLED'] = True
+        local_app.config['SEARCH_RESULTS_PREFETCH_ENABLED'] = True
+        cache_backends._cache_backend = None
+        try:
+            with local_app.test_client() as test:
+                test.post(self.fe_flask_endpoint, json={'term': 'prefetched', 'pageIndex': 0, 'filters': {}})
+                self.assertEqual(len(responses.calls), 2)
+                self.assertIn('page_index=1', responses.calls[1].request.url)
+
+                # The second page is served from the cache, and is the last one so nothing else is prefetched
+                test.post(self.fe_flask_endpoint, json={'term': 'prefetched', 'pageIndex': 1, 'filters': {}})
+                self.assertEqual(len(responses.calls), 2)
+
+                # Pages served from the cache prefetch nothing
+                test.post(self.fe_flask_endpoint, json={'term': ' prefetched ', 'pageIndex': 0, 'filters': {}})
+                self.assertEqual(len(responses.calls), 2)
+                self.assertEqual(submit_mock.call_count, 1)
+        finally:
+            local_app.config['SEARCH_RESULTS_CACHE_ENABLED'] = False
+            local_app.config['SEARCH_RESULTS_PREFETCH_ENABLED'] = False
+            cache_backends._cache_backend = None
+
 
 class SearchUser(unittest.TestCase):
     def setUp(self) -> None:
@@ -562,3 +645,196 @@ class SearchDashboard(unittest.TestCase):
             data = json.loads(response.data)
             self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
             self.assertEqual(data.get('msg'), 'Encountered error: Search request failed')
+
+
+class SearchAll(unittest.TestCase):
+    def setUp(self) -> None:
+        self.fe_flask_endpoint = '/api/search/v0/all'
+        self.table_results = {
+            'search_term': 'hello',
+            'msg': 'Success',
+            'status_code': HTTPStatus.OK,
+            'tables': {'page_index': 0, 'results': MOCK_PARSED_TABLE_RESULTS, 'total_results': 1},
+        }
+        self.dashboard_results = {
+            'search_term': 'hello',
+            'msg': 'Success',
+            'status_code': HTTPStatus.OK,
+            'dashboards': {'page_index': 0, 'results': [], 'total_results': 0},
+        }
+        self.user_results = {
+            'search_term': 'hello',
+            'msg': 'Encountered error: Search request failed',
+            'status_code': HTTPStatus.BAD_REQUEST,
+            'users': {'page_index': 0, 'results': [], 'total_results': 0},
+        }
+
+    def test_fail_if_term_is_none(self) -> None:
+        """
+        Test request failure if 'term' is not provided in the request json
+        :return:
+        """
+        with local_app.test_client() as test:
+            response = test.post(self.fe_flask_endpoint, json={'pageIndex': 0})
+            self.assertEqual(response.status_code, HTTPStatus.INTERNAL_SERVER_ERROR)
+
+    def test_fail_if_body_is_not_an_object(self) -> None:
+        """
+        Test request failure if the request data is not a JSON object
+        :return:
+        """
+        with local_app.test_client() as test:
+            response = test.post(self.fe_flask_endpoint, json=['hello'])
+            self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+
+    @patch('amundsen_application.api.search.v0._search_user')
+    @patch('amundsen_application.api.search.v0._search_dashboard')
+    @patch('amundsen_application.api.search.v0._search_table')
+    def test_merges_results(self, search_table_mock: Mock, search_dashboard_mock: Mock,
+                            search_user_mock: Mock) -> None:
+        """
+        Test that the results of each search are merged, and that one failed search does not fail the request
+        :return:
+        """
+        search_table_mock.return_value = self.table_results
+        search_dashboard_mock.return_value = self.dashboard_results
+        search_user_mock.return_value = self.user_results
+
+        with local_app.test_client() as test:
+            response = test.post(self.fe_flask_endpoint, json={
+                'term': 'hello',
+                'pageIndex': 0,
+                'filters': {'table': {'schema': 'test_schema'}},
+            })
+            data = json.loads(response.data)
+            self.assertEqual(response.status_code, HTTPStatus.OK)
+            self.assertEqual(data['tables']['results'], MOCK_PARSED_TABLE_RESULTS)
+            self.assertEqual(data['tables']['status_code'], HTTPStatus.OK)
+            self.assertEqual(data['dashboards']['total_results'], 0)
+            self.assertEqual(data['users']['status_code'], HTTPStatus.BAD_REQUEST)
+            self.assertEqual(search_table_mock.call_args[1]['filters'], {'schema': ['test_schema']})
+            self.assertEqual(search_dashboard_mock.call_args[1]['filters'], {})
+
+    @patch('amundsen_application.api.search.v0._search_user')
+    @patch('amundsen_application.api.search.v0._search_table')
+    def test_resource_timeout(self, search_table_mock: Mock, search_user_mock: Mock) -> None:
+        """
+        Test that a search running past its timeout is reported as timed out
+        :return:
+        """
+        release = Event()
+
+        def _slow_search_user(**kwargs: Any) -> Dict:
+            release.wait()
+            return self.user_results
+
+        search_table_mock.return_value = self.table_results
+        search_user_mock.side_effect = _slow_search_user
+        timeouts = local_app.config['SEARCH_RESOURCE_TIMEOUT_SEC']
+        local_app.config['SEARCH_RESOURCE_TIMEOUT_SEC'] = dict(timeouts, user=0.01)
+        try:
+            with local_app.test_client() as test:
+                response = test.post(self.fe_flask_endpoint,
+                                     json={'term': 'hello', 'pageIndex': 0, 'resources': ['table', 'user']})
+                data = json.loads(response.data)
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+                self.assertEqual(data['tables']['results'], MOCK_PARSED_TABLE_RESULTS)
+                self.assertEqual(data['users']['status_code'], HTTPStatus.GATEWAY_TIMEOUT)
+                self.assertNotIn('dashboards', data)
+                self.assertEqual(search_user_mock.call_args[1]['timeout_sec'], 0.01)
+        finally:
+            release.set()
+            local_app.config['SEARCH_RESOURCE_TIMEOUT_SEC'] = timeouts
+
+    @patch('amundsen_application.api.search.v0.request_search')
+    def test_resource_timeout_defaults_to_session_timeout(self, request_search_mock: Mock) -> None:
+        """
+        Test that the call to the search service of a resource without a timeout gets REQUEST_SESSION_TIMEOUT_SEC
+        :return:
+        """
+        request_search_mock.return_value = Mock(status_code=HTTPStatus.BAD_REQUEST)
+        timeouts = local_app.config['SEARCH_RESOURCE_TIMEOUT_SEC']
+        local_app.config['SEARCH_RESOURCE_TIMEOUT_SEC'] = {}
+        try:
+            with local_app.test_client() as test:
+                test.post(self.fe_flask_endpoint, json={'term': 'hello', 'pageIndex': 0, 'resources': ['user']})
+                self.assertEqual(request_search_mock.call_args[1]['timeout_sec'],
+                                 local_app.config['REQUEST_SESSION_TIMEOUT_SEC'])
+        finally:
+            local_app.config['SEARCH_RESOURCE_TIMEOUT_SEC'] = timeouts
+
+    @patch('amundsen_application.api.search.v0._search_user')
+    def test_all_searches_failed(self, search_user_mock: Mock) -> None:
+        """
+        Test that the request fails with the status code of the search service if every search failed
+        :return:
+        """
+        search_user_mock.return_value = self.user_results
+
+        with local_app.test_client() as test:
+            response = test.post(self.fe_flask_endpoint,
+                                 json={'term': 'hello', 'pageIndex': 0, 'resources': ['user']})
+            self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+
+
+class Typeahead(unittest.TestCase):
+    def setUp(self) -> None:
+        self.fe_flask_endpoint = '/api/search/v0/typeahead'
+        local_app.config['TYPEAHEAD_ENABLED'] = True
+
+    def tearDown(self) -> None:
+        local_app.config['TYPEAHEAD_ENABLED'] = False
+
+    def test_disabled(self) -> None:
+        """
+        Test the endpoint is not available unless enabled
+        :return:
+        """
+        local_app.config['TYPEAHEAD_ENABLED'] = False
+        with local_app.test_client() as test:
+            response = test.get(self.fe_flask_endpoint, query_string=dict(prefix='test'))
+            self.assertEqual(response.status_code, HTTPStatus.NOT_IMPLEMENTED)
+
+    @patch('amundsen_application.api.search.v0.typeahead_index')
+    def test_typeahead(self, typeahead_index_mock: Mock) -> None:
+        """
+        Test the suggestions of the typeahead index are returned
+        :return:
+        """
+        typeahead_index_mock.search.return_value = MOCK_PARSED_TABLE_RESULTS
+        with local_app.test_client() as test:
+            response = test.get(self.fe_flask_endpoint, query_string=dict(prefix=' test', limit=100, types='table'))
+            self.assertEqual(response.status_code, HTTPStatus.OK)
+            self.assertEqual(json.loads(response.data).get('results'), MOCK_PARSED_TABLE_RESULTS)
+            typeahead_index_mock.search.assert_called_with('test',
+                                                           limit=local_app.config['TYPEAHEAD_MAX_RESULTS'],
+                                                           types=['table'])
+
+    @responses.activate
+    def test_load_typeahead_entries(self) -> None:
+        """
+        Test the typeahead index is loaded with tags, tables, schemas and dashboards
+        :return:
+        """
+        metadata_base = local_app.config['METADATASERVICE_BASE']
+        search_base = local_app.config['SEARCHSERVICE_BASE']
+        responses.add(responses.GET, metadata_base + TAGS_ENDPOINT,
+                      json={'tag_usages': [{'tag_name': 'test_tag', 'tag_count': 1}]}, status=HTTPStatus.OK)
+        responses.add(responses.GET, metadata_base + POPULAR_TABLES_ENDPOINT + '/',
+                      json={'popular_tables': []}, status=HTTPStatus.OK)
+        responses.add(responses.GET, search_base + SEARCH_TABLE_ENDPOINT, json=MOCK_TABLE_RESULTS,
+                      status=HTTPStatus.OK)
+        responses.add(responses.GET, search_base + SEARCH_TABLE_ENDPOINT, json={'results': [], 'total_results': 1},
+                      status=HTTPStatus.OK)
+        responses.add(responses.GET, search_base + SEARCH_DASHBOARD_ENDPOINT, json={}, status=HTTPStatus.BAD_REQUEST)
+
+        with local_app.app_context():
+            entries = _load_typeahead_entries()
+
+        table = MOCK_PARSED_TABLE_RESULTS[0]
+        self.assertCountEqual(entries, [
+            ('test_tag', {'type': 'tag', 'name': 'test_tag'}),
+            ('test_table', table),
+            ('test_schema.test_table', table),
+            ('test_schema', {'type': 'schema', 'name': 'test_schema'}),
+        ])
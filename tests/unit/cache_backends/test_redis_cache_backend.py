@@ -0,0 +1,91 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import socketserver
+import threading
+import unittest
+from typing import Any, Dict, List  # noqa: F401
+
+import flask
+
+from amundsen_application.proxy.cache_backends.redis_cache_backend import RedisCacheBackend, RedisError
+
+app = flask.Flask(__name__)
+app.config.from_object('amundsen_application.config.TestConfig')
+
+
+class RespRequestHandler(socketserver.StreamRequestHandler):
+    """
+    A local stand-in for a Redis server, answering the commands used by RedisCacheBackend
+    """
+    def handle(self) -> None:
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            args = []  # type: List[bytes]
+            for _ in range(int(line[1:-2])):
+                length = int(self.rfile.readline()[1:-2])
+                args.append(self.rfile.read(length + 2)[:-2])
+            self.wfile.write(self.server.run(args))  # type: ignore
+
+
+class RespServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(('127.0.0.1', 0), RespRequestHandler)
+        self.data = {}  # type: Dict[bytes, bytes]
+        self.commands = []  # type: List[List[bytes]]
+
+    def run(self, args: List[bytes]) -> bytes:
+        self.commands.append(args)
+        command = args[0].upper()
+        if command == b'GET':
+            value = self.data.get(args[1])
+            return b'$-1\r\n' if value is None else b'$%d\r\n%s\r\n' % (len(value), value)
+        if command == b'SET':
+            self.data[args[1]] = args[2]
+            return b'+OK\r\n'
+        if command == b'DEL':
+            return b':%d\r\n' % int(self.data.pop(args[1], None) is not None)
+        if command in (b'AUTH', b'SELECT'):
+            return b'+OK\r\n'
+        return b'-ERR unknown command\r\n'
+
+
+class RedisCacheBackendTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = RespServer()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        app.config['CACHE_REDIS_HOST'], app.config['CACHE_REDIS_PORT'] = self.server.server_address
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_get_set_delete(self) -> None:
+        with app.app_context():
+            backend = RedisCacheBackend()
+            self.assertIsNone(backend.get('key'))
+            backend.set('key', {'results': [1, 2]}, ttl_sec=1.5)
+            self.assertEqual(backend.get('key'), {'results': [1, 2]})
+            backend.delete('key')
+            self.assertIsNone(backend.get('key'))
+            self.assertEqual(backend.get_stats(), {'hits': 1, 'misses': 2})
+
+    def test_commands(self) -> None:
+        with app.app_context():
+            backend = RedisCacheBackend(db=2, password='secret', key_prefix='test:')
+            backend.set('key', 'value', ttl_sec=1.5)
+            self.assertEqual(self.server.commands, [
+                [b'AUTH', b'secret'],
+                [b'SELECT', b'2'],
+                [b'SET', b'test:key', b'"value"', b'PX', b'1500'],
+            ])
+
+    def test_error_reply(self) -> None:
+        with app.app_context():
+            backend = RedisCacheBackend()
+            with self.assertRaises(RedisError):
+                backend._execute('UNKNOWN')
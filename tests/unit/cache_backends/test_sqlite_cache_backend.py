@@ -0,0 +1,48 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import flask
+
+from amundsen_application.proxy.cache_backends.sqlite_cache_backend import SqliteCacheBackend
+
+app = flask.Flask(__name__)
+app.config.from_object('amundsen_application.config.TestConfig')
+
+
+class SqliteCacheBackendTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        app.config['CACHE_SQLITE_PATH'] = os.path.join(self.directory.name, 'cache.db')
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_get_set_delete(self) -> None:
+        with app.app_context():
+            backend = SqliteCacheBackend()
+            self.assertIsNone(backend.get('key'))
+            backend.set('key', {'results': [1, 2]}, ttl_sec=60)
+            self.assertEqual(backend.get('key'), {'results': [1, 2]})
+            backend.delete('key')
+            self.assertIsNone(backend.get('key'))
+            self.assertEqual(backend.get_stats(), {'hits': 1, 'misses': 2})
+
+    def test_entries_expire(self) -> None:
+        with app.app_context():
+            backend = SqliteCacheBackend()
+            with patch('amundsen_application.proxy.cache_backends.sqlite_cache_backend.time.time',
+                       return_value=100):
+                backend.set('key', 'value', ttl_sec=60)
+            with patch('amundsen_application.proxy.cache_backends.sqlite_cache_backend.time.time',
+                       return_value=160):
+                self.assertIsNone(backend.get('key'))
+
+    def test_entries_are_shared_between_instances(self) -> None:
+        with app.app_context():
+            SqliteCacheBackend().set('key', 'value', ttl_sec=60)
+            self.assertEqual(SqliteCacheBackend().get('key'), 'value')
@@ -18,6 +18,7 @@ from amundsen_application.log.action_log import get_epoch_millisec
 
 app = flask.Flask(__name__)
 app.config.from_object('amundsen_application.config.LocalConfig')
+app.config['JSON_BACKEND'] = 'json'
 
 
 class ActionLogTest(unittest.TestCase):
@@ -26,7 +27,7 @@ class ActionLogTest(unittest.TestCase):
         # with patch.object(current_app, 'config'):
         with app.test_request_context():
             func_name = 'search'
-            metrics = action_log._build_metrics(func_name, 'dummy', 777, foo='bar')
+            metrics = action_log._build_metrics(func_name, (('query', 'page'), None), 'dummy', 777, foo='bar')
 
             expected = {'command': 'search',
                         'host_name': socket.gethostname(),
@@ -0,0 +1,122 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import unittest
+from unittest.mock import Mock, patch
+
+import flask
+
+from amundsen_application.config import ActionLogCommandConfig
+from amundsen_application.log.action_log import action_logging, log_actions
+from amundsen_application.log.action_log_filters import get_command_config, get_positional_parameters, is_sampled, \
+    redact, serialize_args, serialize_kwargs, serialize_output
+
+app = flask.Flask(__name__)
+app.config.from_object('amundsen_application.config.LocalConfig')
+app.config['JSON_BACKEND'] = 'json'
+
+
+class ActionLogFiltersTest(unittest.TestCase):
+    def setUp(self) -> None:
+        app.config['ACTION_LOG_COMMAND_CONFIG'] = {
+            'search': ActionLogCommandConfig(capture_output=False, redacted_fields=['password']),
+            'login': ActionLogCommandConfig(redacted_fields=['password']),
+            'sampled_out': ActionLogCommandConfig(sample_rate=0),
+            '*': ActionLogCommandConfig(max_output_size=10),
+        }
+
+    def tearDown(self) -> None:
+        app.config['ACTION_LOG_COMMAND_CONFIG'] = {}
+
+    def test_get_command_config(self) -> None:
+        with app.app_context():
+            self.assertIs(get_command_config('search'), app.config['ACTION_LOG_COMMAND_CONFIG']['search'])
+            self.assertIs(get_command_config('other'), app.config['ACTION_LOG_COMMAND_CONFIG']['*'])
+
+            app.config['ACTION_LOG_COMMAND_CONFIG'] = {}
+            self.assertIsNone(get_command_config('search'))
+
+    def test_is_sampled(self) -> None:
+        self.assertTrue(is_sampled(None))
+        self.assertTrue(is_sampled(ActionLogCommandConfig()))
+        self.assertFalse(is_sampled(ActionLogCommandConfig(sample_rate=0)))
+        with patch('amundsen_application.log.action_log_filters.random.random', return_value=0.3):
+            self.assertTrue(is_sampled(ActionLogCommandConfig(sample_rate=0.5)))
+            self.assertFalse(is_sampled(ActionLogCommandConfig(sample_rate=0.2)))
+
+    def test_redact(self) -> None:
+        value = {'user': 'me', 'password': 'secret', 'nested': [{'password': 'other', 'id': 1}]}
+        self.assertEqual(redact(value, frozenset(['password'])),
+                         {'user': 'me', 'password': '<redacted>', 'nested': [{'password': '<redacted>', 'id': 1}]})
+        self.assertEqual(value['password'], 'secret')
+
+    def test_serialize_kwargs(self) -> None:
+        command_config = ActionLogCommandConfig(redacted_fields=['token'])
+        self.assertEqual(json.loads(serialize_kwargs({'token': 'abc', 'page': 1}, command_config)),
+                         {'token': '<redacted>', 'page': 1})
+        self.assertEqual(json.loads(serialize_kwargs({'token': 'abc'}, None)), {'token': 'abc'})
+
+    def test_serialize_args(self) -> None:
+        def func(user: str, token: str, *options: dict) -> None:
+            pass
+
+        parameters = get_positional_parameters(func)
+        self.assertEqual(parameters, (('user', 'token'), 'options'))
+        args = ('me', 'abc', {'token': 'def'}, {'page': 1})
+        token_config = ActionLogCommandConfig(redacted_fields=['token'])
+        self.assertEqual(json.loads(serialize_args(args, parameters, token_config)),
+                         ['me', '<redacted>', {'token': '<redacted>'}, {'page': 1}])
+        options_config = ActionLogCommandConfig(redacted_fields=['options'])
+        self.assertEqual(json.loads(serialize_args(args, parameters, options_config)),
+                         ['me', 'abc', '<redacted>', '<redacted>'])
+        self.assertEqual(json.loads(serialize_args(args, parameters, None)), list(args))
+
+    def test_serialize_output(self) -> None:
+        with app.app_context():
+            self.assertEqual(serialize_output({'a': 1}, None), '{"a": 1}')
+            self.assertIsNone(serialize_output({'a': 1}, ActionLogCommandConfig(capture_output=False)))
+            self.assertEqual(json.loads(serialize_output('a' * 100, ActionLogCommandConfig(max_output_size=5))),
+                             {'truncated': True, 'size': 102})
+            self.assertEqual(serialize_output('a', ActionLogCommandConfig(max_output_size=5)), '"a"')
+            unserializable = object()
+            self.assertIs(serialize_output(unserializable, ActionLogCommandConfig()), unserializable)
+
+    @patch('amundsen_application.log.action_log_callback.on_post_execution')
+    def test_action_logging(self, post_mock: Mock) -> None:
+        with app.test_request_context():
+            self.assertEqual(search(password='secret', page_index=1), {'password': 'secret'})
+            self.assertEqual(login('secret'), 'ok')
+            self.assertEqual(sampled_out(), 'output')
+
+        self.assertEqual(post_mock.call_count, 2)
+        params = post_mock.call_args_list[0][0][0]
+        self.assertEqual(params.command, 'search')
+        self.assertEqual(json.loads(params.keyword_args_json), {'password': '<redacted>', 'page_index': 1})
+        self.assertIsNone(params.output)
+        params = post_mock.call_args_list[1][0][0]
+        self.assertEqual(json.loads(params.pos_args_json), ['<redacted>'])
+
+    @patch('amundsen_application.log.action_log_callback.on_post_execution_batch')
+    def test_log_actions(self, post_batch_mock: Mock) -> None:
+        with app.test_request_context():
+            log_actions([{'command': 'sampled_out'}, {'command': 'click', 'target_id': 'table'}])
+            log_actions([{'command': 'sampled_out'}])
+
+        post_batch_mock.assert_called_once()
+        self.assertEqual([params.command for params in post_batch_mock.call_args[0][0]], ['click'])
+
+
+@action_logging
+def search(*, password: str, page_index: int) -> dict:
+    return {'password': password}
+
+
+@action_logging
+def login(password: str) -> str:
+    return 'ok'
+
+
+@action_logging
+def sampled_out() -> str:
+    return 'output'
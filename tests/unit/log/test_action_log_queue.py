@@ -0,0 +1,157 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+import flask
+
+from amundsen_application.config import ActionLogCommandConfig
+from amundsen_application.log import action_log_queue
+from amundsen_application.log.action_log import action_logging
+from amundsen_application.log.action_log_queue import DROP_OLDEST, ActionLogQueue, ActionLogRecord
+
+app = flask.Flask(__name__)
+app.config.from_object('amundsen_application.config.LocalConfig')
+app.config['JSON_BACKEND'] = 'json'
+app.config['ACTION_LOG_ASYNC_ENABLED'] = True
+app.config['ACTION_LOG_BATCH_SIZE'] = 2
+
+
+def _record(command: str) -> ActionLogRecord:
+    return ActionLogRecord(command=command, start_epoch_ms=0, end_epoch_ms=1, user='user', args=(), kwargs={},
+                           output=None, error=None)
+
+
+class ActionLogQueueTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.queue = ActionLogQueue()
+        # No background thread, the tests flush the queue themselves
+        self.queue._ensure_started = Mock()  # type: ignore
+        patcher = patch('amundsen_application.log.action_log.action_log_queue', self.queue)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch('amundsen_application.log.action_log_callback.on_post_execution_batch')
+    @patch('amundsen_application.log.action_log_callback.on_pre_execution')
+    def test_action_logs_are_delivered_in_batches(self, pre_mock: Mock, post_batch_mock: Mock) -> None:
+        with app.test_request_context():
+            for i in range(3):
+                self.assertEqual(search(f'term_{i}', page_index=i), {'results': [i]})
+            pre_mock.assert_not_called()
+
+            self.queue.flush()
+
+        self.assertEqual(pre_mock.call_count, 3)
+        self.assertEqual([len(call[0][0]) for call in post_batch_mock.call_args_list], [2, 1])
+        params = post_batch_mock.call_args_list[0][0][0][1]
+        self.assertEqual(params.command, 'search')
+        self.assertEqual(json.loads(params.pos_args_json), ['term_1'])
+        self.assertEqual(json.loads(params.keyword_args_json), {'page_index': 1})
+        self.assertEqual(json.loads(params.output), {'results': [1]})
+        self.assertIsNone(params.error)
+        self.assertLessEqual(params.start_epoch_ms, params.end_epoch_ms)
+        self.assertEqual(self.queue.get_stats()['delivered'], 3)
+        self.assertEqual(self.queue.get_stats()['batches'], 2)
+
+    @patch('amundsen_application.log.action_log_callback.on_post_execution_batch')
+    def test_error_is_logged(self, post_batch_mock: Mock) -> None:
+        with app.test_request_context():
+            with self.assertRaises(NotImplementedError):
+                fail()
+            self.queue.flush()
+
+        params = post_batch_mock.call_args[0][0][0]
+        self.assertIsInstance(params.error, NotImplementedError)
+
+    @patch('amundsen_application.log.action_log_callback.on_post_execution_batch')
+    def test_output_is_serialized_when_queued(self, post_batch_mock: Mock) -> None:
+        with app.test_request_context():
+            search('term', page_index=0)['results'].append('changed by the caller')
+            with patch.dict(app.config, {'ACTION_LOG_COMMAND_CONFIG': {'search': ActionLogCommandConfig(
+                    capture_output=False)}}):
+                search('term', page_index=1)
+            self.queue.flush()
+
+        params_list = post_batch_mock.call_args[0][0]
+        self.assertEqual(json.loads(params_list[0].output), {'results': [0]})
+        self.assertIsNone(params_list[1].output)
+
+    def test_drop_newest(self) -> None:
+        app.config['ACTION_LOG_QUEUE_MAX_SIZE'] = 2
+        try:
+            with app.app_context():
+                results = [self.queue.put(_record(f'command_{i}')) for i in range(3)]
+        finally:
+            app.config['ACTION_LOG_QUEUE_MAX_SIZE'] = 10000
+
+        self.assertEqual(results, [True, True, False])
+        self.assertEqual([record.command for record in self.queue._records], ['command_0', 'command_1'])
+        self.assertEqual(self.queue.get_stats()['dropped'], 1)
+
+    def test_drop_oldest(self) -> None:
+        app.config['ACTION_LOG_QUEUE_MAX_SIZE'] = 2
+        app.config['ACTION_LOG_BACKPRESSURE_POLICY'] = DROP_OLDEST
+        try:
+            with app.app_context():
+                results = [self.queue.put(_record(f'command_{i}')) for i in range(3)]
+        finally:
+            app.config['ACTION_LOG_QUEUE_MAX_SIZE'] = 10000
+            app.config['ACTION_LOG_BACKPRESSURE_POLICY'] = 'drop_newest'
+
+        self.assertEqual(results, [True, True, True])
+        self.assertEqual([record.command for record in self.queue._records], ['command_1', 'command_2'])
+        self.assertEqual(self.queue.get_stats()['dropped'], 1)
+
+    @patch('amundsen_application.log.action_log_callback.on_post_execution_batch')
+    def test_unserializable_arguments(self, post_batch_mock: Mock) -> None:
+        with app.app_context():
+            self.queue.put(ActionLogRecord(command='command', start_epoch_ms=0, end_epoch_ms=1, user='user',
+                                           args=(object(),), kwargs={}, output=None, error=None))
+            self.queue.flush()
+
+        post_batch_mock.assert_not_called()
+        self.assertEqual(self.queue.get_stats()['delivery_failures'], 1)
+
+    @patch('amundsen_application.log.action_log_callback.on_post_execution_batch')
+    def test_bad_record_does_not_drop_its_batch(self, post_batch_mock: Mock) -> None:
+        with app.app_context():
+            self.queue.put(ActionLogRecord(command='bad_command', start_epoch_ms=0, end_epoch_ms=1, user='user',
+                                           args=(object(),), kwargs={}, output=None, error=None))
+            self.queue.put(_record('command'))
+            self.queue.flush()
+
+        self.assertEqual([[params.command for params in call[0][0]] for call in post_batch_mock.call_args_list],
+                         [['command']])
+        self.assertEqual(self.queue.get_stats()['delivered'], 1)
+        self.assertEqual(self.queue.get_stats()['delivery_failures'], 1)
+
+    @patch('amundsen_application.log.action_log_callback.on_post_execution_batch')
+    def test_worker_delivers_full_batches(self, post_batch_mock: Mock) -> None:
+        queue = ActionLogQueue()
+        self.addCleanup(queue.stop)
+        with app.app_context():
+            queue.put(_record('command_0'))
+            queue.put(_record('command_1'))
+
+        for _ in range(100):
+            if queue.get_stats()['delivered'] == 2:
+                break
+            time.sleep(0.02)
+        self.assertEqual(queue.get_stats()['delivered'], 2)
+        self.assertEqual([params.command for params in post_batch_mock.call_args[0][0]], ['command_0', 'command_1'])
+
+    def test_get_action_log_stats(self) -> None:
+        self.assertIn('dropped', action_log_queue.get_action_log_stats())
+
+
+@action_logging
+def search(search_term: str, *, page_index: int) -> dict:
+    return {'results': [page_index]}
+
+
+@action_logging
+def fail() -> None:
+    raise NotImplementedError
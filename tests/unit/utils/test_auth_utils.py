@@ -0,0 +1,68 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import unittest
+from unittest.mock import Mock
+
+from amundsen_application import create_app
+from amundsen_application.api.utils.auth_utils import get_auth_user_stats, get_current_user
+from amundsen_application.log.action_log import action_logging
+from amundsen_application.tests.test_utils import get_test_user
+
+local_app = create_app('amundsen_application.config.TestConfig', 'tests/templates')
+
+
+@action_logging
+def _log_email(*, email: str) -> None:
+    pass
+
+
+@local_app.route('/test/auth_utils/email')
+def _email() -> str:
+    email = get_current_user().email or ''
+    _log_email(email=email)
+    return email
+
+
+class AuthUtilsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.auth_user_method = Mock(side_effect=get_test_user)
+        local_app.config['AUTH_USER_METHOD'] = self.auth_user_method
+
+    def tearDown(self) -> None:
+        local_app.config['AUTH_USER_METHOD'] = get_test_user
+
+    def test_user_is_resolved_once_per_request(self) -> None:
+        cached = get_auth_user_stats().get('cached', 0)
+        with local_app.test_request_context():
+            user = get_current_user()
+            self.assertIs(get_current_user(), user)
+            self.assertIs(get_current_user(), user)
+
+        self.assertEqual(self.auth_user_method.call_count, 1)
+        self.assertEqual(get_auth_user_stats()['cached'], cached + 2)
+
+    def test_user_is_resolved_again_for_a_new_request(self) -> None:
+        with local_app.app_context():
+            for _ in range(2):
+                with local_app.test_request_context():
+                    get_current_user()
+
+        self.assertEqual(self.auth_user_method.call_count, 2)
+
+    def test_user_outside_of_a_request(self) -> None:
+        with local_app.app_context():
+            get_current_user()
+            get_current_user()
+
+        self.assertEqual(self.auth_user_method.call_count, 2)
+
+    def test_action_logged_endpoint(self) -> None:
+        """
+        Verify that the handler and the action logging of a request share the same user
+        """
+        with local_app.test_client() as test:
+            response = test.get('/test/auth_utils/email')
+
+        self.assertEqual(response.get_data(as_text=True), 'test@email.com')
+        self.assertEqual(self.auth_user_method.call_count, 1)
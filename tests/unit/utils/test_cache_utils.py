@@ -0,0 +1,121 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import unittest
+from typing import Any, Dict, Optional
+from unittest.mock import patch
+
+from amundsen_application import create_app
+from amundsen_application.api.utils.cache_utils import CacheNamespace, TTLCache, get_cache_stats, \
+    get_dashboard_metadata_read_key, get_metadata_reads_cache, get_table_metadata_cache, \
+    invalidate_dashboard_metadata, invalidate_table_metadata
+from amundsen_application.base.base_cache_backend import BaseCacheBackend
+from amundsen_application.proxy import cache_backends
+
+local_app = create_app('amundsen_application.config.TestConfig', 'tests/templates')
+
+
+class TTLCacheTest(unittest.TestCase):
+    def test_get_set(self) -> None:
+        cache = TTLCache(max_size=2, ttl_sec=60)
+        self.assertIsNone(cache.get('a'))
+        cache.set('a', {'name': 'a'})
+        self.assertEqual(cache.get('a'), {'name': 'a'})
+        self.assertEqual(cache.get_stats()['hits'], 1)
+        self.assertEqual(cache.get_stats()['misses'], 1)
+
+    def test_least_recently_used_is_evicted(self) -> None:
+        cache = TTLCache(max_size=2, ttl_sec=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('c'), 3)
+        self.assertEqual(cache.get_stats()['evictions'], 1)
+
+    def test_entries_expire(self) -> None:
+        cache = TTLCache(max_size=2, ttl_sec=60)
+        with patch('amundsen_application.api.utils.cache_utils.time.monotonic', return_value=100):
+            cache.set('a', 1)
+            cache.set('b', 2, ttl_sec=120)
+        with patch('amundsen_application.api.utils.cache_utils.time.monotonic', return_value=159):
+            self.assertEqual(cache.get('a'), 1)
+        with patch('amundsen_application.api.utils.cache_utils.time.monotonic', return_value=160):
+            self.assertIsNone(cache.get('a'))
+            self.assertEqual(cache.get('b'), 2)
+        self.assertEqual(cache.get_stats()['expirations'], 1)
+        self.assertEqual(cache.get_stats()['size'], 1)
+
+    def test_delete(self) -> None:
+        cache = TTLCache(max_size=2, ttl_sec=60)
+        cache.set('a', 1)
+        cache.delete('a')
+        cache.delete('missing')
+        self.assertIsNone(cache.get('a'))
+
+
+class FailingCacheBackend(BaseCacheBackend):
+    def __init__(self) -> None:
+        pass
+
+    def get(self, key: str) -> Optional[Any]:
+        raise ConnectionError
+
+    def set(self, key: str, value: Any, ttl_sec: float) -> None:
+        raise ConnectionError
+
+    def delete(self, key: str) -> None:
+        raise ConnectionError
+
+    def get_stats(self) -> Dict[str, int]:
+        return {}
+
+
+class CacheNamespaceTest(unittest.TestCase):
+    def setUp(self) -> None:
+        cache_backends._cache_backend = None
+
+    def test_keys_are_namespaced(self) -> None:
+        with local_app.app_context():
+            backend = cache_backends.get_cache_backend()
+            CacheNamespace(backend=backend, namespace='a', ttl_sec=60).set('key', 1)
+            CacheNamespace(backend=backend, namespace='b', ttl_sec=60).set('key', 2)
+            self.assertEqual(backend.get('a:key'), 1)
+            self.assertEqual(backend.get('b:key'), 2)
+
+    def test_backend_failures_are_misses(self) -> None:
+        cache = CacheNamespace(backend=FailingCacheBackend(), namespace='a', ttl_sec=60)
+        cache.set('key', 1)
+        cache.delete('key')
+        self.assertIsNone(cache.get('key'))
+
+    def test_table_metadata_cache_disabled_by_config(self) -> None:
+        with local_app.app_context():
+            local_app.config['TABLE_METADATA_CACHE_ENABLED'] = False
+            self.assertIsNone(get_table_metadata_cache())
+
+    def test_invalidate_dashboard_metadata(self) -> None:
+        with local_app.app_context():
+            local_app.config['METADATA_SWR_ENABLED'] = True
+            try:
+                cache = get_metadata_reads_cache()
+                key = get_dashboard_metadata_read_key('dashboard://cluster.group/name')
+                cache.set(key, {})  # type: ignore
+                invalidate_dashboard_metadata('dashboard://cluster.group/name')
+                self.assertIsNone(cache.get(key))  # type: ignore
+            finally:
+                local_app.config['METADATA_SWR_ENABLED'] = False
+
+    def test_invalidate_table_metadata(self) -> None:
+        with local_app.app_context():
+            local_app.config['TABLE_METADATA_CACHE_ENABLED'] = True
+            try:
+                cache = get_table_metadata_cache()
+                cache.set('db://cluster.schema/table', {})  # type: ignore
+                invalidate_table_metadata('db://cluster.schema/table')
+                self.assertIsNone(cache.get('db://cluster.schema/table'))  # type: ignore
+                self.assertEqual(get_cache_stats()['misses'], 1)
+            finally:
+                local_app.config['TABLE_METADATA_CACHE_ENABLED'] = False
@@ -0,0 +1,115 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import gzip
+import os
+import tempfile
+import unittest
+
+from flask import jsonify
+
+from amundsen_application import create_app
+from amundsen_application.api.utils.compression_utils import get_compression_stats
+
+local_app = create_app('amundsen_application.config.TestConfig', 'tests/templates')
+local_app.add_url_rule('/test/compression/<int:count>', 'test_compression',
+                       lambda count: jsonify({'results': ['result'] * count}))
+
+BUNDLE = b'function main() { return "amundsen"; }\n' * 100
+
+
+class CompressResponseTest(unittest.TestCase):
+    def setUp(self) -> None:
+        local_app.config['COMPRESSION_ENABLED'] = True
+
+    def tearDown(self) -> None:
+        local_app.config['COMPRESSION_ENABLED'] = False
+
+    def test_large_response_is_compressed(self) -> None:
+        with local_app.test_client() as test:
+            response = test.get('/test/compression/1000', headers={'Accept-Encoding': 'gzip, deflate'})
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response.headers['Vary'])
+        self.assertEqual(int(response.headers['Content-Length']), len(response.data))
+        with local_app.test_request_context():
+            self.assertEqual(gzip.decompress(response.data), jsonify({'results': ['result'] * 1000}).get_data())
+
+    def test_small_response_is_not_compressed(self) -> None:
+        with local_app.test_client() as test:
+            response = test.get('/test/compression/1', headers={'Accept-Encoding': 'gzip'})
+        self.assertNotIn('Content-Encoding', response.headers)
+        self.assertNotIn('Vary', response.headers)
+
+    def test_encoding_not_accepted(self) -> None:
+        with local_app.test_client() as test:
+            response = test.get('/test/compression/1000', headers={'Accept-Encoding': 'gzip;q=0, identity'})
+        self.assertNotIn('Content-Encoding', response.headers)
+        self.assertIn('Accept-Encoding', response.headers['Vary'])
+
+    def test_compression_disabled(self) -> None:
+        local_app.config['COMPRESSION_ENABLED'] = False
+        with local_app.test_client() as test:
+            response = test.get('/test/compression/1000', headers={'Accept-Encoding': 'gzip'})
+        self.assertNotIn('Content-Encoding', response.headers)
+
+
+class StaticCompressionTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.static_folder = local_app.static_folder
+        self.static_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = tempfile.TemporaryDirectory()
+        local_app.static_folder = self.static_dir.name
+        local_app.config['STATIC_COMPRESSION_ENABLED'] = True
+        local_app.config['STATIC_COMPRESSION_CACHE_DIR'] = self.cache_dir.name
+
+        with open(os.path.join(self.static_dir.name, 'main.js'), 'wb') as f:
+            f.write(BUNDLE)
+
+    def tearDown(self) -> None:
+        local_app.static_folder = self.static_folder
+        local_app.config['STATIC_COMPRESSION_ENABLED'] = False
+        self.static_dir.cleanup()
+        self.cache_dir.cleanup()
+
+    def _get(self, filename: str, accept_encoding: str = 'gzip'):  # type: ignore
+        with local_app.test_client() as test:
+            response = test.get('/static/' + filename, headers={'Accept-Encoding': accept_encoding})
+            response.direct_passthrough = False
+            return response
+
+    def test_static_file_is_compressed_once(self) -> None:
+        misses = get_compression_stats().get('static_cache_misses', 0)
+        hits = get_compression_stats().get('static_cache_hits', 0)
+
+        for _ in range(2):
+            response = self._get('main.js')
+            self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+            self.assertIn('Accept-Encoding', response.headers['Vary'])
+            self.assertIn('javascript', response.headers['Content-Type'])
+            self.assertEqual(gzip.decompress(response.get_data()), BUNDLE)
+
+        self.assertEqual(get_compression_stats()['static_cache_misses'], misses + 1)
+        self.assertEqual(get_compression_stats()['static_cache_hits'], hits + 1)
+        self.assertEqual(len(os.listdir(self.cache_dir.name)), 1)
+
+    def test_precompressed_static_file(self) -> None:
+        with open(os.path.join(self.static_dir.name, 'main.js.gz'), 'wb') as f:
+            f.write(gzip.compress(b'precompressed'))
+
+        response = self._get('main.js')
+        self.assertEqual(gzip.decompress(response.get_data()), b'precompressed')
+        self.assertEqual(os.listdir(self.cache_dir.name), [])
+
+    def test_encoding_not_accepted(self) -> None:
+        response = self._get('main.js', accept_encoding='identity')
+        self.assertNotIn('Content-Encoding', response.headers)
+        self.assertIn('Accept-Encoding', response.headers['Vary'])
+        self.assertEqual(response.get_data(), BUNDLE)
+
+    def test_small_static_file(self) -> None:
+        with open(os.path.join(self.static_dir.name, 'small.css'), 'wb') as f:
+            f.write(b'body {}')
+
+        response = self._get('small.css')
+        self.assertNotIn('Content-Encoding', response.headers)
+        self.assertEqual(response.get_data(), b'body {}')
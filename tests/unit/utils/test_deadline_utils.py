@@ -0,0 +1,108 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import time
+import unittest
+from http import HTTPStatus
+
+import requests
+import responses
+from flask import g, jsonify
+
+from amundsen_application import create_app
+from amundsen_application.api.exceptions import DeadlineExceededError
+from amundsen_application.api.utils.deadline_utils import ENVOY_TIMEOUT_HEADER, apply_request_deadline, \
+    get_deadline_stats, get_request_deadline
+from amundsen_application.api.utils.request_utils import request_metadata, request_metadata_async
+
+local_app = create_app('amundsen_application.config.TestConfig', 'tests/templates')
+local_app.add_url_rule('/test/deadline', 'test_deadline', lambda: jsonify({'deadline': get_request_deadline()}))
+
+
+class RequestDeadlineTest(unittest.TestCase):
+    def setUp(self) -> None:
+        local_app.config['REQUEST_DEADLINE_ENABLED'] = True
+        self.url = local_app.config['METADATASERVICE_BASE'] + '/table'
+
+    def tearDown(self) -> None:
+        local_app.config['REQUEST_DEADLINE_ENABLED'] = False
+        local_app.config['REQUEST_DEADLINE_ENDPOINT_SEC'] = {}
+
+    def _get_deadline(self) -> float:
+        with local_app.test_client() as test:
+            return test.get('/test/deadline').get_json()['deadline']
+
+    def test_deadline_is_set_per_endpoint(self) -> None:
+        start = time.time()
+        self.assertAlmostEqual(self._get_deadline() - start, local_app.config['REQUEST_DEADLINE_SEC'], delta=1)
+
+        local_app.config['REQUEST_DEADLINE_ENDPOINT_SEC'] = {'test_deadline': 2}
+        self.assertAlmostEqual(self._get_deadline() - start, 2, delta=1)
+
+    def test_deadline_disabled(self) -> None:
+        local_app.config['REQUEST_DEADLINE_ENABLED'] = False
+        self.assertIsNone(self._get_deadline())
+
+    def test_apply_request_deadline(self) -> None:
+        with local_app.test_request_context():
+            self.assertEqual(apply_request_deadline(timeout_sec=3, headers=None, envoy=False), (3, None, False))
+
+            g.request_deadline = time.time() + 1
+            timeout_sec, headers, shortened = apply_request_deadline(timeout_sec=3, headers={'a': 'b'}, envoy=True)
+            headers = headers or {}
+            self.assertLessEqual(timeout_sec, 1)
+            self.assertTrue(shortened)
+            self.assertEqual(headers['a'], 'b')
+            self.assertEqual(headers['X-Request-Deadline'], str(int(g.request_deadline * 1000)))
+            self.assertLessEqual(int(headers[ENVOY_TIMEOUT_HEADER]), 1000)
+
+            g.request_deadline = time.time() + 10
+            timeout_sec, headers, shortened = apply_request_deadline(timeout_sec=3, headers=None, envoy=False)
+            headers = headers or {}
+            self.assertEqual(timeout_sec, 3)
+            self.assertFalse(shortened)
+            self.assertNotIn(ENVOY_TIMEOUT_HEADER, headers)
+
+    @responses.activate
+    def test_calls_share_the_deadline(self) -> None:
+        responses.add(responses.GET, self.url, json={}, status=HTTPStatus.OK)
+        deadline = time.time() + 1
+        with local_app.test_request_context():
+            g.request_deadline = deadline
+            request_metadata(url=self.url)
+            request_metadata_async(url=self.url).result()
+
+        self.assertEqual(len(responses.calls), 2)
+        for call in responses.calls:
+            self.assertEqual(call.request.headers['X-Request-Deadline'], str(int(deadline * 1000)))
+
+    @responses.activate
+    def test_call_after_deadline_is_not_sent(self) -> None:
+        exceeded = get_deadline_stats().get('exceeded', 0)
+        with local_app.test_request_context():
+            g.request_deadline = time.time() - 1
+            with self.assertRaises(DeadlineExceededError) as context:
+                request_metadata(url=self.url)
+        self.assertEqual(context.exception.code, HTTPStatus.GATEWAY_TIMEOUT)
+        self.assertEqual(len(responses.calls), 0)
+        self.assertEqual(get_deadline_stats()['exceeded'], exceeded + 1)
+
+    @responses.activate
+    def test_endpoint_fails_with_gateway_timeout(self) -> None:
+        local_app.config['REQUEST_DEADLINE_ENDPOINT_SEC'] = {'metadata.get_tags': 0}
+        with local_app.test_client() as test:
+            response = test.get('/api/metadata/v0/tags')
+        self.assertEqual(response.status_code, HTTPStatus.GATEWAY_TIMEOUT)
+        self.assertEqual(len(responses.calls), 0)
+
+    @responses.activate
+    def test_timeout_shortened_by_deadline(self) -> None:
+        responses.add(responses.GET, self.url, body=requests.Timeout())
+        with local_app.test_request_context():
+            g.request_deadline = time.time() + 1
+            with self.assertRaises(DeadlineExceededError):
+                request_metadata(url=self.url)
+
+            g.request_deadline = time.time() + 10
+            with self.assertRaises(requests.Timeout):
+                request_metadata(url=self.url)
@@ -0,0 +1,61 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import itertools
+import unittest
+
+from amundsen_application.api.utils.editable_rule_utils import EditableRuleMatcher, get_editable_rule_matcher
+from amundsen_application.api.utils.metadata_utils import _parse_editable_rule, get_uneditable_rule
+from amundsen_application.config import MatchRuleObject
+
+
+class EditableRuleMatcherTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.literal_rule = MatchRuleObject(schema_regex=r'^literal_schema$')
+        self.schema_rule = MatchRuleObject(schema_regex=r'^(schema1|schema2)')
+        self.table_rule = MatchRuleObject(table_name_regex=r'^noedit_([a-zA-Z_0-9]+)')
+        self.pair_rule = MatchRuleObject(schema_regex=r'^first.*', table_name_regex=r'.*bad.*')
+        self.backreference_rule = MatchRuleObject(table_name_regex=r'^(\w+)_\1$')
+        self.rules = [
+            self.literal_rule,
+            self.schema_rule,
+            self.table_rule,
+            self.pair_rule,
+            self.backreference_rule,
+            MatchRuleObject(),
+        ]
+        self.matcher = EditableRuleMatcher(uneditable_schemas={'uneditable_schema'}, rules=self.rules)
+
+    def test_find_uneditable_rule(self) -> None:
+        self.assertEqual(self.matcher.find_uneditable_rule('uneditable_schema', 'table'), 'uneditable_schema')
+        self.assertIs(self.matcher.find_uneditable_rule('literal_schema', 'table'), self.literal_rule)
+        self.assertIs(self.matcher.find_uneditable_rule('schema2_suffix', 'table'), self.schema_rule)
+        self.assertIs(self.matcher.find_uneditable_rule('schema', 'noedit_table'), self.table_rule)
+        self.assertIs(self.matcher.find_uneditable_rule('first', 'also_bad'), self.pair_rule)
+        self.assertIs(self.matcher.find_uneditable_rule('schema', 'same_same'), self.backreference_rule)
+
+    def test_editable(self) -> None:
+        self.assertIsNone(self.matcher.find_uneditable_rule('literal_schema_suffix', 'table'))
+        self.assertIsNone(self.matcher.find_uneditable_rule('not_first', 'bad'))
+        self.assertIsNone(self.matcher.find_uneditable_rule('first', 'good'))
+        self.assertIsNone(self.matcher.find_uneditable_rule('schema', 'same_other'))
+
+    def test_equivalent_to_parse_editable_rule(self) -> None:
+        schemas = ['literal_schema', 'literal_schema_2', 'schema1', 'xschema1', 'first', 'firstly', 'other']
+        tables = ['noedit_table', 'table', 'bad', 'very_bad', 'dup_dup', 'noedit_']
+        for schema, table in itertools.product(schemas, tables):
+            expected = all(_parse_editable_rule(rule, schema, table) for rule in self.rules)
+            self.assertEqual(self.matcher.is_editable(schema, table), expected, (schema, table))
+
+    def test_matcher_is_compiled_once(self) -> None:
+        config = {'UNEDITABLE_SCHEMAS': set(), 'UNEDITABLE_TABLE_DESCRIPTION_MATCH_RULES': self.rules}
+        matcher = get_editable_rule_matcher(config)
+        self.assertIs(get_editable_rule_matcher(config), matcher)
+
+        config['UNEDITABLE_TABLE_DESCRIPTION_MATCH_RULES'] = []
+        self.assertIsNot(get_editable_rule_matcher(config), matcher)
+
+    def test_get_uneditable_rule(self) -> None:
+        config = {'UNEDITABLE_SCHEMAS': set(), 'UNEDITABLE_TABLE_DESCRIPTION_MATCH_RULES': self.rules}
+        self.assertIs(get_uneditable_rule('schema1', 'table', config), self.schema_rule)
+        self.assertIsNone(get_uneditable_rule('other', 'table', config))
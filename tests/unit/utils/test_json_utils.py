@@ -0,0 +1,95 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+from flask import jsonify
+from flask.json import JSONEncoder as FlaskJSONEncoder
+
+from amundsen_application import create_app
+from amundsen_application.api.utils import json_utils
+from amundsen_application.api.utils.json_utils import JSONEncoder, dumpb, dumps, get_json_backend
+
+local_app = create_app('amundsen_application.config.TestConfig', 'tests/templates')
+
+INSTALLED_BACKENDS = [backend for backend, installed in json_utils._INSTALLED_BACKENDS.items() if installed]
+
+
+class JsonUtilsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.payload = {
+            'msg': 'Success',
+            'tableData': {
+                'name': 'table',
+                'description': 'Données </script>',
+                'columns': [{'name': 'col', 'sort_order': 0, 'stats': [{'stat_val': 1.5}]}],
+                'is_view': False,
+                'table_writer': None,
+            },
+        }
+
+    def tearDown(self) -> None:
+        local_app.config['JSON_BACKEND'] = json_utils.STDLIB_BACKEND
+
+    def test_app_uses_json_encoder(self) -> None:
+        self.assertIs(local_app.json_encoder, JSONEncoder)
+
+    def test_default_backend_is_json(self) -> None:
+        default_app = create_app('amundsen_application.config.LocalConfig', 'tests/templates')
+        with default_app.app_context():
+            self.assertEqual(get_json_backend(), json_utils.STDLIB_BACKEND)
+        self.assertEqual(get_json_backend(), json_utils.STDLIB_BACKEND)
+
+    def test_auto_backend(self) -> None:
+        local_app.config['JSON_BACKEND'] = json_utils.AUTO_BACKEND
+        with local_app.app_context():
+            self.assertEqual(get_json_backend(), INSTALLED_BACKENDS[0])
+
+    def test_unavailable_backend_falls_back_to_json(self) -> None:
+        local_app.config['JSON_BACKEND'] = 'simplejson'
+        with local_app.app_context():
+            self.assertEqual(get_json_backend(), json_utils.STDLIB_BACKEND)
+
+    def test_dumps(self) -> None:
+        for backend in INSTALLED_BACKENDS:
+            with self.subTest(backend=backend):
+                self.assertEqual(json.loads(dumps(self.payload, backend=backend)), self.payload)
+                self.assertEqual(list(json.loads(dumps({'b': [1, 2], 'a': 2}, sort_keys=True, backend=backend))),
+                                 ['a', 'b'])
+
+    def test_dumps_json_backend(self) -> None:
+        self.assertEqual(dumps(self.payload, backend=json_utils.STDLIB_BACKEND), json.dumps(self.payload))
+
+    def test_dumps_raises_type_error(self) -> None:
+        for backend in INSTALLED_BACKENDS:
+            with self.subTest(backend=backend):
+                with self.assertRaises(TypeError):
+                    dumps({'value': object()}, backend=backend)
+
+    def test_dumpb(self) -> None:
+        with local_app.app_context():
+            self.assertEqual(dumpb({'description': 'Données'}), json.dumps({'description': 'Données'}).encode('utf-8'))
+
+    def test_jsonify(self) -> None:
+        """
+        Verify that every backend encodes responses like the Flask encoder, including the objects only the Flask
+        encoder knows about
+        """
+        payload = dict(self.payload, updated=datetime(2020, 5, 1, 12, 30))
+        for backend in INSTALLED_BACKENDS:
+            local_app.config['JSON_BACKEND'] = backend
+            with self.subTest(backend=backend), local_app.test_request_context():
+                data = jsonify(payload).get_data(as_text=True)
+                self.assertEqual(json.loads(data), json.loads(FlaskJSONEncoder().encode(payload)))
+                self.assertEqual(json.loads(data)['updated'], 'Fri, 01 May 2020 12:30:00 GMT')
+
+    def test_encoder_falls_back_to_flask_encoder(self) -> None:
+        local_app.config['JSON_BACKEND'] = INSTALLED_BACKENDS[0]
+        with local_app.app_context():
+            with patch.object(json_utils, 'dumps') as mock_dumps:
+                encoded = JSONEncoder(separators=(', ', ': ')).encode({'a': 1})
+            mock_dumps.assert_not_called()
+            self.assertEqual(encoded, '{"a": 1}')
@@ -1,11 +1,16 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
-from typing import Dict
+from typing import Any, Dict, List
 import unittest
 
+from amundsen_common.models.dashboard import DashboardSummarySchema
+from amundsen_common.models.popular_table import PopularTableSchema
+from marshmallow import EXCLUDE, ValidationError
+
 from amundsen_application.api.utils.metadata_utils import _convert_prog_descriptions, _sort_prog_descriptions, \
-    _parse_editable_rule, is_table_editable, TableUri
+    _marshall_columns, _parse_editable_rule, _project_dashboard_summary, _project_popular_table, is_table_editable, \
+    marshall_dashboard_partial, marshall_table_partial, TableUri
 from amundsen_application.config import MatchRuleObject
 from amundsen_application import create_app
 
@@ -205,3 +210,103 @@ class TableUriObject(unittest.TestCase):
         self.assertEqual(uri.cluster, 'clstr.with.dots')
         self.assertEqual(uri.schema, 'schm')
         self.assertEqual(uri.table, 'tbl/with/slashes')
+
+
+class PartialMarshallingTest(unittest.TestCase):
+    """
+    The marshmallow-free projections must produce the same output as the schemas they stand in for
+    """
+    def setUp(self) -> None:
+        self.table = {
+            'database': 'db',
+            'cluster': 'clstr',
+            'schema': 'schm',
+            'name': 'tbl',
+            'description': 'desc',
+            'key': 'db://clstr.schm/tbl',
+            'badges': [],
+        }
+        self.dashboard = {
+            'uri': 'mode_dashboard://gold.group/dashboard',
+            'cluster': 'gold',
+            'group_name': 'group',
+            'group_url': 'http://mode.com/group',
+            'product': 'mode',
+            'name': 'dashboard',
+            'url': 'http://mode.com/group/dashboard',
+            'description': None,
+            'last_successful_run_timestamp': 1588000000,
+            'chart_names': ['chart'],
+            'tables': [],
+        }  # type: Dict[str, Any]
+
+    def _assert_table_equivalent(self, table_dict: Dict) -> None:
+        schema = PopularTableSchema()
+        expected = schema.dump(schema.load(table_dict, unknown=EXCLUDE))
+        self.assertEqual(_project_popular_table(table_dict), expected)
+
+    def _assert_dashboard_equivalent(self, dashboard_dict: Dict) -> None:
+        schema = DashboardSummarySchema(unknown=EXCLUDE)
+        expected = schema.dump(schema.load(dashboard_dict))
+        self.assertEqual(_project_dashboard_summary(dashboard_dict), expected)
+
+    def test_table_projection(self) -> None:
+        self._assert_table_equivalent(self.table)
+        self._assert_table_equivalent(dict(self.table, description=None))
+        del self.table['description']
+        self._assert_table_equivalent(self.table)
+
+    def test_table_projection_falls_back_to_schema(self) -> None:
+        self.assertIsNone(_project_popular_table(dict(self.table, name=1)))
+        self.assertIsNone(_project_popular_table(dict(self.table, description=1)))
+        del self.table['cluster']
+        self.assertIsNone(_project_popular_table(self.table))
+        with self.assertRaises(ValidationError):
+            marshall_table_partial(self.table)
+
+    def test_marshall_table_partial(self) -> None:
+        self.assertEqual(marshall_table_partial(self.table), {
+            'database': 'db',
+            'cluster': 'clstr',
+            'schema': 'schm',
+            'name': 'tbl',
+            'description': 'desc',
+            'key': 'db://clstr.schm/tbl',
+            'last_updated_timestamp': None,
+            'type': 'table',
+        })
+        self.assertEqual(marshall_table_partial(dict(self.table, name=b'tbl'))['key'], 'db://clstr.schm/tbl')
+
+    def test_dashboard_projection(self) -> None:
+        self._assert_dashboard_equivalent(self.dashboard)
+        self._assert_dashboard_equivalent(dict(self.dashboard, chart_names=None, last_successful_run_timestamp=None))
+        del self.dashboard['chart_names']
+        del self.dashboard['last_successful_run_timestamp']
+        self._assert_dashboard_equivalent(self.dashboard)
+
+    def test_dashboard_projection_falls_back_to_schema(self) -> None:
+        self.assertIsNone(_project_dashboard_summary(dict(self.dashboard, last_successful_run_timestamp='1588000000')))
+        self.assertIsNone(_project_dashboard_summary(dict(self.dashboard, last_successful_run_timestamp=True)))
+        self.assertIsNone(_project_dashboard_summary(dict(self.dashboard, chart_names=[1])))
+        self.assertIsNone(_project_dashboard_summary(dict(self.dashboard, url=None)))
+        self.assertEqual(
+            marshall_dashboard_partial(dict(self.dashboard, last_successful_run_timestamp='1588000000')),
+            marshall_dashboard_partial(self.dashboard))
+
+
+class MarshallColumnsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.columns = [
+            {'name': 'col_1', 'stats': [{'stat_type': 'max'}, {'stat_type': 'unknown'}, {'stat_type': 'min'}]},
+            {'name': 'col_2', 'stats': []},
+        ]  # type: List[Dict[str, Any]]
+
+    def test_stats_sorted_by_rank(self) -> None:
+        _marshall_columns(self.columns, is_editable=False, stat_order={'min': 0, 'max': 1})
+        self.assertEqual([stat['stat_type'] for stat in self.columns[0]['stats']], ['min', 'max', 'unknown'])
+        self.assertEqual([col['is_editable'] for col in self.columns], [False, False])
+
+    def test_no_stat_order(self) -> None:
+        _marshall_columns(self.columns, is_editable=True, stat_order=None)
+        self.assertEqual([stat['stat_type'] for stat in self.columns[0]['stats']], ['max', 'unknown', 'min'])
+        self.assertEqual([col['is_editable'] for col in self.columns], [True, True])
@@ -0,0 +1,73 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import unittest
+from typing import Any, Callable
+from unittest.mock import Mock, patch
+
+from amundsen_application import create_app
+from amundsen_application.api.utils.popular_tables_utils import PopularTablesRefresher
+
+local_app = create_app('amundsen_application.config.TestConfig', 'tests/templates')
+
+GLOBAL_TABLES = [{'key': 'db://cluster.schema/global'}]
+USER_TABLES = [{'key': 'db://cluster.schema/user'}]
+
+
+def _run_now(func: Callable, *args: Any) -> None:
+    func(*args)
+
+
+def _fetch(user_id: str) -> list:
+    return USER_TABLES if user_id else GLOBAL_TABLES
+
+
+@patch('amundsen_application.api.utils.popular_tables_utils.submit_in_background', side_effect=_run_now)
+class PopularTablesRefresherTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.fetch = Mock(side_effect=_fetch)
+        self.refresher = PopularTablesRefresher(fetch=self.fetch)
+
+    def tearDown(self) -> None:
+        self.refresher.stop()
+
+    def test_global_tables_are_fetched_once(self, submit_mock: Mock) -> None:
+        with local_app.app_context():
+            self.assertEqual(self.refresher.get_popular_tables(), GLOBAL_TABLES)
+            self.assertEqual(self.refresher.get_popular_tables(), GLOBAL_TABLES)
+            self.fetch.assert_called_once_with('')
+            self.assertEqual(self.refresher.get_stats()['global_refreshes'], 1)
+
+    def test_unknown_user_gets_global_tables(self, submit_mock: Mock) -> None:
+        with local_app.app_context():
+            # The personalized list is fetched in the background, the global one is served meanwhile
+            self.assertEqual(self.refresher.get_popular_tables('user'), GLOBAL_TABLES)
+            self.assertEqual(self.refresher.get_popular_tables('user'), USER_TABLES)
+            self.assertEqual(self.fetch.call_count, 2)
+            self.assertEqual(self.refresher.get_stats()['user_refreshes'], 1)
+
+    def test_stale_user_tables_are_served_while_refreshing(self, submit_mock: Mock) -> None:
+        with local_app.app_context():
+            self.refresher.get_popular_tables('user')
+            self.refresher.refresh_interval_sec = 0
+            self.assertEqual(self.refresher.get_popular_tables('user'), USER_TABLES)
+            self.assertEqual(self.refresher.get_stats()['user_refreshes'], 2)
+
+    def test_failed_global_refresh(self, submit_mock: Mock) -> None:
+        self.fetch.side_effect = Exception('metadata service unavailable')
+        with local_app.app_context():
+            self.assertIsNone(self.refresher.get_popular_tables())
+            self.assertEqual(self.refresher.get_stats()['global_refresh_failures'], 1)
+
+    def test_failed_global_load_backs_off(self, submit_mock: Mock) -> None:
+        self.fetch.side_effect = Exception('metadata service unavailable')
+        with local_app.app_context():
+            self.assertIsNone(self.refresher.get_popular_tables())
+            # Requests do not retry the load until the back-off delay is over
+            self.assertIsNone(self.refresher.get_popular_tables())
+            self.assertEqual(self.fetch.call_count, 1)
+
+            self.fetch.side_effect = _fetch
+            self.refresher._global_retry_at = 0
+            self.assertEqual(self.refresher.get_popular_tables(), GLOBAL_TABLES)
+            self.assertEqual(self.fetch.call_count, 2)
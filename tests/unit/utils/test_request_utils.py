@@ -0,0 +1,465 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import base64
+import json
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from http import HTTPStatus
+from threading import Event, Thread
+from typing import Any, Callable
+from unittest.mock import Mock, patch
+
+import flask
+import responses
+
+from amundsen_application import create_app
+from amundsen_application.api.utils import request_utils
+from amundsen_application.api.exceptions import CircuitOpenError, DeadlineExceededError
+from amundsen_application.api.utils.request_utils import CIRCUIT_CLOSED, CIRCUIT_HALF_OPEN, CIRCUIT_OPEN, \
+    METADATA_SERVICE, SEARCH_SERVICE, CircuitBreaker, RequestHeadersCache, SessionPool, SingleFlight, \
+    get_circuit_breaker_stats, get_request_headers, get_session_pool, get_session_pool_stats, \
+    get_single_flight_stats, get_token_expiry, request_metadata, request_metadata_async, request_search, \
+    submit_in_background, submit_in_context
+
+local_app = create_app('amundsen_application.config.TestConfig', 'tests/templates')
+
+
+class SessionPoolTest(unittest.TestCase):
+    def setUp(self) -> None:
+        request_utils._session_pools.clear()
+
+    def test_session_is_reused(self) -> None:
+        with local_app.app_context():
+            pool = SessionPool(pool_size=2, keep_alive=True)
+            session = pool.get_session()
+            self.assertIs(pool.get_session(), session)
+            self.assertEqual(pool.get_stats()['pool_hits'], 1)
+            self.assertEqual(pool.get_stats()['pool_misses'], 1)
+
+    def test_session_is_rebuilt_after_fork(self) -> None:
+        with local_app.app_context():
+            pool = SessionPool(pool_size=2, keep_alive=True)
+            session = pool.get_session()
+            with patch('amundsen_application.api.utils.request_utils.os.getpid', return_value=-1):
+                self.assertIsNot(pool.get_session(), session)
+            self.assertEqual(pool.get_stats()['pool_misses'], 2)
+
+    def test_keep_alive_disabled(self) -> None:
+        with local_app.app_context():
+            session = SessionPool(pool_size=2, keep_alive=False).get_session()
+            self.assertEqual(session.headers.get('Connection'), 'close')
+
+    def test_pool_per_service(self) -> None:
+        with local_app.app_context():
+            self.assertIsNot(get_session_pool(METADATA_SERVICE), get_session_pool(SEARCH_SERVICE))
+            self.assertIs(get_session_pool(METADATA_SERVICE), get_session_pool(METADATA_SERVICE))
+            self.assertEqual(get_session_pool(SEARCH_SERVICE).pool_size,
+                             local_app.config['SEARCHSERVICE_REQUEST_POOL_SIZE'])
+
+    @responses.activate
+    def test_requests_use_pooled_sessions(self) -> None:
+        metadata_url = local_app.config['METADATASERVICE_BASE'] + '/table'
+        search_url = local_app.config['SEARCHSERVICE_BASE'] + '/search'
+        responses.add(responses.GET, metadata_url, json={}, status=HTTPStatus.OK)
+        responses.add(responses.GET, search_url, json={}, status=HTTPStatus.OK)
+
+        with local_app.app_context():
+            for _ in range(3):
+                self.assertEqual(request_metadata(url=metadata_url).status_code, HTTPStatus.OK)
+            self.assertEqual(request_search(url=search_url).status_code, HTTPStatus.OK)
+
+            stats = get_session_pool_stats()
+            self.assertEqual(stats[METADATA_SERVICE]['pool_misses'], 1)
+            self.assertEqual(stats[METADATA_SERVICE]['pool_hits'], 2)
+            self.assertEqual(stats[SEARCH_SERVICE]['pool_misses'], 1)
+
+    @responses.activate
+    def test_cookies_are_not_shared_between_calls(self) -> None:
+        url = local_app.config['METADATASERVICE_BASE'] + '/user'
+        responses.add(responses.GET, url, json={}, status=HTTPStatus.OK, headers={'Set-Cookie': 'session=userA'})
+
+        with local_app.app_context():
+            request_metadata(url=url)
+            request_metadata(url=url)
+
+        self.assertEqual(len(responses.calls), 2)
+        self.assertNotIn('Cookie', responses.calls[1].request.headers)
+
+    @responses.activate
+    def test_json_payload_is_encoded_with_json_backend(self) -> None:
+        url = local_app.config['SEARCHSERVICE_BASE'] + '/search_table'
+        responses.add(responses.POST, url, json={}, status=HTTPStatus.OK)
+
+        with local_app.app_context():
+            request_search(url=url, method='POST', json={'query_term': 'données'})
+
+        request = responses.calls[0].request
+        self.assertIsInstance(request.body, bytes)
+        self.assertEqual(json.loads(request.body.decode('utf-8')), {'query_term': 'données'})
+        self.assertEqual(request.headers['Content-Type'], 'application/json')
+
+
+class AsyncRequestTest(unittest.TestCase):
+    @responses.activate
+    def test_request_metadata_async(self) -> None:
+        url = local_app.config['METADATASERVICE_BASE'] + '/table'
+        responses.add(responses.GET, url, json={'name': 'test'}, status=HTTPStatus.OK)
+
+        with local_app.app_context():
+            future = request_metadata_async(url=url)
+            self.assertEqual(future.result().json(), {'name': 'test'})
+
+    def test_submit_in_context_copies_request_context(self) -> None:
+        def _read_context() -> tuple:
+            return flask.request.args.get('key'), flask.g.user_id
+
+        with local_app.test_request_context('/?key=test_key'):
+            flask.g.user_id = 'test_user'
+            self.assertEqual(submit_in_context(_read_context).result(), ('test_key', 'test_user'))
+
+    def test_submit_in_background_leaves_out_the_request_deadline(self) -> None:
+        def _read_deadline() -> tuple:
+            return flask.g.get('request_deadline'), flask.g.user_id
+
+        with local_app.test_request_context():
+            flask.g.user_id = 'test_user'
+            flask.g.request_deadline = time.time() + 1
+            self.assertEqual(submit_in_context(_read_deadline).result(), (flask.g.request_deadline, 'test_user'))
+            self.assertEqual(submit_in_background(_read_deadline).result(), (None, 'test_user'))
+
+
+class SingleFlightTest(unittest.TestCase):
+    def test_concurrent_calls_are_coalesced(self) -> None:
+        single_flight = SingleFlight()
+        started = Event()
+        release = Event()
+
+        def _call() -> str:
+            started.set()
+            release.wait()
+            return 'result'
+        func = Mock(side_effect=_call)
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            leader = executor.submit(single_flight.do, 'key', func)
+            started.wait()
+            follower = Thread(target=lambda: results.append(single_flight.do('key', func)))
+            results = []  # type: list
+            follower.start()
+            while single_flight.coalesced == 0:
+                time.sleep(0.001)
+            release.set()
+            follower.join()
+            self.assertEqual(leader.result(), 'result')
+
+        self.assertEqual(results, ['result'])
+        func.assert_called_once()
+        self.assertEqual(single_flight.get_stats(), {'calls': 1, 'coalesced': 1, 'in_flight': 0})
+
+    def test_sequential_calls_are_not_coalesced(self) -> None:
+        single_flight = SingleFlight()
+        func = Mock(return_value='result')
+        single_flight.do('key', func)
+        single_flight.do('key', func)
+        self.assertEqual(func.call_count, 2)
+        self.assertEqual(single_flight.coalesced, 0)
+
+    def test_exception_is_raised(self) -> None:
+        single_flight = SingleFlight()
+        with self.assertRaises(ValueError):
+            single_flight.do('key', Mock(side_effect=ValueError('upstream error')))
+        self.assertEqual(single_flight.get_stats()['in_flight'], 0)
+
+    def _do_while_in_flight(self, single_flight: SingleFlight, leader_func: Mock, follower: Callable[[], Any]) -> Any:
+        started = Event()
+        release = Event()
+
+        def _call() -> Any:
+            started.set()
+            release.wait()
+            return leader_func()
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            leader = executor.submit(single_flight.do, 'key', _call)
+            started.wait()
+            try:
+                return follower()
+            finally:
+                release.set()
+                try:
+                    leader.result()
+                except DeadlineExceededError:
+                    pass
+
+    def test_follower_wait_is_limited(self) -> None:
+        single_flight = SingleFlight()
+        with self.assertRaises(TimeoutError):
+            self._do_while_in_flight(single_flight, Mock(return_value='result'),
+                                     lambda: single_flight.do('key', Mock(), timeout_sec=0.01))
+
+    def test_follower_retries_after_deadline_of_leader(self) -> None:
+        single_flight = SingleFlight()
+        leader_func = Mock(side_effect=DeadlineExceededError('The deadline of the request passed during the call'))
+        follower_func = Mock(return_value='result')
+
+        def _follow() -> Any:
+            # The follower waits for the leader, which fails once released
+            future = ThreadPoolExecutor(max_workers=1).submit(single_flight.do, 'key', follower_func)
+            while single_flight.coalesced == 0:
+                time.sleep(0.001)
+            return future
+
+        future = self._do_while_in_flight(single_flight, leader_func, _follow)
+        self.assertEqual(future.result(), 'result')
+        follower_func.assert_called_once()
+
+    @responses.activate
+    def test_shortened_call_is_not_coalesced(self) -> None:
+        url = local_app.config['METADATASERVICE_BASE'] + '/table'
+        responses.add(responses.GET, url, json={}, status=HTTPStatus.OK)
+        local_app.config['REQUEST_COALESCING_ENABLED'] = True
+        try:
+            with local_app.test_request_context():
+                with patch.object(SingleFlight, 'do', autospec=True, side_effect=SingleFlight.do) as do_mock:
+                    flask.g.request_deadline = time.time() + 1
+                    request_metadata(url=url)
+                    do_mock.assert_not_called()
+
+                    flask.g.request_deadline = time.time() + 10
+                    request_metadata(url=url)
+                    do_mock.assert_called_once()
+                    self.assertLessEqual(do_mock.call_args[1]['timeout_sec'], 10)
+        finally:
+            local_app.config['REQUEST_COALESCING_ENABLED'] = False
+
+    @responses.activate
+    def test_request_metadata_coalescing(self) -> None:
+        url = local_app.config['METADATASERVICE_BASE'] + '/table'
+        responses.add(responses.GET, url, json={}, status=HTTPStatus.OK)
+        responses.add(responses.PUT, url, json={}, status=HTTPStatus.OK)
+        local_app.config['REQUEST_COALESCING_ENABLED'] = True
+        try:
+            with local_app.app_context():
+                with patch.object(SingleFlight, 'do', autospec=True, side_effect=SingleFlight.do) as do_mock:
+                    request_metadata(url=url)
+                    request_metadata(url=url, method='PUT')
+                do_mock.assert_called_once()
+                self.assertEqual(do_mock.call_args[0][1], (url, ()))
+                self.assertIn(METADATA_SERVICE, get_single_flight_stats())
+        finally:
+            local_app.config['REQUEST_COALESCING_ENABLED'] = False
+
+
+def _bearer_headers(exp: float) -> dict:
+    claims = base64.urlsafe_b64encode(json.dumps({'sub': 'user', 'exp': exp}).encode()).decode().rstrip('=')
+    return {'Authorization': 'Bearer header.{}.signature'.format(claims)}
+
+
+class RequestHeadersCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.headers_method = Mock(return_value={'Authorization': 'Basic abc'})
+        local_app.config['REQUEST_HEADERS_METHOD'] = self.headers_method
+        local_app.config['REQUEST_HEADERS_CACHE_ENABLED'] = True
+        request_utils._request_headers_cache = None
+
+    def tearDown(self) -> None:
+        local_app.config['REQUEST_HEADERS_METHOD'] = None
+        local_app.config['REQUEST_HEADERS_CACHE_ENABLED'] = False
+        request_utils._request_headers_cache = None
+
+    def test_get_token_expiry(self) -> None:
+        self.assertEqual(get_token_expiry(_bearer_headers(1600000000)), 1600000000)
+        self.assertIsNone(get_token_expiry({'Authorization': 'Basic abc'}))
+        self.assertIsNone(get_token_expiry({'Authorization': 'Bearer opaque-token'}))
+        self.assertIsNone(get_token_expiry({'Authorization': 'Bearer a.not-base64!.c'}))
+        self.assertIsNone(get_token_expiry(None))
+
+    def test_headers_are_cached_per_user(self) -> None:
+        with local_app.test_request_context():
+            self.assertEqual(get_request_headers(), {'Authorization': 'Basic abc'})
+            self.assertEqual(get_request_headers(), {'Authorization': 'Basic abc'})
+        self.assertEqual(self.headers_method.call_count, 1)
+
+        with local_app.test_request_context(), \
+                patch('amundsen_application.api.utils.request_utils.get_current_user') as user_mock:
+            user_mock.return_value.user_id = 'other_user'
+            get_request_headers()
+        self.assertEqual(self.headers_method.call_count, 2)
+
+    def test_headers_are_cached_per_credentials(self) -> None:
+        with local_app.test_request_context(headers={'Authorization': 'Bearer a'}):
+            get_request_headers()
+        with local_app.test_request_context(headers={'Authorization': 'Bearer a'}):
+            get_request_headers()
+        self.assertEqual(self.headers_method.call_count, 1)
+
+        with local_app.test_request_context(headers={'Authorization': 'Bearer b'}):
+            get_request_headers()
+        self.assertEqual(self.headers_method.call_count, 2)
+
+    def test_headers_are_not_cached_without_user_or_request(self) -> None:
+        cache = RequestHeadersCache(max_size=10, ttl_sec=300, refresh_ahead_sec=60)
+        with local_app.app_context():
+            cache.get_headers()
+            cache.get_headers()
+        self.assertEqual(self.headers_method.call_count, 2)
+
+        with local_app.test_request_context(), \
+                patch('amundsen_application.api.utils.request_utils.get_current_user') as user_mock:
+            user_mock.return_value.user_id = ''
+            cache.get_headers()
+            cache.get_headers()
+        self.assertEqual(self.headers_method.call_count, 4)
+
+        auth_user_method = local_app.config['AUTH_USER_METHOD']
+        local_app.config['AUTH_USER_METHOD'] = None
+        try:
+            with local_app.test_request_context():
+                cache.get_headers()
+                cache.get_headers()
+        finally:
+            local_app.config['AUTH_USER_METHOD'] = auth_user_method
+        self.assertEqual(self.headers_method.call_count, 6)
+
+    def test_cache_disabled(self) -> None:
+        local_app.config['REQUEST_HEADERS_CACHE_ENABLED'] = False
+        with local_app.test_request_context():
+            get_request_headers()
+            get_request_headers()
+        self.assertEqual(self.headers_method.call_count, 2)
+
+    def test_expired_token_is_not_cached(self) -> None:
+        self.headers_method.return_value = _bearer_headers(time.time() - 1)
+        with local_app.test_request_context():
+            get_request_headers()
+            get_request_headers()
+        self.assertEqual(self.headers_method.call_count, 2)
+
+    def test_headers_are_refreshed_ahead_of_expiry(self) -> None:
+        cache = RequestHeadersCache(max_size=10, ttl_sec=300, refresh_ahead_sec=60)
+        self.headers_method.return_value = _bearer_headers(time.time() + 30)
+        with local_app.test_request_context(), \
+                patch('amundsen_application.api.utils.request_utils.submit_in_background') as submit_mock:
+            old_headers = cache.get_headers()
+            self.headers_method.return_value = _bearer_headers(time.time() + 3600)
+
+            self.assertEqual(cache.get_headers(), old_headers)
+            self.assertEqual(cache.get_headers(), old_headers)
+            submit_mock.assert_called_once()
+
+            func, key = submit_mock.call_args[0]
+            func(key)
+            self.assertEqual(cache.get_headers(), self.headers_method.return_value)
+        self.assertEqual(cache.get_stats()['refreshes'], 1)
+
+    @responses.activate
+    def test_request_metadata_uses_cached_headers(self) -> None:
+        url = local_app.config['METADATASERVICE_BASE'] + '/table'
+        responses.add(responses.GET, url, json={}, status=HTTPStatus.OK)
+        with local_app.test_request_context():
+            request_metadata(url=url)
+            request_metadata(url=url)
+        self.assertEqual(self.headers_method.call_count, 1)
+        self.assertEqual(responses.calls[1].request.headers['Authorization'], 'Basic abc')
+
+    def test_background_headers_outside_of_a_request(self) -> None:
+        self.headers_method.return_value = None
+        with local_app.app_context():
+            with self.assertRaises(Exception):
+                get_request_headers()
+
+            local_app.config['BACKGROUND_REQUEST_HEADERS_METHOD'] = Mock(return_value={'Authorization': 'Basic svc'})
+            try:
+                self.assertEqual(get_request_headers(), {'Authorization': 'Basic svc'})
+            finally:
+                local_app.config['BACKGROUND_REQUEST_HEADERS_METHOD'] = None
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.breaker = CircuitBreaker(window_size=4, min_calls=4, failure_rate=0.5, slow_call_sec=1, open_sec=30)
+        self.ok = Mock(return_value=Mock(status_code=HTTPStatus.OK))
+        self.error = Mock(return_value=Mock(status_code=HTTPStatus.INTERNAL_SERVER_ERROR))
+
+    def _open(self) -> None:
+        for func in (self.ok, self.ok, self.error, self.error):
+            self.breaker.call(func)
+
+    def test_circuit_opens_on_failure_rate(self) -> None:
+        self.breaker.call(self.ok)
+        self.breaker.call(self.error)
+        self.breaker.call(self.error)
+        self.assertEqual(self.breaker.state, CIRCUIT_CLOSED)
+
+        self.breaker.call(self.ok)
+        self.assertEqual(self.breaker.state, CIRCUIT_OPEN)
+        with self.assertRaises(CircuitOpenError) as context:
+            self.breaker.call(self.ok)
+        self.assertEqual(context.exception.code, HTTPStatus.SERVICE_UNAVAILABLE)
+        self.assertEqual(self.ok.call_count, 2)
+        self.assertEqual(self.breaker.get_stats()['rejected'], 1)
+
+    def test_exceptions_and_slow_calls_are_failures(self) -> None:
+        with patch('amundsen_application.api.utils.request_utils.time.monotonic', side_effect=[0, 0, 0, 5] * 2):
+            self.breaker.call(self.ok)
+            self.breaker.call(self.ok)
+        for _ in range(2):
+            with self.assertRaises(ConnectionError):
+                self.breaker.call(Mock(side_effect=ConnectionError))
+        self.assertEqual(self.breaker.state, CIRCUIT_OPEN)
+        self.assertEqual(self.breaker.get_stats()['slow_calls'], 1)
+        self.assertEqual(self.breaker.get_stats()['failures'], 2)
+
+    def test_successful_probe_closes_circuit(self) -> None:
+        self._open()
+        self.breaker._opened_at -= 30
+
+        probe_started = Event()
+        release_probe = Event()
+
+        def probe() -> Mock:
+            probe_started.set()
+            release_probe.wait(5)
+            return Mock(status_code=HTTPStatus.OK)
+
+        thread = Thread(target=self.breaker.call, args=(probe,))
+        thread.start()
+        probe_started.wait(5)
+        self.assertEqual(self.breaker.state, CIRCUIT_HALF_OPEN)
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.call(self.ok)
+
+        release_probe.set()
+        thread.join(5)
+        self.assertEqual(self.breaker.state, CIRCUIT_CLOSED)
+        self.breaker.call(self.ok)
+
+    def test_failed_probe_opens_circuit(self) -> None:
+        self._open()
+        self.breaker._opened_at -= 30
+        self.breaker.call(self.error)
+        self.assertEqual(self.breaker.state, CIRCUIT_OPEN)
+        self.assertEqual(self.breaker.get_stats()['opened'], 2)
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.call(self.ok)
+
+    @responses.activate
+    def test_request_metadata_circuit_breaker(self) -> None:
+        url = local_app.config['METADATASERVICE_BASE'] + '/table'
+        responses.add(responses.GET, url, json={}, status=HTTPStatus.SERVICE_UNAVAILABLE)
+        local_app.config['CIRCUIT_BREAKER_ENABLED'] = True
+        request_utils._circuit_breakers.clear()
+        try:
+            with local_app.app_context():
+                for _ in range(local_app.config['CIRCUIT_BREAKER_MIN_CALLS']):
+                    request_metadata(url=url)
+                with self.assertRaises(CircuitOpenError):
+                    request_metadata(url=url)
+            self.assertEqual(get_circuit_breaker_stats()[METADATA_SERVICE]['state'], CIRCUIT_OPEN)
+        finally:
+            local_app.config['CIRCUIT_BREAKER_ENABLED'] = False
+            request_utils._circuit_breakers.clear()
+
+        self.assertEqual(len(responses.calls), local_app.config['CIRCUIT_BREAKER_MIN_CALLS'])
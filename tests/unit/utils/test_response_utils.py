@@ -4,9 +4,12 @@
 import json
 import unittest
 from typing import Dict
+from unittest.mock import patch
 
 from amundsen_application import create_app
-from amundsen_application.api.utils.response_utils import create_error_response
+from amundsen_application.api.exceptions import CircuitOpenError, DeadlineExceededError
+from amundsen_application.api.utils.response_utils import compute_etag, create_error_response, \
+    create_etag_response, create_streamed_json_response, get_error_status_code
 
 local_app = create_app('amundsen_application.config.TestConfig', 'tests/templates')
 
@@ -30,3 +33,95 @@ class ResponseUtilsTest(unittest.TestCase):
         data = json.loads(response.data)
         self.assertEqual(response.status_code, status_code)
         self.assertEqual(data.get('msg'), test_message)
+
+    def test_create_streamed_json_response(self) -> None:
+        """
+        Verify that the streamed body is the JSON of the payload, written in several chunks
+        :return:
+        """
+        payload = {
+            'msg': 'Success',
+            'tableData': {'name': 'test_table', 'columns': [{'name': f'column_{i}'} for i in range(1000)]},
+        }
+        with local_app.test_request_context(), \
+                patch('amundsen_application.api.utils.response_utils.STREAMED_JSON_CHUNK_SIZE', 1024):
+            response = create_streamed_json_response(payload=payload,
+                                                     stream_path=('tableData', 'columns'),
+                                                     status_code=200)
+            chunks = list(response.iter_encoded())
+        self.assertTrue(response.is_streamed)
+        self.assertEqual(response.mimetype, 'application/json')
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(json.loads(b''.join(chunks)), payload)
+
+    def test_create_streamed_json_response_without_stream_path(self) -> None:
+        """
+        Verify that a payload not containing the stream path is serialized as a whole
+        :return:
+        """
+        payload = {'msg': 'Encountered error', 'tableData': {}}
+        with local_app.test_request_context():
+            response = create_streamed_json_response(payload=payload,
+                                                     stream_path=('tableData', 'columns'),
+                                                     status_code=500)
+            self.assertEqual(json.loads(response.get_data()), payload)
+        self.assertEqual(response.status_code, 500)
+
+    def test_compute_etag(self) -> None:
+        """
+        Verify that equal payloads have the same ETag whatever the order of their keys, and different payloads not
+        :return:
+        """
+        with local_app.app_context():
+            etag = compute_etag({'a': 1, 'b': [1, 2]})
+            self.assertEqual(compute_etag({'b': [1, 2], 'a': 1}), etag)
+            self.assertNotEqual(compute_etag({'a': 1, 'b': [2, 1]}), etag)
+
+    def test_create_etag_response(self) -> None:
+        """
+        Verify that the response has an ETag, and that a matching If-None-Match gets an empty 304 response
+        :return:
+        """
+        payload = {'msg': 'Success', 'dashboard': {'name': 'dashboard'}}
+        local_app.config['METADATA_ETAG_ENABLED'] = True
+        try:
+            with local_app.test_request_context():
+                response = create_etag_response(payload=payload, status_code=200)
+            etag, weak = response.get_etag()
+            self.assertFalse(weak)
+            self.assertEqual(response.headers['Cache-Control'], 'private, no-cache')
+            self.assertEqual(json.loads(response.data), payload)
+
+            for if_none_match in (f'"{etag}"', f'"other", "{etag}-gzip"', '*'):
+                with local_app.test_request_context(headers={'If-None-Match': if_none_match}):
+                    response = create_etag_response(payload=payload, status_code=200)
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response.data, b'')
+                self.assertEqual(response.get_etag(), (etag, False))
+
+            with local_app.test_request_context(headers={'If-None-Match': '"other"'}):
+                self.assertEqual(create_etag_response(payload=payload, status_code=200).status_code, 200)
+        finally:
+            local_app.config['METADATA_ETAG_ENABLED'] = False
+
+    def test_create_etag_response_disabled(self) -> None:
+        """
+        Verify that no ETag is added to error responses, or when METADATA_ETAG_ENABLED is off
+        :return:
+        """
+        with local_app.test_request_context():
+            self.assertNotIn('ETag', create_etag_response(payload={}, status_code=200).headers)
+            local_app.config['METADATA_ETAG_ENABLED'] = True
+            try:
+                self.assertNotIn('ETag', create_etag_response(payload={}, status_code=500).headers)
+            finally:
+                local_app.config['METADATA_ETAG_ENABLED'] = False
+
+    def test_get_error_status_code(self) -> None:
+        """
+        Verify that the errors raised instead of calling an upstream service keep their status code
+        :return:
+        """
+        self.assertEqual(get_error_status_code(CircuitOpenError('open')), 503)
+        self.assertEqual(get_error_status_code(DeadlineExceededError('passed')), 504)
+        self.assertEqual(get_error_status_code(Exception('failed')), 500)
@@ -3,7 +3,8 @@
 
 import unittest
 
-from amundsen_application.api.utils.search_utils import generate_query_json, has_filters, transform_filters
+from amundsen_application.api.utils.search_utils import generate_query_json, has_filters, normalize_search_term, \
+    search_cache_key, transform_filters
 
 
 class SearchUtilsTest(unittest.TestCase):
@@ -68,3 +69,19 @@ class SearchUtilsTest(unittest.TestCase):
         self.assertFalse(has_filters(filters={'fake_category': ['db1']}, resource='table'))
         self.assertFalse(has_filters(filters={'tag': []}, resource='table'))
         self.assertFalse(has_filters())
+
+    def test_search_cache_key(self) -> None:
+        """
+        Verify that equivalent searches share a cache key and different pages do not
+        :return:
+        """
+        key = search_cache_key(resource='table', search_term=normalize_search_term(' test '), page_index=0,
+                               filters={'database': ['db1', 'db2'], 'tag': []})
+        self.assertEqual(key, search_cache_key(resource='table', search_term='test', page_index='0',  # type: ignore
+                                               filters={'database': ['db2', 'db1']}))
+        self.assertNotEqual(key, search_cache_key(resource='table', search_term='test', page_index=1,
+                                                  filters={'database': ['db1', 'db2']}))
+        self.assertNotEqual(key, search_cache_key(resource='dashboard', search_term='test', page_index=0,
+                                                  filters={'database': ['db1', 'db2']}))
+        self.assertNotEqual(key, search_cache_key(resource='table', search_term='test', page_index=0,
+                                                  filters={'database': ['db1', 'db2']}, credentials='abc'))
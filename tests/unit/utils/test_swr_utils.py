@@ -0,0 +1,114 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import unittest
+from concurrent.futures import Future  # noqa: F401
+from http import HTTPStatus
+from typing import Any, List  # noqa: F401
+from unittest.mock import Mock, patch
+
+import responses
+from flask import g
+
+from amundsen_application import create_app
+from amundsen_application.api.utils import request_utils, swr_utils
+from amundsen_application.api.utils.swr_utils import get_metadata, get_swr_stats
+from amundsen_application.proxy import cache_backends
+
+local_app = create_app('amundsen_application.config.TestConfig', 'tests/templates')
+
+
+class StaleWhileRevalidateTest(unittest.TestCase):
+    def setUp(self) -> None:
+        cache_backends._cache_backend = None
+        local_app.config['METADATA_SWR_ENABLED'] = True
+        self.fetch = Mock(side_effect=lambda: {'tags': [], 'status_code': HTTPStatus.OK})
+        self.now = 1000.0
+        patcher = patch('amundsen_application.api.utils.swr_utils.time.time', side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self) -> None:
+        local_app.config['METADATA_SWR_ENABLED'] = False
+        swr_utils._pending_keys.clear()
+
+    def test_swr_disabled(self) -> None:
+        local_app.config['METADATA_SWR_ENABLED'] = False
+        with local_app.app_context():
+            get_metadata('tags', self.fetch)
+            get_metadata('tags', self.fetch)
+        self.assertEqual(self.fetch.call_count, 2)
+
+    def test_fresh_entry_is_served(self) -> None:
+        fresh = get_swr_stats().get('fresh', 0)
+        with local_app.app_context():
+            results = get_metadata('tags', self.fetch)
+            results['msg'] = 'modified by the caller'
+            self.now += local_app.config['METADATA_SWR_SOFT_TTL_SEC'] - 1
+            self.assertEqual(get_metadata('tags', self.fetch), {'tags': [], 'status_code': HTTPStatus.OK})
+        self.assertEqual(self.fetch.call_count, 1)
+        self.assertEqual(get_swr_stats()['fresh'], fresh + 1)
+
+    def test_stale_entry_is_served_while_refreshed(self) -> None:
+        with local_app.app_context(), \
+                patch('amundsen_application.api.utils.swr_utils.submit_in_background') as submit_mock:
+            get_metadata('tags', self.fetch)
+            self.fetch.side_effect = lambda: {'tags': ['new'], 'status_code': HTTPStatus.OK}
+            self.now += local_app.config['METADATA_SWR_SOFT_TTL_SEC']
+
+            self.assertEqual(get_metadata('tags', self.fetch)['tags'], [])
+            self.assertEqual(get_metadata('tags', self.fetch)['tags'], [])
+            submit_mock.assert_called_once()
+            self.assertEqual(self.fetch.call_count, 1)
+
+            func, *args = submit_mock.call_args[0]
+            func(*args)
+            self.assertEqual(get_metadata('tags', self.fetch)['tags'], ['new'])
+        self.assertEqual(self.fetch.call_count, 2)
+
+    def test_failed_refresh_keeps_stale_entry(self) -> None:
+        refresh_failures = get_swr_stats().get('refresh_failures', 0)
+        with local_app.app_context(), \
+                patch('amundsen_application.api.utils.swr_utils.submit_in_background') as submit_mock:
+            get_metadata('tags', self.fetch)
+            self.fetch.side_effect = ValueError('metadata service unavailable')
+            self.now += local_app.config['METADATA_SWR_SOFT_TTL_SEC']
+            get_metadata('tags', self.fetch)
+
+            func, *args = submit_mock.call_args[0]
+            func(*args)
+            self.assertEqual(get_metadata('tags', self.fetch)['tags'], [])
+        self.assertEqual(get_swr_stats()['refresh_failures'], refresh_failures + 1)
+
+    def test_error_is_not_cached(self) -> None:
+        self.fetch.side_effect = lambda: {'tags': [], 'status_code': HTTPStatus.INTERNAL_SERVER_ERROR}
+        with local_app.app_context():
+            get_metadata('tags', self.fetch)
+            get_metadata('tags', self.fetch)
+        self.assertEqual(self.fetch.call_count, 2)
+
+    @responses.activate
+    def test_refresh_does_not_inherit_the_request_deadline(self) -> None:
+        url = local_app.config['METADATASERVICE_BASE'] + '/tags/'
+        responses.add(responses.GET, url, json={'tags': ['new']}, status=HTTPStatus.OK)
+
+        def fetch() -> dict:
+            response = request_utils.request_metadata(url=url)
+            return dict(response.json(), status_code=response.status_code)
+
+        futures = []  # type: List[Future]
+
+        def submit(*args: Any) -> None:
+            futures.append(request_utils.submit_in_background(*args))
+
+        with local_app.test_request_context(), \
+                patch('amundsen_application.api.utils.swr_utils.submit_in_background', side_effect=submit):
+            get_metadata('tags', self.fetch)
+            self.now += local_app.config['METADATA_SWR_SOFT_TTL_SEC']
+            # The request runs out of time right after the stale entry is served
+            g.request_deadline = self.now
+            self.assertEqual(get_metadata('tags', fetch)['tags'], [])
+
+            futures[0].result()
+            self.assertEqual(get_metadata('tags', fetch)['tags'], ['new'])
+        self.assertEqual(len(responses.calls), 1)
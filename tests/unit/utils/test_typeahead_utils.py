@@ -0,0 +1,82 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import unittest
+from unittest.mock import Mock, patch
+
+from amundsen_application import create_app
+from amundsen_application.api.utils.typeahead_utils import PrefixIndex, TypeaheadIndex
+
+local_app = create_app('amundsen_application.config.TestConfig', 'tests/templates')
+
+ORDERS_TABLE = {'type': 'table', 'key': 'hive://gold.sales/orders', 'name': 'orders', 'schema': 'sales'}
+ORDER_ITEMS_TABLE = {'type': 'table', 'key': 'hive://gold.sales/order_items', 'name': 'order_items',
+                     'schema': 'sales'}
+SALES_SCHEMA = {'type': 'schema', 'name': 'sales'}
+ORDERS_TAG = {'type': 'tag', 'name': 'Orders'}
+
+ENTRIES = [
+    ('orders', ORDERS_TABLE),
+    ('sales.orders', ORDERS_TABLE),
+    ('order_items', ORDER_ITEMS_TABLE),
+    ('sales.order_items', ORDER_ITEMS_TABLE),
+    ('sales', SALES_SCHEMA),
+    ('Orders', ORDERS_TAG),
+]
+
+
+class PrefixIndexTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.index = PrefixIndex(ENTRIES)
+
+    def test_search_prefix(self) -> None:
+        self.assertEqual(self.index.search('order_', limit=10), [ORDER_ITEMS_TABLE])
+        self.assertEqual(self.index.search('ORD', limit=10), [ORDER_ITEMS_TABLE, ORDERS_TABLE, ORDERS_TAG])
+        self.assertEqual(self.index.search('customers', limit=10), [])
+
+    def test_search_returns_entries_once(self) -> None:
+        self.assertEqual(self.index.search('sales', limit=10), [SALES_SCHEMA, ORDER_ITEMS_TABLE, ORDERS_TABLE])
+
+    def test_search_limit(self) -> None:
+        self.assertEqual(self.index.search('ord', limit=2), [ORDER_ITEMS_TABLE, ORDERS_TABLE])
+
+    def test_search_types(self) -> None:
+        self.assertEqual(self.index.search('ord', limit=10, types=['tag', 'dashboard']), [ORDERS_TAG])
+
+    def test_len(self) -> None:
+        self.assertEqual(len(self.index), len(ENTRIES))
+
+
+class TypeaheadIndexTest(unittest.TestCase):
+    def test_refresh(self) -> None:
+        load = Mock(return_value=ENTRIES)
+        typeahead_index = TypeaheadIndex(load=load)
+        typeahead_index.refresh()
+        self.assertEqual(typeahead_index.get_stats(), {'size': len(ENTRIES), 'refreshes': 1, 'refresh_failures': 0})
+
+    def test_failed_refresh_keeps_index(self) -> None:
+        load = Mock(return_value=ENTRIES)
+        typeahead_index = TypeaheadIndex(load=load)
+        typeahead_index.refresh()
+        load.side_effect = Exception('search service unavailable')
+        with self.assertRaises(Exception):
+            typeahead_index.refresh()
+        self.assertEqual(typeahead_index.get_stats()['size'], len(ENTRIES))
+        self.assertEqual(typeahead_index.get_stats()['refresh_failures'], 1)
+
+    @patch('amundsen_application.api.utils.typeahead_utils.submit_in_background')
+    def test_failed_background_refresh_falls_back_to_request(self, submit_mock: Mock) -> None:
+        submit_mock.side_effect = lambda func: func()
+        load = Mock(side_effect=[Exception('no credentials outside of a request'), ENTRIES])
+        typeahead_index = TypeaheadIndex(load=load)
+        typeahead_index._ensure_started = Mock()  # type: ignore
+        with local_app.app_context():
+            # One iteration of the background thread
+            typeahead_index._run(local_app, Mock(is_set=Mock(side_effect=[False, True])), 0)
+            self.assertEqual(typeahead_index.get_stats()['refresh_failures'], 1)
+            # The lookup refreshes the index within its request, run synchronously here
+            self.assertEqual(typeahead_index.search('orders', limit=10), [ORDERS_TABLE, ORDERS_TAG])
+            submit_mock.assert_called_once()
+            self.assertEqual(typeahead_index.search('orders', limit=10), [ORDERS_TABLE, ORDERS_TAG])
+            submit_mock.assert_called_once()
+        self.assertEqual(typeahead_index.get_stats()['refreshes'], 1)